@@ -28,12 +28,18 @@
 
 # Import Python language packages
 
-import datetime
+import asyncio
+import atexit
+import collections
+import concurrent.futures
 import json
 import os
+import socket
+import struct
 import sys
 import threading
 import time
+import types
 
 # Import community libraries
 
@@ -43,40 +49,1919 @@ except:
 	sys.stderr.write('ERROR: Cannot find library "pigpio".\nExecute "pip install pigpio" to setup it.\n')
 	sys.exit(65)
 
+# Import project modules
+
+from irc_model import Device, Key
+from irc_pack import DevicePack
+from irc_protocol import Frame
+
+
+## An engine to compose the carrier square wave data for modulated pulses (H-signals).
+#  <br>
+#  The carrier pulse train is computed only once per GPIO port, carrier frequency 
+#  and duty cycle as template. The pulse train of any mark is the leading part 
+#  of this template, which is extended on demand. 
+#  <br>
+#  The edges of each carrier period are rounded exactly like the former 
+#  cycle by cycle loop (forked from "irrp.py"), so the resulting waves are identical.
+#
+class CarrierEngine:
+	
+	## Dictionary of the pulse train templates {(gpio, frequency, duty): [pulses]}. Default: None.
+	templates = None
+	
+	## Lock for extending the templates in parallel threads.
+	lock = None
+	
+	## CONSTRUCTOR.
+	#
+	def __init__(self):
+		self.templates = {}
+		self.lock = threading.Lock()
+	
+	## Calculate the count of carrier periods of a modulated pulse.
+	#
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param micros The duration of the IR signal modulation pulse in microseconds.
+	#  @return The count of carrier periods as integer.
+	def cycles(self, frequency, micros):
+		return int(round(micros / (1000.0 / frequency)))
+	
+	## Compose the carrier square wave data for the modulated pulse.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param micros The duration of the IR signal modulation pulse in microseconds.
+	#  @param duty The duty cycle of the carrier as float between 0.0 and 1.0. Default: 0.5.
+	#  @return The "pigpio"-compatible data array to define the IR carrier wave for the modulated pulse.  
+	def pulses(self, gpio, frequency, micros, duty=0.5):
+		cycles = self.cycles(frequency, micros)
+		return self.template(gpio, frequency, duty, cycles)[0:2*cycles]
+	
+	## Compose the carrier square wave data for many modulated pulses in one pass.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param durations The list of durations of the IR signal modulation pulses in microseconds.
+	#  @param duty The duty cycle of the carrier as float between 0.0 and 1.0. Default: 0.5.
+	#  @return A dictionary of the "pigpio"-compatible data arrays {micros: pulses}.
+	def pulseTrains(self, gpio, frequency, durations, duty=0.5):
+		durations = set(durations)
+		if not durations:
+			return {}
+		cycles = {micros: self.cycles(frequency, micros) for micros in durations}
+		template = self.template(gpio, frequency, duty, max(cycles.values()))
+		return {micros: template[0:2*cycles[micros]] for micros in durations}
+	
+	## Get the template of the carrier pulse train, which is at least "cycles" periods long.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param duty The duty cycle of the carrier as float between 0.0 and 1.0.
+	#  @param cycles The minimum count of carrier periods.
+	#  @return The "pigpio"-compatible data array of the carrier pulse train.
+	def template(self, gpio, frequency, duty, cycles):
+		key = (gpio, frequency, duty)
+		template = self.templates.get(key)
+		if template != None and len(template) >= 2*cycles:
+			return template
+		with self.lock:
+			template = self.templates.setdefault(key, [])
+			c = len(template) // 2
+			if c >= cycles:
+				return template
+			# Forked from souri-t on GitHub by michaelpaulkorthals. 
+			# Original source: https://github.com/souri-t/RemoteControl-RPI/blob/master/remote/bin/irrp
+			cycle = 1000.0 / frequency
+			on = int(round(cycle * duty))
+			sofar = int(round(c * cycle))
+			mark = pigpio.pulse(1 << gpio, 0, on)
+			while c < cycles:
+				target = int(round((c + 1) * cycle))
+				sofar += on
+				off = target - sofar
+				sofar += off
+				template.append(mark)
+				template.append(pigpio.pulse(0, 1 << gpio, off))
+				c += 1
+			return template
+
+
+## A least recently used cache of compiled waves, which stay resident in "pigpiod".
+#  <br>
+#  Every wave is identified by the GPIO port, the carrier frequency and the duration 
+#  of the signal. A space (L-signal) has the carrier frequency 0.
+#  <br>
+#  The keys of a standard IR protocol are composed of the symbols of their protocol
+#  (e.g. a header or a bit, see "irc_protocol.Frame") instead of single marks and spaces.
+#  The wave of a symbol is identified by the tuple of its durations instead of a duration,
+#  so each protocol has a small set of symbol waves, which is shared by all its keys.
+#  <br>
+#  "pigpiod" provides a limited count of wave ids, pulses and DMA control blocks.
+#  The cache mirrors the allocation of these resources in "pigpiod" and evicts 
+#  the least recently used waves, before a new wave would exceed these limits.
+#  <br>
+#  NOTE: "pigpiod" only reuses the resources of a deleted wave, if all waves 
+#  with higher wave ids have been deleted too, or if a new wave needs exactly 
+#  the same resources. This behavior is reproduced by the "slots" of this cache.
+#  <br>
+#  The cache is thread-safe. Waves of chains, which are prepared or on air, 
+#  are pinned and never evicted.
+#  <br>
+#  The cache is a pool of marks and spaces, which is shared by all keys of all devices 
+#  on the same GPIO port. A device can retain the waves of all its keys in advance, 
+#  so compiling a key only assembles a chain of existing wave ids. The retained waves 
+#  are reference counted by device and only evicted, if no other wave can be evicted.
+#  <br>
+#  The pulses of the waves are kept as packed payloads (gpio_on, gpio_off, delay), 
+#  so a wave, which has been evicted or lost by a restart of "pigpiod", is created 
+#  again without composing its carrier pulses.
+#
+class WaveCache:
+	
+	## Maximum count of waves in "pigpiod" (see PI_MAX_WAVES in "pigpio.h").
+	MAX_WAVES = 250
+	
+	## Default maximum size in bytes of the packed payloads of the waves.
+	MAX_PAYLOAD_BYTES = 4*1024*1024
+	
+	## Raspberry Pi object. Default: None.
+	pi = None
+	
+	## Function to compose the carrier square wave data of a mark (H-signal). Default: None.
+	carrier = None
+	
+	## Maximum count of waves in this cache.
+	max_waves = MAX_WAVES
+	
+	## Maximum count of pulses of all waves in this cache.
+	max_pulses = 0
+	
+	## Maximum count of DMA control blocks of all waves in this cache.
+	max_cbs = 0
+	
+	## Ordered dictionary of the cached waves {(gpio, frequency, micros): wave_id} in LRU order.
+	entries = None
+	
+	## List of wave slots in "pigpiod" [key or None, pulses, cbs] indexed by wave id.
+	slots = None
+	
+	## Dictionary of the exact durations of the cached waves {wave_id: micros}.
+	durations = None
+	
+	## Count of pulses currently reserved in "pigpiod".
+	used_pulses = 0
+	
+	## Count of DMA control blocks currently reserved in "pigpiod".
+	used_cbs = 0
+	
+	## Count of cache hits.
+	hits = 0
+	
+	## Count of cache misses.
+	misses = 0
+	
+	## Count of evicted waves.
+	evictions = 0
+	
+	## Count of the complete resets of this cache.
+	generation = 0
+	
+	## Dictionary of the pin counts of the waves {(gpio, frequency, micros): count}. Default: None.
+	pins = None
+	
+	## Count of the resets of the pin counts by "clear" or "rebuild".
+	pin_epoch = 0
+	
+	## Dictionary of the reference counts of the retained waves {(gpio, frequency, micros): count}. Default: None.
+	references = None
+	
+	## Dictionary of the keys of the waves retained by each owner, e.g. a device {owner: frozenset}. Default: None.
+	owners = None
+	
+	## Ordered dictionary of the packed pulses {(gpio, frequency, micros): (payload, pulses, cbs, micros)} in LRU order. Default: None.
+	payloads = None
+	
+	## Size in bytes of the packed payloads.
+	payload_bytes = 0
+	
+	## Maximum size in bytes of the packed payloads.
+	max_payload_bytes = MAX_PAYLOAD_BYTES
+	
+	## Lock for accessing this cache and building waves in parallel threads.
+	lock = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param pi The Raspberry Pi object.
+	#  @param carrier The function to compose the carrier square wave data as carrier(gpio, frequency, micros).
+	#  @param max_waves Maximum count of waves in this cache. Default: MAX_WAVES.
+	#  @param max_pulses Maximum count of pulses or None to ask "pigpiod". Default: None.
+	#  @param max_cbs Maximum count of DMA control blocks or None to ask "pigpiod". Default: None.
+	#  @param max_payload_bytes Maximum size in bytes of the packed payloads of the waves. Default: MAX_PAYLOAD_BYTES.
+	def __init__(self, pi, carrier, max_waves=MAX_WAVES, max_pulses=None, max_cbs=None, max_payload_bytes=MAX_PAYLOAD_BYTES):
+		self.pi = pi
+		self.carrier = carrier
+		self.max_waves = min(max_waves, self.MAX_WAVES)
+		self.max_pulses = max_pulses if max_pulses != None else pi.wave_get_max_pulses()
+		self.max_cbs = max_cbs if max_cbs != None else pi.wave_get_max_cbs()
+		self.entries = collections.OrderedDict()
+		self.slots = []
+		self.durations = {}
+		self.used_pulses = 0
+		self.used_cbs = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.generation = 0
+		self.pins = {}
+		self.pin_epoch = 0
+		self.references = {}
+		self.owners = {}
+		self.payloads = collections.OrderedDict()
+		self.payload_bytes = 0
+		self.max_payload_bytes = max_payload_bytes
+		self.lock = threading.RLock()
+	
+	## Get the ids of the resident waves for an IR signal sequence. Create the waves, which are not cached yet.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds or a Frame of symbols.
+	#  @param protected Set of keys, which must not be evicted. The keys of this sequence are added. Default: None.
+	#  @return The list of wave ids in "pigpiod" to be chained.
+	#  @exception pigpio.error The waves of the sequence do not fit into "pigpiod" at the same time.
+	def getWaves(self, gpio, frequency, sequence, protected=None):
+		with self.lock:
+			if protected == None:
+				protected = set()
+			# Repeat once, if the cache has been reset while the waves were created 
+			for attempt in range(2):
+				generation = self.generation
+				wave = [0]*len(sequence)
+				for i, key in enumerate(self.getKeys(gpio, frequency, sequence)):
+					wave[i] = self.getWave(*key, protected=protected)
+					protected.add(key)
+				if generation == self.generation:
+					return wave
+			raise pigpio.error('The waves of the IR signal sequence do not fit into "pigpiod".')
+	
+	## Get the keys of the waves of an IR signal sequence.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds or a Frame of symbols.
+	#  @return The list of the keys (gpio, frequency, micros) of the waves.
+	def getKeys(self, gpio, frequency, sequence):
+		if isinstance(sequence, Frame):
+			# Each symbol contains a mark
+			return [(gpio, frequency, symbol) for symbol in sequence]
+		# The marks have even and the spaces odd indexes
+		return [(gpio, 0, sequence[i]) if i & 1 else (gpio, frequency, sequence[i]) for i in range(0, len(sequence))]
+	
+	## Get the id of the resident wave for a mark or space. Create the wave, if it is not cached yet.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s or 0 for a space (L-signal).
+	#  @param micros The duration of the IR signal in microseconds or the tuple of the durations of a symbol.
+	#  @param protected Set of keys, which must not be evicted to create this wave. Default: Empty set.
+	#  @param optional Do not create the wave, if a retained wave would have to be evicted. Default: False.
+	#  @return The wave id in "pigpiod" or None, if an optional wave has not been created.
+	#  @exception pigpio.error The wave cannot be created, e.g. because all other waves are protected or pinned.
+	def getWave(self, gpio, frequency, micros, protected=frozenset(), optional=False):
+		key = (gpio, frequency, micros)
+		with self.lock:
+			wave_id = self.entries.get(key)
+			if wave_id != None:
+				self.hits += 1
+				self.entries.move_to_end(key)
+				return wave_id
+			self.misses += 1
+			# Get the packed wave data
+			payload, pulses, cbs, duration = self.getPayload(key)
+			# Make room for the new wave
+			if not self.reserve(pulses, cbs, protected, optional):
+				if optional:
+					return None
+				raise pigpio.error(f'There is no room for the wave of {duration} microseconds in "pigpiod".')
+			try:
+				wave_id = self.upload(payload)
+			except pigpio.error:
+				# The resources in "pigpiod" are fragmented or used by others. Start from scratch.
+				self.purge()
+				wave_id = self.upload(payload)
+			self.occupy(wave_id, key, pulses, cbs)
+			self.entries[key] = wave_id
+			self.durations[wave_id] = duration
+			return wave_id
+	
+	## Get the packed pulses of a wave. Compose and pack them, if they are not cached yet.
+	#
+	#  @param key The key (gpio, frequency, micros) of the wave.
+	#  @return A tuple of the packed pulses, 
+	#  the count of pulses, the count of DMA control blocks and the duration in microseconds.
+	def getPayload(self, key):
+		with self.lock:
+			entry = self.payloads.get(key)
+			if entry != None:
+				self.payloads.move_to_end(key)
+				return entry
+			gpio, frequency, micros = key
+			# Compose the wave data
+			if isinstance(micros, tuple):
+				# Symbol: The marks are positive and the spaces negative durations
+				pulses = []
+				for duration in micros:
+					pulses += self.carrier(gpio, frequency, duration) if duration > 0 else [pigpio.pulse(0, 0, -duration)]
+			elif frequency:
+				pulses = self.carrier(gpio, frequency, micros)
+			else:
+				pulses = [pigpio.pulse(0, 0, micros)]
+			# Pack the pulses like "pigpio.wave_add_generic"
+			payload = struct.pack(f'{3*len(pulses)}I', *[value for p in pulses for value in (p.gpio_on, p.gpio_off, p.delay)])
+			entry = (payload, len(pulses), self.estimateCbs(pulses), sum(p.delay for p in pulses))
+			self.payloads[key] = entry
+			self.payload_bytes += len(payload)
+			# Keep the size of the payloads within its limit
+			while self.payload_bytes > self.max_payload_bytes and len(self.payloads) > 1:
+				self.payload_bytes -= len(self.payloads.popitem(last=False)[1][0])
+			return entry
+	
+	## Create a wave in "pigpiod" from its packed pulses.
+	#  Only the public API of "pigpio" is used, because its internal socket commands differ between its releases.
+	#
+	#  @param payload The packed pulses (see "getPayload").
+	#  @return The wave id in "pigpiod".
+	def upload(self, payload):
+		self.pi.wave_add_generic([pigpio.pulse(*values) for values in struct.iter_unpack('III', payload)])
+		return self.pi.wave_create()
+	
+	## Create the resident waves again in "pigpiod", after it has been restarted.
+	#  The waves get new wave ids, so the wave chains have to be compiled again.
+	#
+	#  @param pi The Raspberry Pi object, which is connected to the restarted "pigpiod".
+	def rebuild(self, pi):
+		with self.lock:
+			keys = list(self.entries)
+			self.pi = pi
+			self.generation += 1
+			self.entries.clear()
+			self.durations.clear()
+			self.pins.clear()
+			self.pin_epoch += 1
+			self.slots = []
+			self.used_pulses = 0
+			self.used_cbs = 0
+			# Restore the waves in LRU order from their payloads
+			try:
+				for key in keys:
+					self.getWave(*key)
+			except pigpio.error:
+				pass
+	
+	## Pin the waves of a chain, which is prepared or on air, so they are not evicted.
+	#
+	#  @param wave_ids The wave ids of the chain.
+	#  @return The pin epoch, which has to be passed to "unpinWaves".
+	def pinWaves(self, wave_ids):
+		with self.lock:
+			for wave_id in set(wave_ids):
+				key = self.slots[wave_id][0]
+				self.pins[key] = self.pins.get(key, 0) + 1
+			return self.pin_epoch
+	
+	## Unpin the waves of a chain, which has been sent.
+	#  The pins of a former epoch have already been dropped by "clear" or "rebuild".
+	#
+	#  @param wave_ids The wave ids of the chain.
+	#  @param pin_epoch The pin epoch returned by "pinWaves".
+	def unpinWaves(self, wave_ids, pin_epoch):
+		with self.lock:
+			if pin_epoch != self.pin_epoch:
+				return
+			for wave_id in set(wave_ids):
+				key = self.slots[wave_id][0]
+				if self.pins[key] > 1:
+					self.pins[key] -= 1
+				else:
+					del self.pins[key]
+	
+	## Retain the marks and spaces of IR signal sequences for an owner, e.g. all keys of a device.
+	#  The waves, which are not resident yet, are created. The former waves of the owner are released.
+	#
+	#  @param owner The hashable identifier of the owner.
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param sequences The list of IR signal sequences [H-signal, L-signal, ..., H-signal] in microseconds or Frames of symbols.
+	#  @return True, if all waves are resident now.
+	def retainWaves(self, owner, gpio, frequency, sequences):
+		keys = set()
+		for sequence in sequences:
+			keys.update(self.getKeys(gpio, frequency, sequence))
+		with self.lock:
+			self.releaseWaves(owner)
+			self.owners[owner] = frozenset(keys)
+			for key in keys:
+				self.references[key] = self.references.get(key, 0) + 1
+			# The waves of this owner must not evict each other
+			protected = set()
+			try:
+				# The marks and spaces before the symbols
+				for key in sorted(keys, key=lambda key: (isinstance(key[2], tuple), key)):
+					if key not in self.entries and self.getWave(*key, protected=protected, optional=True) == None:
+						# The pool is full. The remaining waves are created on demand.
+						return False
+					protected.add(key)
+			except pigpio.error:
+				return False
+			return True
+	
+	## Release the waves retained by an owner. They stay resident until they are evicted.
+	#
+	#  @param owner The hashable identifier of the owner.
+	def releaseWaves(self, owner):
+		with self.lock:
+			for key in self.owners.pop(owner, ()):
+				if self.references[key] > 1:
+					self.references[key] -= 1
+				else:
+					del self.references[key]
+	
+	## Estimate the count of DMA control blocks, which "pigpiod" needs for the wave.
+	#  <br>
+	#  "pigpiod" needs a control block to switch the GPIO ports on, another one 
+	#  to switch them off and another one for the delay of each pulse.
+	#
+	#  @param pulses The "pigpio"-compatible list of pulses.
+	#  @return The estimated count of DMA control blocks.
+	def estimateCbs(self, pulses):
+		cbs = 1
+		for p in pulses:
+			cbs += (p.gpio_on != 0) + (p.gpio_off != 0) + (p.delay != 0)
+		return cbs
+	
+	## Evict the least recently used waves until a new wave fits into the limits of "pigpiod".
+	#
+	#  @param pulses The count of pulses of the new wave.
+	#  @param cbs The count of DMA control blocks of the new wave.
+	#  @param protected Set of keys, which must not be evicted. Default: Empty set.
+	#  @param keep_retained Do not evict retained waves. Default: False.
+	#  @return True, if the new wave fits.
+	def reserve(self, pulses, cbs, protected=frozenset(), keep_retained=False):
+		while True:
+			# "pigpiod" reuses a deleted wave slot with exactly the same resources
+			for slot in self.slots:
+				if slot[0] == None and slot[1] == pulses and slot[2] == cbs:
+					return True
+			if (
+				len(self.entries) < self.max_waves
+				and 
+				len(self.slots) < self.MAX_WAVES 
+				and 
+				self.used_pulses + pulses <= self.max_pulses
+				and 
+				self.used_cbs + cbs <= self.max_cbs
+			):
+				return True
+			# Evict the least recently used wave, which is preferably not retained
+			victim = None
+			for key in self.entries:
+				if key not in protected and key not in self.pins:
+					if key not in self.references:
+						victim = key
+						break
+					if victim == None and not keep_retained:
+						victim = key
+			if victim == None:
+				return False
+			self.evict(victim)
+	
+	## Register a new wave in its slot.
+	#
+	#  @param wave_id The wave id in "pigpiod".
+	#  @param key The key of the wave in this cache.
+	#  @param pulses The count of pulses of the wave.
+	#  @param cbs The count of DMA control blocks of the wave.
+	def occupy(self, wave_id, key, pulses, cbs):
+		# Waves created by others are unknown slots without key
+		while len(self.slots) <= wave_id:
+			self.slots.append([None, 0, 0])
+		slot = self.slots[wave_id]
+		self.used_pulses += pulses - slot[1]
+		self.used_cbs += cbs - slot[2]
+		self.slots[wave_id] = [key, pulses, cbs]
+	
+	## Delete a wave from "pigpiod" and remove it from this cache.
+	#
+	#  @param key The key of the wave in this cache.
+	def evict(self, key):
+		wave_id = self.entries.pop(key)
+		del self.durations[wave_id]
+		self.evictions += 1
+		try:
+			self.pi.wave_delete(wave_id)
+		except pigpio.error:
+			pass
+		self.slots[wave_id][0] = None
+		# "pigpiod" releases the resources of the deleted waves on top only
+		while self.slots and self.slots[-1][0] == None:
+			slot = self.slots.pop()
+			self.used_pulses -= slot[1]
+			self.used_cbs -= slot[2]
+	
+	## Delete all waves, which are not pinned, from "pigpiod".
+	#  If no wave is pinned, all waves in "pigpiod" are cleared.
+	#
+	def purge(self):
+		with self.lock:
+			if not self.pins:
+				self.clear()
+				return
+			for key in [key for key in self.entries if key not in self.pins]:
+				self.evict(key)
+			self.generation += 1
+	
+	## Delete all waves from "pigpiod" and clear this cache.
+	#
+	def clear(self):
+		with self.lock:
+			self.pi.wave_clear()
+			self.generation += 1
+			self.evictions += len(self.entries)
+			self.entries.clear()
+			self.durations.clear()
+			self.pins.clear()
+			self.pin_epoch += 1
+			self.slots = []
+			self.used_pulses = 0
+			self.used_cbs = 0
+	
+	## Get the statistics of this cache to size it for the device library.
+	#
+	#  @return A dictionary of the hits, misses, evictions and the current resource usage.
+	def getStatistics(self):
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'waves': len(self.entries),
+			'max_waves': self.max_waves,
+			'pulses': self.used_pulses,
+			'max_pulses': self.max_pulses,
+			'cbs': self.used_cbs,
+			'max_cbs': self.max_cbs,
+			'pinned': len(self.pins),
+			'retained': sum(1 for key in self.entries if key in self.references),
+			'owners': len(self.owners),
+			'payloads': len(self.payloads),
+			'payload_bytes': self.payload_bytes
+		}
+	
+	## Get the occupancy of the resources of "pigpiod" by this cache.
+	#
+	#  @return A dictionary of the used and the maximum count of each resource, 
+	#  the count of the wave ids, which are deleted but cannot be reused yet ("holes"), 
+	#  the count of the waves shared by several owners and the count of the resident waves of each owner.
+	def getOccupancy(self):
+		with self.lock:
+			return {
+				'waves': {'used': len(self.entries), 'max': self.max_waves},
+				'wave_ids': {'used': len(self.slots), 'holes': sum(1 for slot in self.slots if slot[0] == None), 'max': self.MAX_WAVES},
+				'pulses': {'used': self.used_pulses, 'max': self.max_pulses},
+				'cbs': {'used': self.used_cbs, 'max': self.max_cbs},
+				'shared': sum(1 for key in self.entries if self.references.get(key, 0) > 1),
+				'owners': {str(owner): sum(1 for key in keys if key in self.entries) for owner, keys in self.owners.items()}
+			}
+
+
+## A wave chain, whose waves are pinned in the wave cache until it is released (see "ChainCompiler.release").
+#  <br>
+#  The chain keeps the pin epoch of its waves. If the cache has been cleared or rebuilt 
+#  in the meantime, its pins have already been dropped and the release does nothing.
+#
+class PinnedChain(list):
+	
+	## The pin epoch of the waves (see "WaveCache.pinWaves").
+	pin_epoch = 0
+	
+	## CONSTRUCTOR.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @param pin_epoch The pin epoch of the waves.
+	def __init__(self, chain, pin_epoch):
+		super().__init__(chain)
+		self.pin_epoch = pin_epoch
+
+
+## A compiler, which composes a complete key press as a single "pigpio" wave chain.
+#  <br>
+#  The first IR signal sequence, the repetitions and the spaces between the repetitions 
+#  are transmitted in one DMA run, using the loop and delay commands of "wave_chain":
+#  <br>
+#  [first] 255 0 255 2 x y [repetition] 255 1 n m 
+#  <br>
+#  So the spaces between the repetitions are exactly timed by "pigpiod".
+#  <br>
+#  If a chain is longer than "pigpiod" accepts, the repeated patterns of its 
+#  IR signal sequences (e.g. runs of equal bits) are compressed to loops as well.
+#  A chain, which is still too long, is split by the transmitter (see "WaveTransmitter.split").
+#
+class ChainCompiler:
+	
+	## Maximum delay in microseconds of a single delay command in a wave chain.
+	MAX_DELAY = 65535
+	
+	## Maximum count of a single loop command in a wave chain.
+	MAX_LOOP_COUNT = 65535
+	
+	## Maximum length of a wave chain in bytes, which "pigpiod" accepts.
+	MAX_CHAIN_LENGTH = 600
+	
+	## Maximum count of the loops of a wave chain (loop counters in "pigpiod").
+	MAX_LOOPS = 20
+	
+	## Maximum length of a pattern in wave ids, which is compressed to a loop.
+	MAX_PATTERN = 16
+	
+	## Length in bytes of the loop start and loop repeat commands, which frame a compressed pattern.
+	LOOP_OVERHEAD = 6
+	
+	## Cache of the waves, which stay resident in "pigpiod". Default: None.
+	wave_cache = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param wave_cache The cache of the waves, which stay resident in "pigpiod".
+	def __init__(self, wave_cache):
+		self.wave_cache = wave_cache
+	
+	## Compile the IR signal sequences of a key press to a single wave chain.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param first The first IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @param repetition The repeated IR signal sequence or None, if there is no repetition. Default: None.
+	#  @param repeat_count The count of repetitions. Default: 0.
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds. Default: 0.
+	#  @param pin Pin the waves of the chain in the cache until "release" is called. Default: False.
+	#  @return The wave chain as list of wave ids and command codes for "wave_chain", which is a PinnedChain, if it is pinned.
+	def compile(self, gpio, frequency, first, repetition=None, repeat_count=0, repeat_space=0, pin=False):
+		return self.compileRepeated(gpio, frequency, [(first, repetition, repeat_count, repeat_space)], 1, 0, pin)
+	
+	## Compile N presses of a key to a single wave chain.
+	#  <br>
+	#  The presses are emitted by the loop command of the wave chain, so 
+	#  the waves are uploaded only once. Keys of the double layer protocol 
+	#  alternate between their layers, which are given as a list of presses.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param presses The list of the alternating presses as tuples (first, repetition, repeat_count, repeat_space) 
+	#  (see "compile"), e.g. [(first, ...), (next, ...)] for the double layer protocol.
+	#  @param count The count of the key presses.
+	#  @param press_space The space (L-signal) between 2 key presses in microseconds.
+	#  @param pin Pin the waves of the chain in the cache until "release" is called. Default: False.
+	#  @return The wave chain as list of wave ids and command codes for "wave_chain", which is a PinnedChain, if it is pinned.
+	def compileRepeated(self, gpio, frequency, presses, count, press_space, pin=False):
+		with self.wave_cache.lock:
+			# The budgets of the loops to compress each IR signal sequence, starting without compression
+			budgets = [0]
+			resets = 0
+			while True:
+				budget = budgets[-1]
+				generation = self.wave_cache.generation
+				# The waves of this chain must not evict each other 
+				protected = set()
+				bodies = [self.press(gpio, frequency, *press, protected=protected, budget=budget) for press in presses]
+				# The first press is followed by the cycles of the next presses
+				chain = bodies[0]
+				gap = self.delay(press_space)
+				rotated = bodies[1:] + bodies[:1]
+				rest = count - 1
+				cycle = []
+				for body in rotated:
+					cycle += gap + body
+				chain += self.loop(cycle, rest // len(rotated))
+				for body in rotated[0:rest % len(rotated)]:
+					chain += gap + body
+				# Repeat once, if the cache has been reset while the waves were created 
+				if generation != self.wave_cache.generation:
+					resets += 1
+					if resets > 1:
+						raise pigpio.error('The waves of the wave chain do not fit into "pigpiod".')
+					continue
+				# Compress the sequences, if the chain is too long, within the loop counters of "pigpiod"
+				if len(budgets) == 1 and len(chain) > self.MAX_CHAIN_LENGTH:
+					budgets.append(self.MAX_LOOPS)
+				elif budget > 0 and self.countLoops(chain) > self.MAX_LOOPS:
+					budgets.append(budget // 2)
+				else:
+					break
+			if pin:
+				chain = PinnedChain(chain, self.wave_cache.pinWaves(self.waveIds(chain)))
+		return chain
+	
+	## Compose the wave chain of a single key press.
+	#
+	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
+	#  @param frequency The IR signal carrier frequency in kc/s.
+	#  @param first The first IR signal sequence in microseconds.
+	#  @param repetition The repeated IR signal sequence or None, if there is no repetition.
+	#  @param repeat_count The count of repetitions.
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds.
+	#  @param protected Set of the cache keys of the waves, which must not be evicted.
+	#  @param budget Maximum count of loops to compress each IR signal sequence. Default: 0.
+	#  @return The list of wave ids and command codes.
+	def press(self, gpio, frequency, first, repetition, repeat_count, repeat_space, protected, budget=0):
+		chain = self.compress(self.wave_cache.getWaves(gpio, frequency, first, protected), budget)
+		if repetition and repeat_count > 0:
+			body = self.delay(repeat_space) + self.compress(self.wave_cache.getWaves(gpio, frequency, repetition, protected), budget)
+			chain += self.loop(body, repeat_count)
+		return chain
+	
+	## Compress the repeated patterns of a list of wave ids to loops.
+	#  <br>
+	#  At each position, the pattern of up to MAX_PATTERN wave ids is chosen, 
+	#  whose consecutive repetitions save the most bytes of the chain.
+	#
+	#  @param wave_ids The list of wave ids.
+	#  @param budget Maximum count of loops.
+	#  @return The list of wave ids and command codes.
+	def compress(self, wave_ids, budget):
+		if budget <= 0:
+			return wave_ids
+		chain = []
+		loops = 0
+		i = 0
+		while i < len(wave_ids):
+			best = None
+			if loops < budget:
+				for period in range(1, min(self.MAX_PATTERN, (len(wave_ids) - i) // 2) + 1):
+					pattern = wave_ids[i:i + period]
+					n = 1
+					while wave_ids[i + n*period:i + (n + 1)*period] == pattern:
+						n += 1
+					saving = period*(n - 1) - self.LOOP_OVERHEAD
+					if saving > 0 and (best == None or saving > best[0]):
+						best = (saving, period, n)
+			if best != None:
+				saving, period, n = best
+				chain += self.loop(wave_ids[i:i + period], n)
+				loops += 1
+				i += period*n
+			else:
+				chain.append(wave_ids[i])
+				i += 1
+		return chain
+	
+	## Count the loops of a wave chain.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @return The count of the loop start commands.
+	def countLoops(self, chain):
+		loops = 0
+		i = 0
+		while i < len(chain):
+			if chain[i] == 255:
+				loops += chain[i + 1] == 0
+				# Loop start and loop forever have no data bytes
+				i += 2 if chain[i + 1] in [0, 3] else 4
+			else:
+				i += 1
+		return loops
+	
+	## Release a pinned wave chain after it has been sent.
+	#
+	#  @param chain The PinnedChain object (see "compileRepeated").
+	def release(self, chain):
+		self.wave_cache.unpinWaves(self.waveIds(chain), chain.pin_epoch)
+	
+	## Extract the wave ids of a wave chain.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @return The list of wave ids.
+	def waveIds(self, chain):
+		wave_ids = []
+		i = 0
+		while i < len(chain):
+			if chain[i] == 255:
+				# Loop start and loop forever have no data bytes
+				i += 2 if chain[i + 1] in [0, 3] else 4
+			else:
+				wave_ids.append(chain[i])
+				i += 1
+		return wave_ids
+	
+	## Compose the delay commands of a wave chain.
+	#
+	#  @param micros The delay in microseconds.
+	#  @return The list of command codes.
+	def delay(self, micros):
+		chain = []
+		while micros > 0:
+			d = min(micros, self.MAX_DELAY)
+			chain += [255, 2, d & 255, d >> 8]
+			micros -= d
+		return chain
+	
+	## Compose the loop commands of a wave chain.
+	#
+	#  @param body The list of wave ids and command codes to repeat.
+	#  @param count The count of loops.
+	#  @return The list of wave ids and command codes.
+	def loop(self, body, count):
+		if count == 1:
+			return list(body)
+		chain = []
+		while count > 0:
+			n = min(count, self.MAX_LOOP_COUNT)
+			chain += [255, 0] + body + [255, 1, n & 255, n >> 8]
+			count -= n
+		return chain
+
+
+## A transmitter, which sends wave chains and waits for the end of the transmission.
+#  <br>
+#  Instead of permanently polling "wave_tx_busy", the transmitter calculates 
+#  the airtime of the wave chain in advance and sleeps until the end of the IR signal. 
+#  A single final status check confirms the end of the transmission.
+#  <br>
+#  A wave chain, which is longer than "pigpiod" accepts, is split into segments 
+#  at its longest spaces (L-signals). The LED is off during a space anyway, so the 
+#  next segment is started after the space without any gap in the IR signal.
+#
+class WaveTransmitter:
+	
+	## Interval in seconds to check the status again, if the transmission is still busy after its airtime.
+	CHECK_INTERVAL = 0.0005
+	
+	## Raspberry Pi object. Default: None.
+	pi = None
+	
+	## Cache of the waves, which stay resident in "pigpiod". Default: None.
+	wave_cache = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param pi The Raspberry Pi object.
+	#  @param wave_cache The cache of the waves, which stay resident in "pigpiod".
+	def __init__(self, pi, wave_cache):
+		self.pi = pi
+		self.wave_cache = wave_cache
+	
+	## Calculate the airtime of a wave chain.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @return The airtime in microseconds.
+	def airtime(self, chain):
+		# Stack of the airtime sums of the nested loops
+		sums = [0]
+		i = 0
+		while i < len(chain):
+			if chain[i] == 255:
+				command = chain[i + 1]
+				if command == 0:
+					# Loop start
+					sums.append(0)
+					i += 2
+				elif command == 1:
+					# Loop repeat
+					body = sums.pop()
+					sums[-1] += body * (chain[i + 2] + (chain[i + 3] << 8))
+					i += 4
+				elif command == 2:
+					# Delay
+					sums[-1] += chain[i + 2] + (chain[i + 3] << 8)
+					i += 4
+				else:
+					# Loop forever
+					return float('inf')
+			else:
+				sums[-1] += self.wave_cache.durations[chain[i]]
+				i += 1
+		return sums[0]
+	
+	## Start the transmission of a wave chain.
+	#  If the chain has to be split, this blocks until its last segment has been started.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @return The expected end of the transmission as "time.monotonic()" value in seconds.
+	def start(self, chain):
+		end = None
+		for space, segment in self.split(chain):
+			if end != None:
+				# Start the next segment at the end of the space
+				self.wait(end)
+				delay = end + space / 1000000.0 - time.monotonic()
+				if delay > 0:
+					time.sleep(delay)
+			airtime = self.airtime(segment)
+			# The chain starts during the call. The end is confirmed by "wait".
+			end = time.monotonic() + airtime / 1000000.0
+			self.pi.wave_chain(segment)
+		return end
+	
+	## Split a wave chain, which is too long for "pigpiod", into segments.
+	#  <br>
+	#  The chain is cut at its longest spaces on the top level. The space at a cut 
+	#  is not sent by "pigpiod", but timed by the transmitter. Loops, which are too 
+	#  long themselves, are unrolled.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @return The list of the segments as tuples (space in microseconds before the segment, wave chain).
+	#  @exception ValueError The chain cannot be split, because it has too long parts without a space.
+	def split(self, chain):
+		if len(chain) <= ChainCompiler.MAX_CHAIN_LENGTH:
+			return [(0, chain)]
+		segments = []
+		space = 0
+		items = []
+		length = 0
+		for item in self.getItems(chain):
+			items.append(item)
+			length += len(item[0])
+			while length > ChainCompiler.MAX_CHAIN_LENGTH:
+				# Cut at the longest space
+				cut = None
+				for i in range(len(items)):
+					if items[i][1] > 0 and (cut == None or items[i][1] >= items[cut][1]):
+						cut = i
+				if cut == None:
+					raise ValueError('The wave chain is too long and cannot be split at a space.')
+				segment = [code for item in items[0:cut] for code in item[0]]
+				if segment:
+					segments.append((space, segment))
+					space = 0
+				space += items[cut][1]
+				items = items[cut + 1:]
+				length = sum(len(item[0]) for item in items)
+		segments.append((space, [code for item in items for code in item[0]]))
+		return segments
+	
+	## Get the top level items of a wave chain. The loops, which are too long, are unrolled.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	#  @return The list of the items as tuples (wave ids and command codes, duration in microseconds, if the item is a space, or 0).
+	def getItems(self, chain):
+		items = []
+		i = 0
+		while i < len(chain):
+			if chain[i] != 255:
+				# Wave: A space has the carrier frequency 0
+				key = self.wave_cache.slots[chain[i]][0]
+				items.append(([chain[i]], self.wave_cache.durations[chain[i]] if key != None and key[1] == 0 else 0))
+				i += 1
+			elif chain[i + 1] == 2:
+				# Delay
+				items.append((chain[i:i + 4], chain[i + 2] + (chain[i + 3] << 8)))
+				i += 4
+			elif chain[i + 1] == 0:
+				# Loop: Find its end
+				depth = 0
+				j = i
+				while True:
+					if chain[j] == 255:
+						depth += {0: 1, 1: -1}.get(chain[j + 1], 0)
+						j += 2 if chain[j + 1] in [0, 3] else 4
+						if depth == 0:
+							break
+					else:
+						j += 1
+				if j - i <= ChainCompiler.MAX_CHAIN_LENGTH:
+					items.append((chain[i:j], 0))
+				else:
+					body = self.getItems(chain[i + 2:j - 4])
+					items += body*(chain[j - 2] + (chain[j - 1] << 8))
+				i = j
+			else:
+				# Loop forever is never split
+				items.append((chain[i:i + 2], 0))
+				i += 2
+		return items
+	
+	## Wait until the transmission has ended.
+	#
+	#  @param end The expected end of the transmission as "time.monotonic()" value in seconds.
+	def wait(self, end):
+		delay = end - time.monotonic()
+		if delay > 0:
+			time.sleep(delay)
+		# Confirm the end of the transmission
+		while self.pi.wave_tx_busy():
+			time.sleep(self.CHECK_INTERVAL)
+	
+	## Send a wave chain and wait until the transmission has ended.
+	#
+	#  @param chain The wave chain as list of wave ids and command codes.
+	def transmit(self, chain):
+		self.wait(self.start(chain))
+
+
+## A cache of "pigpiod" scripts, which send wave chains server-side.
+#  <br>
+#  Each socket command to "pigpiod" is a round trip, which is slow over WiFi to a remote 
+#  Raspberry Pi. A script sends a wave chain (or the chains of a macro with the key spaces 
+#  between them) and waits until the transmission has ended, so a key press only needs 
+#  the "run_script" command and a final status check.
+#  <br>
+#  The scripts are identified by their wave chains. The waves of a stored script are pinned 
+#  in the wave cache. A script is deleted, when its waves have been reset, or when it is the 
+#  least recently used one and the cache is full. So a changed key gets a new script.
+#
+class ScriptCache:
+	
+	## Maximum count of the scripts in this cache ("pigpiod" provides 32 scripts for all clients).
+	MAX_SCRIPTS = 16
+	
+	## Interval in seconds to check the status of a script again.
+	CHECK_INTERVAL = 0.0005
+	
+	## Raspberry Pi object. Default: None.
+	pi = None
+	
+	## Cache of the waves, which stay resident in "pigpiod". Default: None.
+	wave_cache = None
+	
+	## Compiler of the wave chains to extract the wave ids. Default: None.
+	chain_compiler = None
+	
+	## Maximum count of the scripts in this cache.
+	max_scripts = MAX_SCRIPTS
+	
+	## Ordered dictionary of the stored scripts {(chains, space): (script_id, wave_ids, wave_keys, pin_epoch)} in LRU order. Default: None.
+	entries = None
+	
+	## Count of cache hits.
+	hits = 0
+	
+	## Count of cache misses.
+	misses = 0
+	
+	## Lock for accessing this cache in parallel threads.
+	lock = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param pi The Raspberry Pi object.
+	#  @param wave_cache The cache of the waves, which stay resident in "pigpiod".
+	#  @param chain_compiler The compiler of the wave chains.
+	#  @param max_scripts Maximum count of the scripts in this cache. Default: MAX_SCRIPTS.
+	def __init__(self, pi, wave_cache, chain_compiler, max_scripts=MAX_SCRIPTS):
+		self.pi = pi
+		self.wave_cache = wave_cache
+		self.chain_compiler = chain_compiler
+		self.max_scripts = max_scripts
+		self.entries = collections.OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.lock = threading.Lock()
+	
+	## Get the id of the script, which sends wave chains. Store the script, if it is not cached yet.
+	#
+	#  @param chains The list of the wave chains, which are pinned by the caller.
+	#  @param space The delay between 2 chains in milliseconds. Default: 0.
+	#  @return The script id in "pigpiod" or None, if the chains cannot be sent by a script.
+	def getScript(self, chains, space=0):
+		if any(len(chain) > ChainCompiler.MAX_CHAIN_LENGTH for chain in chains):
+			return None
+		key = (tuple(tuple(chain) for chain in chains), space)
+		with self.lock, self.wave_cache.lock:
+			entry = self.entries.get(key)
+			if entry != None and self.isValid(entry):
+				self.hits += 1
+				self.entries.move_to_end(key)
+				return entry[0]
+			self.misses += 1
+			if entry != None:
+				self.delete(key)
+			while len(self.entries) >= self.max_scripts:
+				self.delete(next(iter(self.entries)))
+			try:
+				script_id = self.pi.store_script(self.compose(chains, space))
+				# Wait until "pigpiod" has initialized the script
+				while self.pi.script_status(script_id)[0] == pigpio.PI_SCRIPT_INITING:
+					time.sleep(self.CHECK_INTERVAL)
+			except pigpio.error as e:
+				sys.stderr.write(f'WARNING: Cannot store the script in "pigpiod": {e}\n')
+				return None
+			wave_ids = [wave_id for chain in chains for wave_id in self.chain_compiler.waveIds(chain)]
+			pin_epoch = self.wave_cache.pinWaves(wave_ids)
+			self.entries[key] = (script_id, wave_ids, [self.wave_cache.slots[wave_id][0] for wave_id in wave_ids], pin_epoch)
+			return script_id
+	
+	## Compose the text of a script, which sends wave chains.
+	#
+	#  @param chains The list of the wave chains.
+	#  @param space The delay between 2 chains in milliseconds.
+	#  @return The text of the script.
+	def compose(self, chains, space):
+		lines = []
+		for n in range(len(chains)):
+			if n > 0 and space > 0:
+				lines.append(f'MILS {space}')
+			lines.append('WVCHA ' + ' '.join(str(code) for code in chains[n]))
+			# Wait until the chain has been sent
+			lines += [
+				f'TAG {2*n}',
+				'WVBSY',
+				f'JZ {2*n + 1}',
+				'MICS 500',
+				f'JMP {2*n}',
+				f'TAG {2*n + 1}'
+			]
+		return '\n'.join(lines)
+	
+	## Check if the waves of a stored script are still the same.
+	#
+	#  @param entry The entry of the script in this cache.
+	#  @return True, if the script can be run.
+	def isValid(self, entry):
+		script_id, wave_ids, wave_keys, pin_epoch = entry
+		slots = self.wave_cache.slots
+		return pin_epoch == self.wave_cache.pin_epoch and all(
+			wave_id < len(slots) and slots[wave_id][0] == wave_key for wave_id, wave_key in zip(wave_ids, wave_keys)
+		)
+	
+	## Delete a script from "pigpiod" and from this cache.
+	#
+	#  @param key The key of the script in this cache.
+	def delete(self, key):
+		script_id, wave_ids, wave_keys, pin_epoch = self.entries.pop(key)
+		self.wave_cache.unpinWaves(wave_ids, pin_epoch)
+		try:
+			self.pi.delete_script(script_id)
+		except pigpio.error:
+			pass
+	
+	## Start a script.
+	#
+	#  @param script_id The script id in "pigpiod".
+	#  @param airtime The airtime of the script in microseconds.
+	#  @return The expected end of the script as "time.monotonic()" value in seconds.
+	def run(self, script_id, airtime):
+		end = time.monotonic() + airtime / 1000000.0
+		self.pi.run_script(script_id)
+		return end
+	
+	## Wait until a script has ended.
+	#
+	#  @param script_id The script id in "pigpiod".
+	#  @param end The expected end of the script as "time.monotonic()" value in seconds.
+	def wait(self, script_id, end):
+		delay = end - time.monotonic()
+		if delay > 0:
+			time.sleep(delay)
+		# Confirm the end of the script
+		while self.isRunning(script_id):
+			time.sleep(self.CHECK_INTERVAL)
+	
+	## Check if a script is running.
+	#
+	#  @param script_id The script id in "pigpiod".
+	#  @return True, if the script is running.
+	def isRunning(self, script_id):
+		return self.pi.script_status(script_id)[0] in [pigpio.PI_SCRIPT_RUNNING, pigpio.PI_SCRIPT_WAITING]
+	
+	## Delete all scripts from "pigpiod" and clear this cache.
+	#
+	def clear(self):
+		with self.lock, self.wave_cache.lock:
+			while self.entries:
+				self.delete(next(iter(self.entries)))
+	
+	## Forget all scripts, e.g. after "pigpiod" has been restarted.
+	#
+	#  @param pi The Raspberry Pi object, which is connected to "pigpiod".
+	def reset(self, pi):
+		with self.lock:
+			self.pi = pi
+			self.entries.clear()
+	
+	## Get the statistics of this cache.
+	#
+	#  @return A dictionary of the hits, misses and the count of the stored scripts.
+	def getStatistics(self):
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'scripts': len(self.entries),
+			'max_scripts': self.max_scripts
+		}
+
+
+## A registry of the IR remote control devices and their keys in the data directory.
+#  <br>
+#  The devices are indexed by name in an immutable snapshot, which is replaced 
+#  atomically, when the registry is refreshed. So readers never block on a reload 
+#  and never see a half-loaded device.
+#  <br>
+#  The registry watches the data directory by polling the modification times 
+#  of the JSON files and only reloads the files, which have been changed.
+#  <br>
+#  The devices are read from a memory-mapped binary pack in the data directory 
+#  (see "irc_pack.DevicePack"), if it exists. At start-up, the JSON files are only parsed, 
+#  if they are newer than the pack. The pack is only written by "compilePack" (see "irc_pack.py").
+#  <br>
+#  In lazy mode, a JSON file, which is not in the pack yet, is only indexed by 
+#  its name and parsed on the first request of its device. In eager mode, 
+#  the JSON files are parsed in parallel by a pool of worker processes.
+#  A file, which cannot be loaded, is reported in "errors" and does not 
+#  affect the other devices.
+#
+class DeviceRegistry:
+	
+	## Path to the folder, where the IR remote control data is stored. Default: Empty string.
+	data_dir = ''
+	
+	## Immutable snapshot of the loaded devices {device_name: Device}. Default: None.
+	snapshot = None
+	
+	## Dictionary of the file states {filepath: (mtime_ns, size)} of the last scan. Default: None.
+	file_states = None
+	
+	## Dictionary of the file states {filepath: (mtime_ns, size)} of the devices in the snapshot. Default: None.
+	device_states = None
+	
+	## Immutable index of the devices, which are not loaded yet {device_name: filepath}. Default: None.
+	pending = None
+	
+	## Immutable dictionary of the files, which cannot be loaded {filepath: error message}. Default: None.
+	errors = None
+	
+	## Parse a JSON file on the first request of its device. Default: False.
+	lazy = False
+	
+	## Count of the worker processes to parse the JSON files in eager mode (1 = no pool). Default: 1.
+	workers = 1
+	
+	## Output verbose information. Default: False.
+	verbose = False
+	
+	## Lock for avoiding parallel refreshes.
+	lock_refresh = None
+	
+	## Event to stop watching the data directory. Default: None.
+	stop_watching = None
+	
+	## Path of the binary pack or None, if the devices are not packed. Default: None.
+	pack_path = None
+	
+	## The memory-mapped binary pack of the current snapshot. Default: None.
+	pack = None
+	
+	## Dictionary of the file states {filepath: (mtime_ns, size)} of the devices in the pack. Default: None.
+	pack_states = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param data_dir The path to the folder, where the IR remote control data is stored.
+	#  @param verbose Output verbose information. Default: False.
+	#  @param pack Read the unchanged devices from the memory-mapped binary pack, if it exists. Default: True.
+	#  @param lazy Parse a JSON file on the first request of its device. Default: False.
+	#  @param workers Count of the worker processes to parse the JSON files in eager mode
+	#  or None for the count of CPUs. Default: 1.
+	def __init__(self, data_dir, verbose=False, pack=True, lazy=False, workers=1):
+		self.data_dir = data_dir
+		self.verbose = verbose
+		self.lazy = lazy
+		self.workers = workers or os.cpu_count() or 1
+		self.snapshot = types.MappingProxyType({})
+		self.file_states = {}
+		self.device_states = {}
+		self.pending = types.MappingProxyType({})
+		self.errors = types.MappingProxyType({})
+		self.pack_path = os.path.join(data_dir, DevicePack.FILE_NAME) if pack else None
+		self.pack = None
+		self.pack_states = {}
+		self.lock_refresh = threading.Lock()
+		self.stop_watching = threading.Event()
+		self.refresh()
+	
+	## Get a device by its name. In lazy mode, the device is loaded on its first request.
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @return The device (see "irc_model.Device") or None, if the device is not found or cannot be loaded.
+	def getDevice(self, device_name):
+		device = self.snapshot.get(device_name)
+		if device == None and device_name in self.pending:
+			device = self.loadPending(device_name)
+		return device
+	
+	## Get the names of all devices including the ones, which are not loaded yet.
+	#
+	#  @return The sorted list of the device names.
+	def getDeviceNames(self):
+		return sorted(set(self.snapshot) | set(self.pending))
+	
+	## Load a pending device and add it to the snapshot.
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @return The device or None, if the device cannot be loaded.
+	def loadPending(self, device_name):
+		with self.lock_refresh:
+			# Another thread may have loaded it meanwhile
+			device = self.snapshot.get(device_name)
+			filepath = self.pending.get(device_name)
+			if device != None or filepath == None:
+				return device
+			loaded, errors = self.loadDevices([filepath])
+			pending = dict(self.pending)
+			del pending[device_name]
+			self.pending = types.MappingProxyType(pending)
+			self.setErrors([filepath], errors)
+			device = loaded.get(filepath)
+			if device != None:
+				self.device_states[filepath] = self.file_states[filepath]
+				self.snapshot = types.MappingProxyType({**self.snapshot, device.name: device})
+			return device
+	
+	## Reload the JSON files in the data directory, which have been added, changed or removed.
+	#
+	#  @return True, if the snapshot has been replaced.
+	def refresh(self):
+		with self.lock_refresh:
+			# Scan the data directory
+			file_states = {}
+			try:
+				with os.scandir(self.data_dir) as entries:
+					for entry in entries:
+						device_name, file_extension = os.path.splitext(entry.name)
+						if file_extension.lower() == '.json' and not entry.name.startswith('.') and entry.is_file():
+							stat = entry.stat()
+							file_states[entry.path] = (stat.st_mtime_ns, stat.st_size)
+			except OSError:
+				sys.stderr.write(f'ERROR: Cannot scan the data directory "{self.data_dir}".\n')
+				return False
+			if file_states == self.file_states:
+				return False
+			old_devices = {device.filepath: device for device in self.snapshot.values()}
+			old_states = self.device_states
+			if self.pack_path != None and self.pack == None and self.openPack():
+				# Start with the pack, which has been compiled by "irc_pack.py"
+				old_devices = {device.filepath: device for device in self.snapshot.values()}
+				old_states = self.pack_states
+			# Reuse the unchanged devices. Index or load the others.
+			devices = {}
+			states = {}
+			pending = {}
+			stale = []
+			for filepath in sorted(file_states):
+				device = old_devices.get(filepath)
+				if device != None and file_states[filepath] == old_states.get(filepath):
+					devices[device.name] = device
+					states[filepath] = old_states[filepath]
+				elif filepath in self.errors and file_states[filepath] == self.file_states.get(filepath):
+					# The file has failed before and is not changed since
+					if device != None:
+						devices[device.name] = device
+						states[filepath] = old_states.get(filepath)
+				elif self.lazy and device == None:
+					# Parse it on the first request
+					pending[os.path.splitext(os.path.basename(filepath))[0]] = filepath
+				else:
+					stale.append(filepath)
+			loaded, errors = self.loadDevices(stale)
+			for filepath in stale:
+				device = loaded.get(filepath)
+				if device != None:
+					state = file_states[filepath]
+				else:
+					device = old_devices.get(filepath)
+					state = old_states.get(filepath)
+					if device != None:
+						sys.stderr.write(f'WARNING: Keeping the former version of the infrared code file "{filepath}".\n')
+				if device != None:
+					devices[device.name] = device
+					states[filepath] = state
+			self.setErrors(stale + list(pending.values()), errors, file_states)
+			self.file_states = file_states
+			self.device_states = states
+			self.pending = types.MappingProxyType(pending)
+			# Replace the snapshot atomically
+			self.snapshot = types.MappingProxyType(devices)
+			return True
+	
+	## Parse JSON files. In eager mode, several files are parsed in parallel by worker processes.
+	#
+	#  @param filepaths The list of the paths of the JSON files.
+	#  @return A tuple of the dictionaries of the loaded devices {filepath: Device} and
+	#  of the files, which cannot be loaded {filepath: error message}.
+	def loadDevices(self, filepaths):
+		loaded = {}
+		errors = {}
+		if self.workers > 1 and len(filepaths) > 1:
+			try:
+				with concurrent.futures.ProcessPoolExecutor(min(self.workers, len(filepaths))) as executor:
+					futures = [(filepath, executor.submit(Device.load, filepath)) for filepath in filepaths]
+					results = [(filepath, future.exception() or future.result()) for filepath, future in futures]
+			except (OSError, concurrent.futures.BrokenExecutor) as e:
+				sys.stderr.write(f'WARNING: Cannot parse the infrared code files in parallel: {e}\n')
+				results = [(filepath, self.tryLoad(filepath)) for filepath in filepaths]
+		else:
+			results = [(filepath, self.tryLoad(filepath)) for filepath in filepaths]
+		for filepath, result in results:
+			if isinstance(result, Exception):
+				sys.stderr.write(f'ERROR: The infrared code file "{filepath}" cannot be opened or has errors.\n')
+				errors[filepath] = str(result)
+			else:
+				loaded[filepath] = result
+				if self.verbose:
+					sys.stdout.write(f'Device "{result.name}" has been loaded.\n')
+		return loaded, errors
+	
+	## Parse a JSON file.
+	#
+	#  @param filepath The path of the JSON file.
+	#  @return The device (see "irc_model.Device") or the exception, if the file cannot be loaded.
+	def tryLoad(self, filepath):
+		try:
+			return Device.load(filepath)
+		except (OSError, ValueError) as e:
+			return e
+	
+	## Replace the error reports of the checked files.
+	#
+	#  @param filepaths The list of the paths of the checked files.
+	#  @param errors The dictionary of the new errors {filepath: error message}.
+	#  @param file_states The dictionary of the existing files {filepath: (mtime_ns, size)}
+	#  to drop the reports of removed files or None to keep them. Default: None.
+	def setErrors(self, filepaths, errors, file_states=None):
+		all_errors = {
+			filepath: message for filepath, message in self.errors.items() 
+			if filepath not in filepaths and (file_states == None or filepath in file_states)
+		}
+		all_errors.update(errors)
+		self.errors = types.MappingProxyType(all_errors)
+	
+	## Open the binary pack and replace the snapshot by the devices of the pack.
+	#
+	#  @return True, if the pack has been opened.
+	def openPack(self):
+		try:
+			pack = DevicePack(self.pack_path)
+		except FileNotFoundError:
+			return False
+		except (OSError, ValueError) as e:
+			sys.stderr.write(f'WARNING: Cannot open the pack "{self.pack_path}": {e}\n')
+			return False
+		devices = {}
+		pack_states = {}
+		for filepath, state, keys in pack.getDevices(self.data_dir):
+			device_name = os.path.splitext(os.path.basename(filepath))[0]
+			devices[device_name] = Device(device_name, filepath, keys)
+			pack_states[filepath] = state
+		self.pack = pack
+		self.pack_states = pack_states
+		self.snapshot = types.MappingProxyType(devices)
+		return True
+	
+	## Compile all devices to the binary pack and read them from it.
+	#  The pending devices of the lazy mode are loaded before.
+	#
+	#  @return True, if the pack has been written.
+	def compilePack(self):
+		if self.pack_path == None:
+			return False
+		for device_name in list(self.pending):
+			self.loadPending(device_name)
+		with self.lock_refresh:
+			if not self.writePack(self.snapshot.values(), self.device_states):
+				return False
+			return self.openPack()
+	
+	## Write the devices to the binary pack.
+	#  If the pack cannot be written, the devices stay in memory and the pack is written again by the next call.
+	#
+	#  @param devices The list of the devices.
+	#  @param states The dictionary of the file states {filepath: (mtime_ns, size)} of the devices.
+	#  @return True, if the pack has been written.
+	def writePack(self, devices, states):
+		try:
+			DevicePack.write(
+				self.pack_path,
+				[(os.path.basename(device.filepath), states[device.filepath], device.keys) for device in devices]
+			)
+		except (OSError, ValueError, OverflowError, struct.error) as e:
+			# E.g. a float "timeout_space" or a "repeat_space" beyond the integer fields of the pack
+			sys.stderr.write(f'WARNING: Cannot write the pack "{self.pack_path}": {e}\n')
+			return False
+		if self.verbose:
+			sys.stdout.write(f'The pack "{self.pack_path}" has been compiled.\n')
+		return True
+	
+	## Get the statistics of the registry.
+	#
+	#  @return A dictionary of the counts of the loaded and the pending devices and
+	#  the files, which cannot be loaded {filepath: error message}.
+	def getStatistics(self):
+		return {
+			'loaded': len(self.snapshot),
+			'pending': len(self.pending),
+			'errors': dict(self.errors)
+		}
+	
+	## Watch the data directory in a background thread and refresh the registry on changes.
+	#
+	#  @param interval The polling interval in seconds.
+	def watch(self, interval):
+		self.stop_watching.clear()
+		thread = threading.Thread(target=self._watch, args=(interval,), name='DeviceRegistry', daemon=True)
+		thread.start()
+	
+	## Refresh the registry until watching is stopped.
+	#
+	#  @param interval The polling interval in seconds.
+	def _watch(self, interval):
+		while not self.stop_watching.wait(interval):
+			self.refresh()
+	
+	## Stop watching the data directory.
+	#
+	def stop(self):
+		self.stop_watching.set()
+
+
+## A store of the key states of the double layer protocol.
+#  <br>
+#  The double layer protocol alternates between the "first" and the "next" 
+#  IR signal sequence, until the key has not been pressed for "timeout_space" seconds. 
+#  The states are held in memory and checked against a monotonic clock.
+#  <br>
+#  A background thread flushes the changed states in batches to a single snapshot file,
+#  which is atomically replaced. The snapshot contains the timeouts as wall clock 
+#  time stamps, so the alternation survives restarts.
+#
+class ToggleStateStore:
+	
+	## File name of the snapshot file in the data directory.
+	FILE_NAME = '.status.json'
+	
+	## Path to the snapshot file. Default: Empty string.
+	filepath = ''
+	
+	## Dictionary of the timeouts {(device_name, key_name): monotonic time in seconds}. Default: None.
+	timeouts = None
+	
+	## Lock for accessing the timeouts in parallel threads.
+	lock = None
+	
+	## Event, which is set, if the timeouts have been changed since the last flush. Default: None.
+	dirty = None
+	
+	## Event to stop the background flusher. Default: None.
+	stop_flushing = None
+	
+	## Background flusher thread. Default: None.
+	flusher = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param data_dir The path to the folder, where the snapshot file is stored.
+	def __init__(self, data_dir):
+		self.filepath = os.path.join(data_dir, self.FILE_NAME)
+		self.timeouts = {}
+		self.lock = threading.Lock()
+		self.dirty = threading.Event()
+		self.stop_flushing = threading.Event()
+		self.load()
+	
+	## Select the IR signal sequence of a double layer protocol key and toggle its state.
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @param key_name Name of the key on the IR remote control.
+	#  @param timeout_space The timeout in seconds after the first press on the same key will be forgotten.
+	#  @return True, if the "first" sequence must be sent, or False, if the "next" sequence must be sent.
+	def toggle(self, device_name, key_name, timeout_space):
+		now = time.monotonic()
+		with self.lock:
+			timeout = self.timeouts.pop((device_name, key_name), None)
+			first = timeout == None or now > timeout
+			if first:
+				self.timeouts[(device_name, key_name)] = now + timeout_space
+			self.dirty.set()
+		return first
+	
+	## Load the snapshot file.
+	#
+	def load(self):
+		try:
+			with open(self.filepath, 'r') as file:
+				snapshot = json.load(file)
+		except FileNotFoundError:
+			return
+		except:
+			sys.stderr.write(f'ERROR: Cannot load or JSON decode the status file "{self.filepath}".\n')
+			return
+		# Convert the wall clock time stamps to the monotonic clock
+		offset = time.monotonic() - time.time()
+		with self.lock:
+			for item in snapshot:
+				self.timeouts[(item['device_name'], item['key_name'])] = item['timeout'] + offset
+	
+	## Write the snapshot file, if the states have been changed.
+	#
+	#  @return True, if the snapshot file has been written successfully or nothing had to be written.
+	def flush(self):
+		if not self.dirty.is_set():
+			return True
+		# Convert the monotonic clock to wall clock time stamps and forget the expired states
+		now = time.monotonic()
+		offset = time.time() - now
+		with self.lock:
+			self.dirty.clear()
+			snapshot = [
+				{'device_name': device_name, 'key_name': key_name, 'timeout': timeout + offset}
+				for (device_name, key_name), timeout in self.timeouts.items()
+				if timeout >= now
+			]
+		# Replace the snapshot file atomically
+		temp_filepath = f'{self.filepath}.tmp'
+		try:
+			with open(temp_filepath, 'w') as file:
+				json.dump(snapshot, file, indent='\t')
+			os.replace(temp_filepath, self.filepath)
+		except:
+			sys.stderr.write(f'ERROR: Cannot save the status to file "{self.filepath}".\n')
+			self.dirty.set()
+			return False
+		return True
+	
+	## Start the background flusher.
+	#
+	#  @param interval The interval in seconds to flush the changed states in one batch.
+	def start(self, interval):
+		if self.flusher != None:
+			return
+		self.stop_flushing.clear()
+		self.flusher = threading.Thread(target=self._flush, args=(interval,), name='ToggleStateStore', daemon=True)
+		self.flusher.start()
+		# Flush the changed states before the interpreter shuts down
+		atexit.register(self.stop)
+	
+	## Flush the changed states until the background flusher is stopped.
+	#
+	#  @param interval The interval in seconds to flush the changed states in one batch.
+	def _flush(self, interval):
+		while not self.stop_flushing.wait(interval):
+			self.flush()
+	
+	## Stop the background flusher and flush the changed states.
+	#  The store is not referenced by "atexit" anymore, so it can be garbage collected.
+	#
+	def stop(self):
+		atexit.unregister(self.stop)
+		self.stop_flushing.set()
+		if self.flusher != None:
+			self.flusher.join()
+			self.flusher = None
+		self.flush()
+
+
+## A ticket of a request for transmission permission.
+#
+class TransmissionTicket:
+	
+	## Priority class of the request.
+	priority = 0
+	
+	## Time, when the permission has been requested, as "time.monotonic()" value in seconds.
+	requested = 0.0
+	
+	## Time, when the permission has been granted, as "time.monotonic()" value in seconds, or None.
+	granted = None
+	
+	## Function to call, when the permission has been granted, or None to set the event. 
+	callback = None
+	
+	## Event, which is set, when the permission has been granted. Default: None.
+	event = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param priority The priority class of the request.
+	#  @param callback The function to call, when the permission has been granted, or None to set the event. Default: None. 
+	def __init__(self, priority, callback=None):
+		self.priority = priority
+		self.requested = time.monotonic()
+		self.callback = callback
+		self.event = threading.Event()
+	
+	## Get the time, the request has been waiting in the queue.
+	#
+	#  @return The queue wait time in seconds.
+	def getWait(self):
+		if self.granted == None:
+			return time.monotonic() - self.requested
+		return self.granted - self.requested
+	
+
+## A scheduler, which grants the permission to transmit to one request after the other.
+#  <br>
+#  The requests are queued strictly FIFO per priority class. The permission is always 
+#  granted to the oldest request of the highest priority class. A request holds 
+#  the permission for a single key press only, so a key press of a higher priority class 
+#  preempts a long macro between two keys.
+#
+class TransmissionScheduler:
+	
+	## Priority class of interactive key presses (e.g. "mute").
+	PRIORITY_INTERACTIVE = 0
+	
+	## Priority class of normal key presses.
+	PRIORITY_NORMAL = 1
+	
+	## Priority class of bulk traffic (e.g. macros of scenes).
+	PRIORITY_BULK = 2
+	
+	## List of the FIFO queues of the tickets per priority class. Default: None.
+	queues = None
+	
+	## The ticket, which currently holds the permission to transmit, or None.
+	owner = None
+	
+	## Lock for accessing the queues in parallel threads.
+	lock = None
+	
+	## Dictionary of the queue wait statistics per priority class. Default: None.
+	statistics = None
+	
+	## CONSTRUCTOR.
+	#
+	def __init__(self):
+		self.queues = [collections.deque() for priority in range(self.PRIORITY_BULK + 1)] #@UnusedVariable
+		self.owner = None
+		self.lock = threading.Lock()
+		self.statistics = {
+			priority: {'count': 0, 'total_wait': 0.0, 'max_wait': 0.0} 
+			for priority in range(len(self.queues))
+		}
+	
+	## Queue a request for the permission to transmit.
+	#
+	#  @param priority The priority class as element of {PRIORITY_INTERACTIVE; PRIORITY_NORMAL; PRIORITY_BULK}.
+	#  @param callback The function to call, when the permission has been granted, or None. Default: None. 
+	#  @return The ticket of the request.
+	def request(self, priority, callback=None):
+		ticket = TransmissionTicket(min(max(priority, 0), len(self.queues) - 1), callback)
+		with self.lock:
+			self.queues[ticket.priority].append(ticket)
+			self._grant()
+		return ticket
+	
+	## Wait for the permission to transmit.
+	#
+	#  @param priority The priority class. Default: PRIORITY_NORMAL.
+	#  @return The ticket, which holds the permission.
+	def acquire(self, priority=PRIORITY_NORMAL):
+		ticket = self.request(priority)
+		ticket.event.wait()
+		return ticket
+	
+	## Wait for the permission to transmit without blocking the event loop.
+	#
+	#  @param priority The priority class. Default: PRIORITY_NORMAL.
+	#  @return The ticket, which holds the permission.
+	async def acquireAsync(self, priority=PRIORITY_NORMAL):
+		loop = asyncio.get_running_loop()
+		future = loop.create_future()
+		def granted():
+			loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+		ticket = self.request(priority, granted)
+		try:
+			await future
+		except asyncio.CancelledError:
+			self.cancel(ticket)
+			raise
+		return ticket
+	
+	## Return the permission to transmit and grant it to the next request.
+	#
+	#  @param ticket The ticket, which holds the permission.
+	def release(self, ticket):
+		with self.lock:
+			if self.owner is ticket:
+				self.owner = None
+				self._grant()
+	
+	## Cancel a request. If the permission has already been granted, it is returned.
+	#
+	#  @param ticket The ticket of the request.
+	def cancel(self, ticket):
+		with self.lock:
+			if self.owner is ticket:
+				self.owner = None
+				self._grant()
+			elif ticket in self.queues[ticket.priority]:
+				self.queues[ticket.priority].remove(ticket)
+	
+	## Grant the permission to the oldest request of the highest priority class, if no other request holds it.
+	#  The lock must be held by the caller.
+	#
+	def _grant(self):
+		if self.owner != None:
+			return
+		for queue in self.queues:
+			if queue:
+				ticket = queue.popleft()
+				ticket.granted = time.monotonic()
+				self.owner = ticket
+				# Update the statistics
+				wait = ticket.getWait()
+				statistics = self.statistics[ticket.priority]
+				statistics['count'] += 1
+				statistics['total_wait'] += wait
+				statistics['max_wait'] = max(statistics['max_wait'], wait)
+				if ticket.callback != None:
+					ticket.callback()
+				else:
+					ticket.event.set()
+				return
+	
+	## Get the queue wait statistics to prove the latency per priority class.
+	#
+	#  @return A dictionary {priority: {'count', 'total_wait', 'max_wait', 'average_wait', 'queued'}} with times in seconds.
+	def getStatistics(self):
+		with self.lock:
+			return {
+				priority: dict(
+					statistics, 
+					average_wait=statistics['total_wait'] / statistics['count'] if statistics['count'] else 0.0,
+					queued=len(self.queues[priority])
+				)
+				for priority, statistics in self.statistics.items()
+			}
+
 
 ## A class to send remote control data on Raspberry Pi.
 #  It provides the features of an API-based universal remote control.
 #
 class UniversalRemoteControl:
 	
-	## List of IR code JSON files in the ./data sub folder. Default: Empty list.
-	devices = []
+	## Registry of the IR code JSON files in the ./data sub folder. Default: None.
+	registry = None
+	
+	## Store of the key states of the double layer protocol. Default: None.
+	toggle_states = None
 	
 	## Raspberry Pi object. Default: None.
 	pi = None
 	
 	## GPIO port number for transmitting IR signals.
 	gpio = None
-
+	
 	## Path to the folder, where the IR remote control data is stored. Default: Empty string.   
 	data_dir = ''
 	
 	## Output verbose information. Default: False.
 	verbose = False
 	
-	## Lock for avoiding parallel transmissions.
-	lock_transmission = threading.RLock()
+	## Default space (L-signal) between 2 presses of the same key in microseconds, if the key has no repeat space.
+	PRESS_SPACE = Key.PRESS_SPACE
+	
+	## Scheduler for avoiding parallel transmissions. It is shared by all objects of this class.
+	scheduler = TransmissionScheduler()
+	
+	## Engine to compose the carrier square wave data. Default: None.
+	carrier_engine = None
+	
+	## Cache of the waves, which stay resident in "pigpiod". Default: None.
+	wave_cache = None
+	
+	## Compiler of the wave chains. Default: None.
+	chain_compiler = None
+	
+	## Transmitter of the wave chains. Default: None.
+	transmitter = None
+	
+	## Cache of the "pigpiod" scripts or None, if the wave chains are sent directly. Default: None.
+	scripts = None
+	
+	## Dictionary of the devices, which retain their waves in the wave cache {'<device_name> (<carrier_frequency> kc/s)': device}. Default: None.
+	retained = None
 	
 	## CONSTRUCTOR.
 	#
 	#  @param gpio The Raspberry Pi GPIO port, on which the IR sender is connected.
 	#  @param data_dir The path to the folder, where the IR remote control data is stored. Default: The "data" sub directory in the script folder. 
 	#  @param verbose Output verbose information. Default: False.
+	#  @param max_cached_waves Maximum count of waves, which stay resident in "pigpiod". Default: WaveCache.MAX_WAVES.
+	#  @param reload_interval Interval in seconds to check the data directory for changes or None to load it only once. Default: 2.0.
+	#  @param flush_interval Interval in seconds to save the changed key states of the double layer protocol. Default: 5.0.
+	#  @param lazy_loading Parse the JSON file of a device, which is not in the pack yet, on its first request. Default: False.
+	#  @param workers Count of the worker processes to parse the JSON files, if lazy loading is off, 
+	#  or None for the count of CPUs. Default: 1.
+	#  @param use_scripts Send the key presses by "pigpiod" scripts to save round trips to a remote "pigpiod". Default: False.
 	def __init__(
 			self, 
 			gpio, 
 			data_dir=os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data'),
-			verbose=False
+			verbose=False,
+			max_cached_waves=WaveCache.MAX_WAVES,
+			reload_interval=2.0,
+			flush_interval=5.0,
+			lazy_loading=False,
+			workers=1,
+			use_scripts=False
 	):
 		# Init properties
 		self.gpio = gpio 
@@ -89,54 +1974,32 @@ class UniversalRemoteControl:
 			sys.exit(1)
 		# IR TX connect to the GPIO port
 		self.pi.set_mode(self.gpio, pigpio.OUTPUT)
-		# Load devices
-		self.devices = []
-		data_dir = os.path.join(data_dir)
-		for (path, dirs, files) in os.walk(data_dir): #@UnusedVariable
-			for name in files:
-				filepath = os.path.join(path, name) 
-				device_name, file_extension = os.path.splitext(name)
-				if file_extension.lower() == '.json' and name.startswith('.') == False:
-					try:
-						with open(filepath, 'r') as file:
-							# Load IR remote control JSON data as a dictionary
-							keys = json.load(file)
-							file.close()
-					except:
-						Exception(f'The infrared code file "{filepath}" cannot be opened or has errors.')
-						break
-					# Ensure downwards compatibility to former "irrp.py" recordings
-					keys_stringlist = ' '.join(list(keys.keys()))
-					key_names = keys_stringlist.split()
-					first_item = keys[key_names[0]]
-					# In the simple program the first item is a list, not a dict
-					if type(first_item) is list:
-						# Automatically migrate to the new data model
-						new_keys = {}
-						for key_name in key_names:
-							new_key = {
-								'type': 0,
-								'first': keys[key_name],
-								'next': None,
-								'repetition_first': None,
-								'repetition_next': None,
-								'repeat_count': 0,
-								'repeat_space': 0,
-								'timeout_space': None
-							}
-							new_keys[key_name] = new_key
-						keys = new_keys
-					sys.stdout.write('Done.\n')
-					# Store data
-					data_record = {}
-					data_record['device_name'] = device_name
-					data_record['filepath'] = filepath
-					data_record['keys'] = keys
-					self.devices.append(data_record)
-			break
+		# Compose the carrier pulse trains from templates
+		self.carrier_engine = CarrierEngine()
+		# Keep the compiled waves resident in "pigpiod"
+		self.wave_cache = WaveCache(self.pi, self.carrier, max_waves=max_cached_waves)
+		self.chain_compiler = ChainCompiler(self.wave_cache)
+		self.transmitter = WaveTransmitter(self.pi, self.wave_cache)
+		self.scripts = ScriptCache(self.pi, self.wave_cache, self.chain_compiler) if use_scripts else None
+		self.retained = {}
+		# Load devices and watch the data directory for changes
+		self.registry = DeviceRegistry(data_dir, verbose, lazy=lazy_loading, workers=workers)
+		if reload_interval != None:
+			self.registry.watch(reload_interval)
+		# Restore the key states of the double layer protocol
+		self.toggle_states = ToggleStateStore(data_dir)
+		self.toggle_states.start(flush_interval)
 	
 	## DESTRUCTOR.
 	def __del__(self):
+		# Stop watching the data directory
+		self.registry.stop()
+		# Save the key states of the double layer protocol
+		self.toggle_states.stop()
+		# Delete the scripts and the resident waves
+		if self.scripts != None:
+			self.scripts.clear()
+		self.wave_cache.clear()
 		# IR TX disconnect from the GPIO port
 		self.pi.set_mode(self.gpio, pigpio.INPUT)
 		# Disconnect from Raspberry Pi
@@ -146,160 +2009,69 @@ class UniversalRemoteControl:
 	#  <br>
 	#  This sending routine is thread-safe. It avoids parallel transfers 
 	#  if it is called simultaneously in parallel threads, 
-	#  using the FIFO principle to queue the transfers.
+	#  using the FIFO principle per priority class to queue the transfers.
 	#  
 	#  @param device_name Name of the IR-controlled device (see file name without extension in the "./data" folder.
 	#  @param key_name Name of the key on the IR remote control (e.g. "power", "on", "off", etc.). 
 	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
 	#  @param key_space Delay after a key has been sent or None, if no key_space is required. Default: 0.1 seconds.
 	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @param single_chain Send the first IR signal sequence, the repetitions and the spaces between them as a single wave chain. Default: True.
+	#  @param priority The priority class as element of {TransmissionScheduler.PRIORITY_INTERACTIVE; PRIORITY_NORMAL; PRIORITY_BULK}. Default: PRIORITY_NORMAL.
+	#  @param count The count of the key presses, which are sent as a single wave chain (e.g. a volume ramp). Default: 1.
+	#  @param press_space The space (L-signal) between 2 key presses in microseconds. 
+	#  Default: None, which is the repeat space of the key or PRESS_SPACE.
 	#  @return Result code as element of {0 = SUCCESS; 1 = FAILURE}. 
-	def send(self, device_name, key_name, carrier_frequency=38.0, key_space=0.1, no_repeat=False):
-		# Find the device
-		device_found = None
-		for device in self.devices:
-			if device['device_name'] == device_name:
-				device_found = device
-		if not device_found:
-			sys.stderr.write(f'ERROR: Device "{device_name}" not found.\n')
-			return 1
-		# Find the infrared code list for the key
-		try:
-			keys = device_found['keys']
-		except:
-			sys.stderr.write(f'ERROR: Command "{key_name}" not found.\n')
-			return 1
+	def send(
+			self, 
+			device_name, 
+			key_name, 
+			carrier_frequency=38.0, 
+			key_space=0.1, 
+			no_repeat=False, 
+			single_chain=True, 
+			priority=TransmissionScheduler.PRIORITY_NORMAL,
+			count=1,
+			press_space=None
+	):
 		if self.verbose:
 			sys.stdout.write(f'Sending key "{key_name}" ...\n')
-		key = keys[key_name]
 		# Compose the IR signal
-		sequences = [] 
-		key_type = key['type']
-		if key_type == 0:
-			# Single shot protocol 
-			sequences.append(key['first'])
-		elif key_type == 1:
-			# Single layer protocol
-			sequences.append(key['first'])
-			if not no_repeat:
-				for i in range(key['repeat_count']):
-					sequences.append(key['repetition_first'])
-		elif key_type == 2:
-			# Double layer protocol
-			status_file_path = os.path.join(self.data_dir, f'.status_{device_name}_{key_name}.json') 
-			# Load the key status from file
-			key_status = None
-			try:
-				f = open(status_file_path, "r")
-				try:
-					key_status = json.load(f)
-				except:
-					pass
-				f.close()
-			except:
-				pass
-			# Depending on the content of the status file 
-			# and the current date and time
-			# select the correct IR signal sequences. 
-			now = datetime.datetime.now()
-			if (
-				key_status == None 
-				or 
-				(not ('timeout' in key_status)) 
-				or 
-				now > datetime.datetime.strptime(key_status['timeout'], '%Y-%m-%d %H:%M:%S')
-			):
-				sequences.append(key['first'])
-				if not no_repeat:
-					for i in range(key['repeat_count']):
-						sequences.append(key['repetition_first'])
-				timeout = now + datetime.timedelta(seconds=key['timeout_space'])
-				timeout_str = timeout.strftime('%Y-%m-%d %H:%M:%S')
-				key_status = {'timeout': timeout_str}
-			else:
-				sequences.append(key['next'])
-				if not no_repeat:
-					for i in range(key['repeat_count']):
-						sequences.append(key['repetition_next'])
-				key_status = None
-		else:
-			sys.stderr.write(f'ERROR: Unknown protocol type "{key_type}".\n')
+		presses, repeat_space = self.selectPresses(device_name, key_name, count, no_repeat)
+		if presses == None:
 			return 1
+		if press_space == None:
+			press_space = repeat_space or self.PRESS_SPACE
+		# Prepare the waves, while other key presses are on air
+		if single_chain:
+			self.retainDevice(device_name, carrier_frequency)
+			chain = self.compilePresses(presses, repeat_space, count, press_space, carrier_frequency, pin=True)
 		# WAIT FOR TRANSMISSION PERMISSION  
-		self.lock_transmission.acquire() 
+		ticket = self.scheduler.acquire(priority)
 		# TRANSMISSION IS ALLOWED NOW
 		# OTHER TRANSMISSIONS ARE NOT PERMITTED TO SEND NOW
-		if self.verbose: sys.stdout.write('Sending ...\n')
-		# Send the IR signal sequences
-		for m in range(0, len(sequences)):
-			sequence = sequences[m]					
-			# Create IR signal
-			marks_wid = {}
-			spaces_wid = {}
-			wave = [0]*len(sequence)
-			for i in range(0, len(sequence)):
-				ci = sequence[i]
-				# Check if index is an odd number
-				if i & 1: 
-					# Space
-					if ci not in spaces_wid:
-						self.pi.wave_add_generic([pigpio.pulse(0, 0, ci)])
-						spaces_wid[ci] = self.pi.wave_create()
-					wave[i] = spaces_wid[ci]
-				else: 
-					# Mark
-					if ci not in marks_wid:
-						wf = self.carrier(self.gpio, carrier_frequency, ci)
-						self.pi.wave_add_generic(wf)
-						marks_wid[ci] = self.pi.wave_create()
-					wave[i] = marks_wid[ci]
-			# Send the signal
-			self.pi.wave_chain(wave)
-			while self.pi.wave_tx_busy():
-				time.sleep(0.002)
-			for i in marks_wid:
-				self.pi.wave_delete(marks_wid[i])
-			marks_wid = {}
-			for i in spaces_wid:
-				self.pi.wave_delete(spaces_wid[i])
-			spaces_wid = {}
-			marks_wid = {}
-			# Send space between IR signal repetitions
-			if m < len(sequences) - 1:
-				self.pi.wave_add_generic([pigpio.pulse(0, 0, key['repeat_space'])])
-				po = self.pi.wave_create()
-				self.pi.wave_chain([po])
-				while self.pi.wave_tx_busy():
-					time.sleep(0.002)
-				self.pi.wave_delete(po)
-		if self.verbose: sys.stdout.write('... sent.\n')
-		# ALLOW THE NEXT OTHER TRANSMISSION
-		self.lock_transmission.release()
-		# After the IR signal has been sent 
-		if key_type == 2:
-			# Double layer protocol
-			if key_status == None:
-				# Delete the status file
-				if os.path.isfile(status_file_path):
-					try:
-						os.remove(status_file_path)
-					except:
-						sys.stderr.write(f'ERROR: Cannot remove the status file "{status_file_path}".\n')
-						return 13
-			else:
-				# Save the status file
-				try:
-					f = open(status_file_path, "w")
-					try:
-						json.dump(key_status, f, indent='\t')
-					except:
-						sys.stderr.write(f'ERROR: Cannot JSON encode and save the status to file "{status_file_path}".\n')
-						f.close()
-						return 1
-					f.close()
-				except:
-					sys.stderr.write(f'ERROR: Cannot open file "{status_file_path}" to write.\n')
-					return 13
+		try:
+			if self.verbose: sys.stdout.write(f'Sending after {ticket.getWait():.4f} seconds in queue ...\n')
+			script_id = self.scripts.getScript([chain]) if single_chain and self.scripts != None else None
+			if script_id != None:
+				# Send all presses of the key by a single script command
+				self.scripts.wait(script_id, self.scripts.run(script_id, self.transmitter.airtime(chain)))
+			elif single_chain:
+				# Send all presses of the key in one DMA run
+				chain, end = self.startPresses(chain, presses, repeat_space, count, press_space, carrier_frequency)
+				self.transmitter.wait(end)
+			# Send the IR signal sequences one by one
+			else: 
+				for n in range(count):
+					if n > 0:
+						time.sleep(press_space / 1000000.0)
+					self.sendSequences(presses[n % len(presses)], carrier_frequency, repeat_space)
+			if self.verbose: sys.stdout.write('... sent.\n')
+		finally:
+			# ALLOW THE NEXT OTHER TRANSMISSION
+			self.scheduler.release(ticket)
+			if single_chain:
+				self.chain_compiler.release(chain)
 		# Done
 		sys.stdout.write(f'The IR signal for key {key_name} has been successfully sent.\n')
 		# Space between the IR signals to following IR signals
@@ -308,6 +2080,279 @@ class UniversalRemoteControl:
 		# Everything is fine
 		return 0
 	
+	## Send the IR signals sequences for a list of keys (e.g. a macro) to a specific device.
+	#  <br>
+	#  The permission to transmit is requested for each key separately, so 
+	#  key presses with higher priority are sent between the keys of the list.
+	#  Otherwise the list is sent by a single "pigpiod" script (see "sendMacro").
+	#
+	#  @param device_name Name of the IR-controlled device (see file name without extension in the "./data" folder.
+	#  @param key_names List of the names of the keys on the IR remote control. 
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @param key_space Delay after a key has been sent or None, if no key_space is required. Default: 0.1 seconds.
+	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @param priority The priority class. Default: TransmissionScheduler.PRIORITY_BULK.
+	#  @param single_script Send the list by a single "pigpiod" script, if scripts are used. Default: False.
+	#  @return Result code as element of {0 = SUCCESS; 1 = FAILURE}. 
+	def sendKeys(
+			self, 
+			device_name, 
+			key_names, 
+			carrier_frequency=38.0, 
+			key_space=0.1, 
+			no_repeat=False, 
+			priority=TransmissionScheduler.PRIORITY_BULK,
+			single_script=False
+	):
+		if single_script and self.scripts != None:
+			return self.sendMacro(device_name, key_names, carrier_frequency, key_space, no_repeat, priority)
+		for key_name in key_names:
+			rc = self.send(device_name, key_name, carrier_frequency, key_space, no_repeat, priority=priority)
+			if rc != 0:
+				return rc
+		return 0
+	
+	## Send the IR signals sequences for a list of keys by a single "pigpiod" script.
+	#  The permission to transmit is requested once for the whole list.
+	#
+	#  @param device_name Name of the IR-controlled device (see file name without extension in the "./data" folder.
+	#  @param key_names List of the names of the keys on the IR remote control. 
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @param key_space Delay after a key has been sent or None, if no key_space is required. Default: 0.1 seconds.
+	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @param priority The priority class. Default: TransmissionScheduler.PRIORITY_BULK.
+	#  @return Result code as element of {0 = SUCCESS; 1 = FAILURE}. 
+	def sendMacro(
+			self, 
+			device_name, 
+			key_names, 
+			carrier_frequency=38.0, 
+			key_space=0.1, 
+			no_repeat=False, 
+			priority=TransmissionScheduler.PRIORITY_BULK
+	):
+		chains = []
+		try:
+			# Compose the IR signals
+			for key_name in key_names:
+				presses, repeat_space = self.selectPresses(device_name, key_name, 1, no_repeat)
+				if presses == None:
+					return 1
+				self.retainDevice(device_name, carrier_frequency)
+				chains.append(self.compilePresses(presses, repeat_space, 1, repeat_space or self.PRESS_SPACE, carrier_frequency, pin=True))
+			space = round((key_space or 0)*1000)
+			script_id = self.scripts.getScript(chains, space) if self.scripts != None else None
+			# WAIT FOR TRANSMISSION PERMISSION  
+			ticket = self.scheduler.acquire(priority)
+			try:
+				if script_id != None:
+					airtime = sum(self.transmitter.airtime(chain) for chain in chains) + space*1000*(len(chains) - 1)
+					self.scripts.wait(script_id, self.scripts.run(script_id, airtime))
+				else:
+					for n in range(len(chains)):
+						if n > 0:
+							time.sleep(space / 1000.0)
+						self.transmitter.transmit(chains[n])
+			finally:
+				# ALLOW THE NEXT OTHER TRANSMISSION
+				self.scheduler.release(ticket)
+		finally:
+			for chain in chains:
+				self.chain_compiler.release(chain)
+		sys.stdout.write(f'The IR signals for keys {" ".join(key_names)} have been successfully sent.\n')
+		# Space between the IR signals to following IR signals
+		if key_space != None:
+			time.sleep(key_space)
+		return 0
+	
+	## Find a key of a device.
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @param key_name Name of the key on the IR remote control.
+	#  @return The Key object or None, if the device or the key is not found.
+	def findKey(self, device_name, key_name):
+		# Find the device
+		device = self.registry.getDevice(device_name)
+		if device == None:
+			sys.stderr.write(f'ERROR: Device "{device_name}" not found.\n')
+			return None
+		# Find the infrared code list for the key
+		key = device.keys.get(key_name)
+		if key == None:
+			sys.stderr.write(f'ERROR: Command "{key_name}" not found.\n')
+		return key
+	
+	## Select the IR signal sequences for a key press depending on the protocol of the key (see "Key.selectSequences").
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @param key_name Name of the key on the IR remote control.
+	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @return A tuple of the list of IR signal sequences and the repeat space in microseconds or (None, 0) in case of failure.
+	def selectSequences(self, device_name, key_name, no_repeat=False):
+		presses, repeat_space = self.selectPresses(device_name, key_name, 1, no_repeat)
+		if presses == None:
+			return None, 0
+		return presses[0], repeat_space
+	
+	## Select the IR signal sequences for N presses of the same key (see "Key.selectPresses").
+	#  The key states of the double layer protocol are advanced by each press.
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @param key_name Name of the key on the IR remote control.
+	#  @param count The count of the key presses. Default: 1.
+	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @return A tuple of the list of the alternating presses (see "selectSequences") and 
+	#  the repeat space in microseconds or (None, 0) in case of failure.
+	def selectPresses(self, device_name, key_name, count=1, no_repeat=False):
+		if count < 1:
+			sys.stderr.write(f'ERROR: Invalid count {count} of key presses.\n')
+			return None, 0
+		key = self.findKey(device_name, key_name)
+		if key == None:
+			return None, 0
+		try:
+			# Depending on the key state select the correct IR signal sequences of the double layer protocol
+			presses = key.selectPresses(count, no_repeat, lambda: self.toggle_states.toggle(device_name, key_name, key.timeout_space))
+		except ValueError as e:
+			sys.stderr.write(f'ERROR: {e}\n')
+			return None, 0
+		return presses, key.repeat_space
+	
+	## Retain the marks and spaces of all keys of a device in the wave cache.
+	#  This is done once per device and carrier frequency and again after the device has been reloaded.
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @return True, if all waves of the device are resident.
+	def retainDevice(self, device_name, carrier_frequency=38.0):
+		device = self.registry.getDevice(device_name)
+		owner = f'{device_name} ({carrier_frequency:g} kc/s)'
+		if device == None or self.retained.get(owner) is device:
+			return device != None
+		sequences = []
+		for key in device.keys.values():
+			# The keys of a standard IR protocol retain the symbol waves of their frames
+			for sequence in key.getSequences().values():
+				if sequence != None:
+					sequences.append(sequence)
+		self.retained[owner] = device
+		return self.wave_cache.retainWaves(owner, self.gpio, carrier_frequency, sequences)
+	
+	## Compile the IR signal sequences of a key press to a single wave chain.
+	#
+	#  @param sequences The list of IR signal sequences [first, repetition, ..., repetition].
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds.
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @param pin Pin the waves of the chain until "chain_compiler.release" is called. Default: False.
+	#  @return The wave chain as list of wave ids and command codes.
+	def compileSequences(self, sequences, repeat_space, carrier_frequency=38.0, pin=False):
+		return self.chain_compiler.compile(
+			self.gpio, 
+			carrier_frequency, 
+			sequences[0], 
+			sequences[1] if len(sequences) > 1 else None, 
+			len(sequences) - 1, 
+			repeat_space,
+			pin
+		)
+	
+	## Compile N presses of a key to a single wave chain.
+	#
+	#  @param presses The list of the alternating presses, each as list of IR signal sequences (see "selectPresses").
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds.
+	#  @param count The count of the key presses.
+	#  @param press_space The space (L-signal) between 2 key presses in microseconds.
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @param pin Pin the waves of the chain until "chain_compiler.release" is called. Default: False.
+	#  @return The wave chain as list of wave ids and command codes.
+	def compilePresses(self, presses, repeat_space, count, press_space, carrier_frequency=38.0, pin=False):
+		return self.chain_compiler.compileRepeated(
+			self.gpio, 
+			carrier_frequency, 
+			[(sequences[0], sequences[1] if len(sequences) > 1 else None, len(sequences) - 1, repeat_space) for sequences in presses], 
+			count, 
+			press_space, 
+			pin
+		)
+	
+	## Start the transmission of the wave chain of N key presses.
+	#  If the connection to "pigpiod" is lost (e.g. by a restart), the connection and 
+	#  the wave cache are restored and the chain is compiled and started again.
+	#
+	#  @param chain The pinned wave chain (see "compilePresses").
+	#  @param presses The list of the alternating presses (see "selectPresses").
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds.
+	#  @param count The count of the key presses.
+	#  @param press_space The space (L-signal) between 2 key presses in microseconds.
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value.
+	#  @return A tuple of the pinned wave chain on air and the expected end of the transmission as "time.monotonic()" value.
+	#  If the chain has been compiled again, the given chain has been released. 
+	#  If an exception is raised, the given chain has not been released.
+	def startPresses(self, chain, presses, repeat_space, count, press_space, carrier_frequency):
+		try:
+			return chain, self.transmitter.start(chain)
+		except (ConnectionError, struct.error) as e:
+			sys.stderr.write(f'WARNING: The connection to "pigpiod" has been lost: {e}\n')
+		self.reconnect()
+		new_chain = self.compilePresses(presses, repeat_space, count, press_space, carrier_frequency, pin=True)
+		try:
+			end = self.transmitter.start(new_chain)
+		except BaseException:
+			self.chain_compiler.release(new_chain)
+			raise
+		# Release the given chain only, after the new chain is on air, so each chain is released once
+		self.chain_compiler.release(chain)
+		return new_chain, end
+	
+	## Connect to "pigpiod" again, e.g. after it has been restarted, and restore the resident waves.
+	#
+	#  @exception ConnectionError "pigpiod" is not available.
+	def reconnect(self):
+		with self.wave_cache.lock:
+			try:
+				self.pi.stop()
+			except Exception:
+				pass
+			self.pi = pigpio.pi()
+			if not self.pi.connected:
+				raise ConnectionError('Cannot connect to "pigpiod".')
+			self.pi.set_mode(self.gpio, pigpio.OUTPUT)
+			self.transmitter.pi = self.pi
+			if self.scripts != None:
+				self.scripts.reset(self.pi)
+			self.wave_cache.rebuild(self.pi)
+	
+	## Send the IR signal sequences of a key press one by one.
+	#  Each sequence and each space between the repetitions is a separate wave chain.
+	#
+	#  @param sequences The list of IR signal sequences [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value.
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds.
+	def sendSequences(self, sequences, carrier_frequency, repeat_space):
+		for m in range(0, len(sequences)):
+			sequence = sequences[m]					
+			# Get the resident waves of the IR signal and pin them, so other threads do not evict them on air
+			with self.wave_cache.lock:
+				for attempt in range(2):
+					generation = self.wave_cache.generation
+					protected = set()
+					wave = self.wave_cache.getWaves(self.gpio, carrier_frequency, sequence, protected)
+					space = [self.wave_cache.getWave(self.gpio, 0, repeat_space, protected)] if m < len(sequences) - 1 else []
+					# Repeat once, if the cache has been reset while the waves were created
+					if generation == self.wave_cache.generation:
+						break
+				else:
+					raise pigpio.error('The waves of the IR signal sequence do not fit into "pigpiod".')
+				pin_epoch = self.wave_cache.pinWaves(wave + space)
+			try:
+				# Send the signal
+				self.transmitter.transmit(wave)
+				# Send space between IR signal repetitions
+				if space:
+					self.transmitter.transmit(space)
+			finally:
+				self.wave_cache.unpinWaves(wave + space, pin_epoch)
+	
 	## Compose the carrier square wave data for the modulated pulse.
 	#
 	#  @param gpio The Raspberry Pi GPIO port (BCM notation) where to send the signal.
@@ -315,22 +2360,332 @@ class UniversalRemoteControl:
 	#  @param micros The duration of the IR signal modulation pulse in microseconds.
 	#  @return The "pigpio"-compatible data array to define the IR carrier wave for the modulated pulse.  
 	def carrier(self, gpio, frequency, micros):
-		# Forked from souri-t on GitHub by michaelpaulkorthals. 
-		# Original source: https://github.com/souri-t/RemoteControl-RPI/blob/master/remote/bin/irrp
-		#
-		# by michaelpaulkorthals: Code review and adoption to my quality level. 
-		#
-		wf = []
-		cycle = 1000.0 / frequency
-		cycles = int(round(micros / cycle))
-		on = int(round(cycle / 2.0))
-		sofar = 0
-		for c in range(cycles):
-			target = int(round((c + 1) * cycle))
-			sofar += on
-			off = target - sofar
-			sofar += off
-			wf.append(pigpio.pulse(1 << gpio, 0, on))
-			wf.append(pigpio.pulse(0, 1 << gpio, off))
-		return wf
+		return self.carrier_engine.pulses(gpio, frequency, micros)
+
+
+## An "asyncio"-native API to send remote control data on Raspberry Pi.
+#  <br>
+#  Each key press request is queued and returns an awaitable. A single worker task 
+#  transmits the requests in FIFO order and waits for the end of each transmission 
+#  with "asyncio.sleep", so a single event loop drives any number of concurrent 
+#  requests without a thread per request.
+#
+class AsyncUniversalRemoteControl:
+	
+	## The synchronous API object, which holds the device data, the waves and the key states. Default: None.
+	remote_control = None
+	
+	## Priority queue of the requests. Default: None.
+	queue = None
+	
+	## Sequence number of the last request to keep the FIFO order per priority class.
+	sequence_number = 0
+	
+	## Worker task, which transmits the requests. Default: None.
+	worker = None
 	
+	## Task, which finishes the IR signal on air. Default: None.
+	finisher = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param remote_control The UniversalRemoteControl object to use.
+	def __init__(self, remote_control):
+		self.remote_control = remote_control
+	
+	## Start the worker task in the running event loop.
+	#
+	async def start(self):
+		if self.worker == None:
+			self.queue = asyncio.PriorityQueue()
+			self.worker = asyncio.get_running_loop().create_task(self._work())
+	
+	## Stop the worker task. Requests still in the queue are canceled.
+	#
+	async def close(self):
+		if self.worker != None:
+			self.worker.cancel()
+			try:
+				await self.worker
+			except asyncio.CancelledError:
+				pass
+			self.worker = None
+			if self.finisher != None:
+				self.finisher.cancel()
+				try:
+					await self.finisher
+				except asyncio.CancelledError:
+					pass
+				self.finisher = None
+			while not self.queue.empty():
+				future = self.queue.get_nowait()[2][0]
+				future.cancel()
+	
+	## Queue a key press request.
+	#
+	#  @param device_name Name of the IR-controlled device (see file name without extension in the "./data" folder.
+	#  @param key_name Name of the key on the IR remote control (e.g. "power", "on", "off", etc.). 
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @param key_space Delay after a key has been sent or None, if no key_space is required. Default: 0.1 seconds.
+	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @param priority The priority class. Default: TransmissionScheduler.PRIORITY_NORMAL.
+	#  @param count The count of the key presses, which are sent as a single wave chain. Default: 1.
+	#  @return A future, which resolves with the result dictionary, when the IR signal has left the LED (see "send").
+	async def submit(
+			self, 
+			device_name, 
+			key_name, 
+			carrier_frequency=38.0, 
+			key_space=0.1, 
+			no_repeat=False, 
+			priority=TransmissionScheduler.PRIORITY_NORMAL,
+			count=1
+	):
+		await self.start()
+		future = asyncio.get_running_loop().create_future()
+		self.sequence_number += 1
+		self.queue.put_nowait((
+			priority, 
+			self.sequence_number, 
+			(future, device_name, key_name, carrier_frequency, key_space, no_repeat, priority, count, time.monotonic())
+		))
+		return future
+	
+	## Send the IR signals sequence for specific key to a specific device.
+	#
+	#  @param device_name Name of the IR-controlled device (see file name without extension in the "./data" folder.
+	#  @param key_name Name of the key on the IR remote control (e.g. "power", "on", "off", etc.). 
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value. Default: 38.0.
+	#  @param key_space Delay after a key has been sent or None, if no key_space is required. Default: 0.1 seconds.
+	#  @param no_repeat Do not send the repetitions. Default: False.
+	#  @param priority The priority class. Default: TransmissionScheduler.PRIORITY_NORMAL.
+	#  @param count The count of the key presses, which are sent as a single wave chain. Default: 1.
+	#  @return The result dictionary with the result code as element of {0 = SUCCESS; 1 = FAILURE} 
+	#  and the timing metadata "queued", "started" and "ended" as "time.monotonic()" values in seconds, 
+	#  the queue "wait" time in seconds and the "airtime" in microseconds.
+	async def send(
+			self, 
+			device_name, 
+			key_name, 
+			carrier_frequency=38.0, 
+			key_space=0.1, 
+			no_repeat=False, 
+			priority=TransmissionScheduler.PRIORITY_NORMAL,
+			count=1
+	):
+		return await (await self.submit(device_name, key_name, carrier_frequency, key_space, no_repeat, priority, count))
+	
+	## Transmit the queued requests one by one.
+	#  The waves of the next request are prepared, while the previous IR signal is on air.
+	#  The calls to "pigpiod" run in the default executor, so they do not block the event loop.
+	#
+	async def _work(self):
+		urc = self.remote_control
+		loop = asyncio.get_running_loop()
+		while True:
+			future, device_name, key_name, carrier_frequency, key_space, no_repeat, priority, count, queued = (await self.queue.get())[2]
+			if future.cancelled():
+				continue
+			result = {
+				'result': 1,
+				'device_name': device_name,
+				'key_name': key_name,
+				'queued': queued,
+				'started': None,
+				'ended': None,
+				'wait': 0.0,
+				'airtime': 0
+			}
+			chain = None
+			ticket = None
+			try:
+				# Prepare the waves, while the previous IR signal is on air
+				prepared = await loop.run_in_executor(None, self._prepare, device_name, key_name, carrier_frequency, no_repeat, count)
+				if prepared == None:
+					if not future.cancelled():
+						future.set_result(result)
+					continue
+				presses, repeat_space, press_space, chain, script_id = prepared
+				# Wait until the previous IR signal and its key space are finished
+				if self.finisher != None:
+					await self.finisher
+				# WAIT FOR TRANSMISSION PERMISSION without blocking the event loop
+				ticket = await urc.scheduler.acquireAsync(priority)
+				result['wait'] = ticket.granted - queued
+				result['airtime'] = urc.transmitter.airtime(chain)
+				result['started'] = time.monotonic()
+				if script_id != None:
+					# Send all presses of the key by a single script command
+					end = await loop.run_in_executor(None, urc.scripts.run, script_id, result['airtime'])
+				else:
+					chain, end = await loop.run_in_executor(
+						None, urc.startPresses, chain, presses, repeat_space, count, press_space, carrier_frequency
+					)
+			except asyncio.CancelledError:
+				if ticket != None:
+					urc.scheduler.release(ticket)
+				if chain != None:
+					urc.chain_compiler.release(chain)
+				raise
+			except Exception as e:
+				sys.stderr.write(f'ERROR: Cannot send the IR signal for key "{key_name}": {e}\n')
+				if ticket != None:
+					urc.scheduler.release(ticket)
+				if chain != None:
+					urc.chain_compiler.release(chain)
+				if not future.cancelled():
+					future.set_result(result)
+				continue
+			self.finisher = loop.create_task(
+				self._finish(ticket, chain, end, future, result, key_space, script_id)
+			)
+	
+	## Compose the IR signal of a request and prepare its waves.
+	#  It runs in the default executor, because it loads the devices and uploads the waves to "pigpiod".
+	#
+	#  @param device_name Name of the IR-controlled device.
+	#  @param key_name Name of the key on the IR remote control.
+	#  @param carrier_frequency IR carrier frequency in kc/s as float value.
+	#  @param no_repeat Do not send the repetitions.
+	#  @param count The count of the key presses.
+	#  @return A tuple (presses, repeat_space, press_space, chain, script_id) with the pinned wave chain 
+	#  and the id of the "pigpiod" script or None, or None, if the key is not found.
+	def _prepare(self, device_name, key_name, carrier_frequency, no_repeat, count):
+		urc = self.remote_control
+		presses, repeat_space = urc.selectPresses(device_name, key_name, count, no_repeat)
+		if presses == None:
+			return None
+		press_space = repeat_space or urc.PRESS_SPACE
+		urc.retainDevice(device_name, carrier_frequency)
+		chain = urc.compilePresses(presses, repeat_space, count, press_space, carrier_frequency, pin=True)
+		try:
+			script_id = urc.scripts.getScript([chain]) if urc.scripts != None else None
+		except BaseException:
+			urc.chain_compiler.release(chain)
+			raise
+		return presses, repeat_space, press_space, chain, script_id
+	
+	## Wait until a started IR signal has left the LED and release the transmission.
+	#
+	#  @param ticket The granted TransmissionTicket.
+	#  @param chain The pinned wave chain on air.
+	#  @param end The expected end of the transmission as "time.monotonic()" value in seconds.
+	#  @param future The future of the request.
+	#  @param result The result dictionary of the request.
+	#  @param key_space Delay after a key has been sent or None, if no key_space is required.
+	#  @param script_id The id of the "pigpiod" script, which sends the chain, or None. Default: None.
+	async def _finish(self, ticket, chain, end, future, result, key_space, script_id=None):
+		urc = self.remote_control
+		try:
+			await asyncio.sleep(max(0, end - time.monotonic()))
+			while urc.scripts.isRunning(script_id) if script_id != None else urc.pi.wave_tx_busy():
+				await asyncio.sleep(WaveTransmitter.CHECK_INTERVAL)
+			result['ended'] = time.monotonic()
+			result['result'] = 0
+		except Exception as e:
+			sys.stderr.write(f'ERROR: Cannot send the IR signal for key "{result["key_name"]}": {e}\n')
+		finally:
+			# ALLOW THE NEXT OTHER TRANSMISSION
+			urc.scheduler.release(ticket)
+			urc.chain_compiler.release(chain)
+			if not future.cancelled():
+				future.set_result(result)
+		# Space between the IR signals to following IR signals
+		if key_space != None:
+			await asyncio.sleep(key_space)
+
+
+## A client, which forwards requests to a running "irc_daemon.py" via its local Unix domain socket.
+#  <br>
+#  The daemon keeps "pigpiod" connected, the devices loaded and the waves resident, 
+#  so a forwarded key press does not need to set up anything.
+#  The requests are JSON objects, one per line (see "irc_daemon.RemoteControlServer").
+#
+class RemoteControlClient:
+	
+	## Default path of the Unix domain socket of the daemon in its runtime directory, which only its user and group may access.
+	SOCKET_PATH = '/run/irc/irc_daemon.sock'
+	
+	## Path of the Unix domain socket of the daemon.
+	path = SOCKET_PATH
+	
+	## The connected socket. Default: None.
+	connection = None
+	
+	## The buffered file object of the connected socket. Default: None.
+	file = None
+	
+	## Id of the last request.
+	request_id = 0
+	
+	## Dictionary of the responses, which have been received ahead of time {id: response}. Default: None.
+	responses = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param path Path of the Unix domain socket of the daemon. Default: SOCKET_PATH.
+	def __init__(self, path=SOCKET_PATH):
+		self.path = path
+		self.request_id = 0
+		self.responses = {}
+	
+	## Connect to the daemon.
+	#
+	#  @param timeout Timeout in seconds to connect. Default: 1.0.
+	#  @return True, if the daemon is running and connected.
+	def connect(self, timeout=1.0):
+		if not os.path.exists(self.path):
+			return False
+		connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		try:
+			connection.settimeout(timeout)
+			connection.connect(self.path)
+			connection.settimeout(None)
+		except OSError:
+			# No daemon is listening on a stale socket file
+			connection.close()
+			return False
+		self.connection = connection
+		self.file = connection.makefile('rwb')
+		return True
+	
+	## Disconnect from the daemon.
+	#
+	def close(self):
+		if self.file != None:
+			self.file.close()
+			self.file = None
+		if self.connection != None:
+			self.connection.close()
+			self.connection = None
+	
+	## Submit a request without waiting for the response, so several requests are in flight.
+	#
+	#  @param request The request dictionary without "id".
+	#  @return The id of the request.
+	def submit(self, request):
+		self.request_id += 1
+		request = dict(request, id=self.request_id)
+		self.file.write((json.dumps(request) + '\n').encode())
+		self.file.flush()
+		return self.request_id
+	
+	## Wait for the response of a submitted request.
+	#
+	#  @param request_id The id of the request.
+	#  @return The response dictionary.
+	def receive(self, request_id):
+		while request_id not in self.responses:
+			line = self.file.readline()
+			if not line:
+				raise ConnectionError('The daemon has closed the connection.')
+			response = json.loads(line)
+			self.responses[response.get('id')] = response
+		return self.responses.pop(request_id)
+	
+	## Send a request and wait for its response.
+	#
+	#  @param request The request dictionary without "id".
+	#  @return The response dictionary.
+	def request(self, request):
+		return self.receive(self.submit(request))
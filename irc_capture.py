@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Capture.
+	A module to capture the raw IR signal from a LIRC device without the tool "mode2".
+	Copyright (C) 2026 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Capture.
+#  A module to capture the raw IR signal from a LIRC device without the tool "mode2".
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import fcntl
+import os
+import select
+import stat
+import struct
+
+
+## A capture of the raw IR signal in the LIRC "mode2" format.
+#  <br>
+#  The LIRC device node delivers the received IR signal as packed 32-bit samples.
+#  The upper 8 bits are the sample type (pulse, space, timeout, ...) and the lower
+#  24 bits are the duration in microseconds. This is what the tool "mode2" reads
+#  before it formats the samples as text lines.
+#  <br>
+#  The source may also be a plain file or a named pipe, which contains recorded
+#  samples in the same format (e.g. "cat /dev/lirc1 > capture.bin"). A plain file
+#  ends the capture at its end, a pipe at its end or when it stays idle.
+#
+class LircCapture:
+	
+	## Sample type: H-signal.
+	MODE2_PULSE = 0x01000000
+	
+	## Sample type: L-signal.
+	MODE2_SPACE = 0x00000000
+	
+	## Sample type: Carrier frequency in Hz.
+	MODE2_FREQUENCY = 0x02000000
+	
+	## Sample type: The receiver has been idle for the given time.
+	MODE2_TIMEOUT = 0x03000000
+	
+	## Sample type: The receiver has lost samples.
+	MODE2_OVERFLOW = 0x04000000
+	
+	## Mask of the sample type.
+	MODE2_MASK = 0xFF000000
+	
+	## Mask of the sample duration.
+	VALUE_MASK = 0x00FFFFFF
+	
+	## Names of the events by sample type.
+	EVENTS = {
+		MODE2_PULSE: 'pulse',
+		MODE2_SPACE: 'space',
+		MODE2_TIMEOUT: 'timeout'
+	}
+	
+	## Size of a sample in bytes.
+	SAMPLE_SIZE = 4
+	
+	## Count of bytes to read at once.
+	READ_SIZE = 4096
+	
+	## "ioctl" request to set the receive mode (_IOW('i', 0x12, __u32)).
+	LIRC_SET_REC_MODE = 0x40046912
+	
+	## "ioctl" request to enable the timeout reports (_IOW('i', 0x19, __u32)).
+	LIRC_SET_REC_TIMEOUT_REPORTS = 0x40046919
+	
+	## Receive mode "mode2".
+	LIRC_MODE_MODE2 = 0x00000004
+	
+	## The path of the LIRC device, file or named pipe.
+	source = None
+	
+	## The file descriptor of the opened source. Default: None.
+	fd = None
+	
+	## True, if the source is a LIRC device node. Default: False.
+	is_device = False
+	
+	## True, if the end of a file or pipe has been reached. Default: False.
+	eof = False
+	
+	## Bytes of an incomplete sample, which has been read. Default: b''.
+	remainder = b''
+	
+	## CONSTRUCTOR.
+	#
+	#  @param source The path of the LIRC device, file or named pipe.
+	def __init__(self, source):
+		self.source = source
+		self.fd = None
+		self.is_device = False
+		self.eof = False
+		self.remainder = b''
+	
+	## Open the source for non-blocking reads.
+	#  A LIRC device node is set to the receive mode "mode2" with timeout reports,
+	#  which separate the repetitions of the IR signal.
+	#
+	#  @exception OSError The source cannot be opened.
+	def open(self):
+		if self.fd != None:
+			return
+		if stat.S_ISFIFO(os.stat(self.source).st_mode):
+			# Wait for the writer of a named pipe, otherwise its end would be read at once
+			self.fd = os.open(self.source, os.O_RDONLY)
+			os.set_blocking(self.fd, False)
+		else:
+			self.fd = os.open(self.source, os.O_RDONLY | os.O_NONBLOCK)
+		self.is_device = stat.S_ISCHR(os.fstat(self.fd).st_mode)
+		self.eof = False
+		self.remainder = b''
+		if self.is_device:
+			try:
+				fcntl.ioctl(self.fd, self.LIRC_SET_REC_MODE, struct.pack('I', self.LIRC_MODE_MODE2))
+				fcntl.ioctl(self.fd, self.LIRC_SET_REC_TIMEOUT_REPORTS, struct.pack('I', 1))
+			except OSError:
+				# Older drivers, which do not support these requests, are in "mode2" and report timeouts anyway
+				pass
+	
+	## Close the source.
+	#
+	def close(self):
+		if self.fd != None:
+			os.close(self.fd)
+			self.fd = None
+	
+	## Discard the samples, which have been received before a recording (e.g. IR noise).
+	#  Only the samples of a LIRC device are discarded, not the recorded samples of a file or pipe.
+	#
+	def discard(self):
+		if not self.is_device:
+			return
+		self.remainder = b''
+		try:
+			while os.read(self.fd, self.READ_SIZE):
+				pass
+		except BlockingIOError:
+			pass
+	
+	## Read the available bytes from the source.
+	#
+	#  @param timeout The time in seconds to wait for the bytes or None to wait without limit.
+	#  @return The bytes or b'', if the source has been idle for the timeout or has been ended.
+	def read(self, timeout):
+		ready, _, _ = select.select([self.fd], [], [], timeout)
+		if not ready:
+			return b''
+		try:
+			data = os.read(self.fd, self.READ_SIZE)
+		except BlockingIOError:
+			return b''
+		if data == b'':
+			# No writer or end of file
+			self.eof = True
+		return data
+	
+	## Receive an IR signal.
+	#  Waits for the first sample without limit and finishes, when no more sample
+	#  has been received for the idle time or the source has been ended.
+	#  <br>
+	#  The samples of a file or pipe are not received in real time, so a recording of several 
+	#  key presses is split by its gaps: A key press ends with a timeout sample, which is followed 
+	#  by a pulse or by a space of at least the idle time (the gap, which LIRC reports after a timeout). 
+	#  The rest of the recording is kept for the next call.
+	#
+	#  @param idle_time The time in seconds after the last sample, when the IR signal has been finished.
+	#  @return A generator of the events as tuples of the name as element of {"pulse"; "space"; "timeout"} and the duration in microseconds.
+	#  @exception EOFError The end of the file or pipe has been reached before the IR signal.
+	def receive(self, idle_time):
+		self.open()
+		self.discard()
+		if self.eof and len(self.remainder) < self.SAMPLE_SIZE:
+			raise EOFError(f'The end of "{self.source}" has been reached.')
+		timeout = None
+		gap = False
+		data = b''
+		while True:
+			data = self.remainder + data
+			end = len(data) - len(data) % self.SAMPLE_SIZE
+			self.remainder = data[end:]
+			for offset in range(0, end, self.SAMPLE_SIZE):
+				(sample,) = struct.unpack_from('I', data, offset)
+				sample_type = sample & self.MODE2_MASK
+				duration = sample & self.VALUE_MASK
+				if gap and (sample_type == self.MODE2_PULSE or (sample_type == self.MODE2_SPACE and duration >= idle_time*1000000)):
+					# The next key press of the recording begins
+					self.remainder = data[offset:]
+					return
+				gap = sample_type == self.MODE2_TIMEOUT and not self.is_device
+				name = self.EVENTS.get(sample_type)
+				if name != None:
+					yield name, duration
+			if end > 0:
+				timeout = idle_time
+			if self.eof:
+				break
+			data = self.read(timeout)
+			if data == b'':
+				if self.eof:
+					continue
+				if timeout != None:
+					break
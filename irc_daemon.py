@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Daemon.
+	A TLS TCP/IP service to send IR remote control codes from the Raspberry Pi.
+	Copyright (C) 2026 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Daemon.
+#  A TLS TCP/IP service to send IR remote control codes from the Raspberry Pi.
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+
+# Import Python language packages
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import ssl
+import stat
+import sys
+
+
+# Import project modules
+
+from irc_api import AsyncUniversalRemoteControl, RemoteControlClient, TransmissionScheduler, UniversalRemoteControl, WaveCache
+
+
+## A server, which receives key press requests via persistent connections.
+#  <br>
+#  The requests and responses are JSON objects, one per line:
+#  <br>
+#  Request: {"id": 1, "command": "send", "device_name": "marantz_av_receiver_nr1711", "key_name": "volume_up", "count": 3}
+#  <br>
+#  Response: {"id": 1, "result": 0, "device_name": ..., "key_name": ..., "queued": ..., "started": ..., "ended": ..., "wait": ..., "airtime": ...}
+#  <br>
+#  The connections stay open for any number of requests. Several requests may be
+#  in flight per connection (pipelining). Each response is tagged by the "id" of its
+#  request and written as soon as the IR signal has left the LED.
+#  <br>
+#  Commands:
+#    * "send": Send a key press (see "AsyncUniversalRemoteControl.send"). This is the default command.
+#    * "device": Get the file path and the key names of a device, which is served by this daemon.
+#    * "ping": Check the connection.
+#    * "statistics": Get the statistics of the devices (including the files, which cannot be loaded), 
+#      the wave cache and its occupancy, the scheduler, the connections and the TLS sessions.
+#
+class RemoteControlServer:
+	
+	## Maximum count of requests in flight per connection.
+	MAX_PIPELINE = 32
+	
+	## Maximum length of a request line in bytes.
+	MAX_LINE = 65536
+	
+	## The asynchronous API object, which transmits the key presses. Default: None.
+	remote_control = None
+	
+	## The TLS context, which is shared by all connections to allow TLS session resumption. Default: None.
+	ssl_context = None
+	
+	## Time in seconds after an idle connection will be closed or None to keep it open. Default: 300.0.
+	idle_timeout = 300.0
+	
+	## Output verbose information. Default: False.
+	verbose = False
+	
+	## List of the listening "asyncio" servers. Default: None.
+	servers = None
+	
+	## Path of the Unix domain socket or None, if it is not listening. Default: None.
+	socket_path = None
+	
+	## Count of the open connections.
+	connections = 0
+	
+	## Count of the received requests.
+	requests = 0
+	
+	## CONSTRUCTOR.
+	#
+	#  @param remote_control The AsyncUniversalRemoteControl object to use.
+	#  @param ssl_context The TLS context or None for plain TCP/IP connections. Default: None.
+	#  @param idle_timeout Time in seconds after an idle connection will be closed or None to keep it open. Default: 300.0.
+	#  @param verbose Output verbose information. Default: False.
+	def __init__(self, remote_control, ssl_context=None, idle_timeout=300.0, verbose=False):
+		self.remote_control = remote_control
+		self.ssl_context = ssl_context
+		self.idle_timeout = idle_timeout
+		self.verbose = verbose
+		self.servers = []
+		self.connections = 0
+		self.requests = 0
+	
+	## Listen for TCP/IP connections.
+	#
+	#  @param host The host name or IP address to listen on or None for all interfaces.
+	#  @param port The TCP/IP port to listen on.
+	async def listenTcp(self, host, port):
+		server = await asyncio.start_server(
+			self.handle,
+			host,
+			port,
+			ssl=self.ssl_context,
+			limit=self.MAX_LINE
+		)
+		self.servers.append(server)
+	
+	## Listen for local connections on a Unix domain socket, e.g. from "irc_send.py".
+	#  The local connections are not encrypted, so only the user and the group of the daemon 
+	#  may connect: A missing directory is created with mode 0750 and the socket gets mode 0660.
+	#
+	#  @param path The path of the Unix domain socket.
+	#  @return True, if listening. False, if another daemon is already listening on this path.
+	#  @exception OSError The directory cannot be created or the path exists, but is not a socket.
+	async def listenUnix(self, path):
+		directory = os.path.dirname(path)
+		if directory != '' and not os.path.isdir(directory):
+			os.makedirs(directory, mode=0o750)
+		try:
+			mode = os.lstat(path).st_mode
+		except FileNotFoundError:
+			mode = None
+		if mode != None:
+			if not stat.S_ISSOCK(mode):
+				raise FileExistsError(f'"{path}" exists and is not a socket.')
+			# Check if the socket file is stale
+			client = RemoteControlClient(path)
+			if client.connect():
+				client.close()
+				return False
+			os.unlink(path)
+		server = await asyncio.start_unix_server(
+			self.handle,
+			path,
+			limit=self.MAX_LINE
+		)
+		self.servers.append(server)
+		self.socket_path = path
+		# Remove the access for others. The process-wide umask is not changed, because other threads create files.
+		os.chmod(path, 0o660)
+		return True
+	
+	## Stop listening and close the asynchronous API.
+	#
+	async def close(self):
+		for server in self.servers:
+			server.close()
+			await server.wait_closed()
+		self.servers = []
+		if self.socket_path != None:
+			try:
+				os.unlink(self.socket_path)
+			except OSError:
+				pass
+			self.socket_path = None
+		await self.remote_control.close()
+	
+	## Handle a connection until the client closes it or it is idle for too long.
+	#
+	#  @param reader The "asyncio" stream reader of the connection.
+	#  @param writer The "asyncio" stream writer of the connection.
+	async def handle(self, reader, writer):
+		peer = writer.get_extra_info('peername')
+		self.connections += 1
+		if self.verbose:
+			ssl_object = writer.get_extra_info('ssl_object')
+			resumed = ssl_object != None and ssl_object.session_reused
+			sys.stdout.write(f'Connection from {peer} opened{" (TLS session resumed)" if resumed else ""}.\n')
+		# Responses of pipelined requests must not interleave
+		lock_write = asyncio.Lock()
+		pipeline = asyncio.Semaphore(self.MAX_PIPELINE)
+		tasks = set()
+		try:
+			while True:
+				try:
+					line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+				except asyncio.TimeoutError:
+					if self.verbose: sys.stdout.write(f'Connection from {peer} is idle.\n')
+					break
+				except (ConnectionError, ssl.SSLError, ValueError) as e:
+					# ValueError: The request line exceeds MAX_LINE
+					sys.stderr.write(f'ERROR: Cannot receive from {peer}: {e}\n')
+					break
+				if not line:
+					break
+				line = line.strip()
+				if not line:
+					continue
+				# Limit the requests in flight
+				await pipeline.acquire()
+				task = asyncio.get_running_loop().create_task(self.respond(line, writer, lock_write))
+				tasks.add(task)
+				task.add_done_callback(tasks.discard)
+				task.add_done_callback(lambda task: pipeline.release())
+			# Finish the requests in flight
+			if tasks:
+				await asyncio.gather(*tasks, return_exceptions=True)
+		finally:
+			self.connections -= 1
+			writer.close()
+			try:
+				await writer.wait_closed()
+			except (ConnectionError, ssl.SSLError):
+				pass
+			if self.verbose: sys.stdout.write(f'Connection from {peer} closed.\n')
+	
+	## Execute a request and write the response.
+	#
+	#  @param line The request as JSON encoded bytes.
+	#  @param writer The "asyncio" stream writer of the connection.
+	#  @param lock_write The lock to serialize the responses of the connection.
+	async def respond(self, line, writer, lock_write):
+		self.requests += 1
+		try:
+			request = json.loads(line)
+			if not isinstance(request, dict):
+				raise ValueError('The request is not a JSON object.')
+		except ValueError as e:
+			request = {}
+			response = {'result': 22, 'error': f'Invalid request: {e}'}
+		else:
+			response = await self.execute(request)
+		response['id'] = request.get('id')
+		data = (json.dumps(response) + '\n').encode()
+		async with lock_write:
+			try:
+				writer.write(data)
+				await writer.drain()
+			except (ConnectionError, ssl.SSLError):
+				pass
+	
+	## Execute a request.
+	#
+	#  @param request The request dictionary.
+	#  @return The response dictionary with the result code as element of {0 = SUCCESS; 1 = FAILURE; 22 = INVALID ARGUMENT}.
+	async def execute(self, request):
+		command = request.get('command', 'send')
+		if command == 'send':
+			try:
+				device_name = str(request['device_name'])
+				key_name = str(request['key_name'])
+				carrier_frequency = float(request.get('carrier_frequency', 38.0))
+				key_space = request.get('key_space', 0.1)
+				if key_space != None:
+					key_space = float(key_space)
+				no_repeat = bool(request.get('no_repeat', False))
+				priority = int(request.get('priority', TransmissionScheduler.PRIORITY_NORMAL))
+				count = int(request.get('count', 1))
+			except (KeyError, TypeError, ValueError) as e:
+				return {'result': 22, 'error': f'Invalid argument: {e}'}
+			if priority not in [
+					TransmissionScheduler.PRIORITY_INTERACTIVE,
+					TransmissionScheduler.PRIORITY_NORMAL,
+					TransmissionScheduler.PRIORITY_BULK
+			]:
+				return {'result': 22, 'error': f'Invalid priority {priority}.'}
+			return await self.remote_control.send(
+				device_name,
+				key_name,
+				carrier_frequency,
+				key_space,
+				no_repeat,
+				priority,
+				count
+			)
+		elif command == 'device':
+			device = self.remote_control.remote_control.registry.getDevice(str(request.get('device_name')))
+			if device == None:
+				return {'result': 1, 'error': f'Device "{request.get("device_name")}" not found.'}
+			return {
+				'result': 0,
+				'device_name': device.name,
+				'filepath': device.filepath,
+				'key_names': list(device.keys)
+			}
+		elif command == 'ping':
+			return {'result': 0}
+		elif command == 'statistics':
+			return {'result': 0, 'statistics': self.getStatistics()}
+		return {'result': 22, 'error': f'Unknown command "{command}".'}
+	
+	## Get the statistics of this server.
+	#
+	#  @return A dictionary of the device, wave cache, wave pool occupancy, scheduler, script, connection and TLS session statistics.
+	def getStatistics(self):
+		urc = self.remote_control.remote_control
+		statistics = {
+			'connections': self.connections,
+			'requests': self.requests,
+			'devices': urc.registry.getStatistics(),
+			'wave_cache': urc.wave_cache.getStatistics(),
+			'wave_pool': urc.wave_cache.getOccupancy(),
+			'scheduler': urc.scheduler.getStatistics()
+		}
+		if urc.scripts != None:
+			statistics['scripts'] = urc.scripts.getStatistics()
+		if self.ssl_context != None:
+			statistics['tls_sessions'] = self.ssl_context.session_stats()
+		return statistics
+
+
+## A daemon program to send IR remote control codes on request of the network clients.
+#
+class IRCDaemonProgram:
+	
+	## The command line arguments object. Default: None.
+	args = None
+	
+	## CONSTRUCTOR.
+	#
+	def __init__(self):
+		# Create argument parser
+		parser = argparse.ArgumentParser(
+			formatter_class=argparse.RawDescriptionHelpFormatter,
+			description="""\
+IRC Daemon.
+
+A TLS TCP/IP service to send IR remote control
+codes from the Raspberry Pi on request of your
+"Cinema Control Center" web application.
+
+The clients keep their connections open and
+send several JSON requests in a row, one per
+line, without waiting for the responses. Each
+response carries the "id" of its request.\
+			""",
+			epilog="""\
+EXAMPLE:
+--------
+1) Listen on port 8443 and on the local Unix domain socket and send on GPIO port 17.
+$ ./irc_daemon.py --gpio 17 --certfile /etc/irc/server.crt --keyfile /etc/irc/server.key
+
+2) Request 3 volume steps of the Marantz AV receiver.
+$ echo '{"id": 1, "device_name": "marantz_av_receiver_nr1711", "key_name": "volume_up", "count": 3}' | openssl s_client -quiet -connect localhost:8443
+			"""
+		)
+		# Define the arguments
+		parser.add_argument(
+			'-a',
+			'--address',
+			help='Define the IP address to listen on. Default: All interfaces.',
+			type=str,
+			default=None
+		)
+		parser.add_argument(
+			'-ca',
+			'--cafile',
+			help='Define the file path of the CA certificates to verify the client certificates. If it is given, the clients must authenticate themselves.',
+			type=str,
+			default=None
+		)
+		parser.add_argument(
+			'-cf',
+			'--certfile',
+			help='Define the file path of the server certificate (PEM). Without a certificate, the TLS TCP/IP service is disabled and only the local Unix domain socket is served.',
+			type=str,
+			default=None
+		)
+		parser.add_argument(
+			'-dd',
+			'--data_dir',
+			help='Define the folder of the JSON files of the infrared remote controls. Default: The "data" sub folder of this program.',
+			type=str,
+			default=os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+		)
+		parser.add_argument(
+			'-el',
+			'--eager_loading',
+			help='Parse all JSON files, which are newer than the pack, at start-up. Default: Parse a JSON file on the first request of its device.',
+			action='store_true'
+		)
+		parser.add_argument(
+			'-g',
+			'--gpio',
+			help="GPIO pin number (BCM notation) for sending an IR signal.",
+			required=True,
+			type=int
+		)
+		parser.add_argument(
+			'-it',
+			'--idle_timeout',
+			help='Define the time after an idle connection will be closed (seconds). Default: 300.0.',
+			type=float,
+			default=300.0
+		)
+		parser.add_argument(
+			'-kf',
+			'--keyfile',
+			help='Define the file path of the private key of the server certificate (PEM). Default: The key is included in the certificate file.',
+			type=str,
+			default=None
+		)
+		parser.add_argument(
+			'-mw',
+			'--max_cached_waves',
+			help=f'Define the maximum count of waves, which stay resident in "pigpiod". Default: {WaveCache.MAX_WAVES}.',
+			type=int,
+			default=WaveCache.MAX_WAVES
+		)
+		parser.add_argument(
+			'-p',
+			'--port',
+			help='Define the TCP/IP port to listen on. Default: 8443.',
+			type=int,
+			default=8443
+		)
+		parser.add_argument(
+			'-s',
+			'--socket',
+			help=f'Define the path of the Unix domain socket for local clients like "irc_send.py". An empty string disables it. Default: "{RemoteControlClient.SOCKET_PATH}".',
+			type=str,
+			default=RemoteControlClient.SOCKET_PATH
+		)
+		parser.add_argument(
+			'-sc',
+			'--scripts',
+			help='Send each key press by a single "pigpiod" script command to save round trips, e.g. to a remote "pigpiod" defined by the environment variable PIGPIO_ADDR.',
+			action='store_true'
+		)
+		parser.add_argument(
+			'-v',
+			'--verbose',
+			help='Allow verbose output to console.',
+			action='store_true'
+		)
+		parser.add_argument(
+			'-w',
+			'--workers',
+			help='Define the count of the worker processes to parse the JSON files with "--eager_loading". Default: The count of CPUs.',
+			type=int,
+			default=None
+		)
+		# Parse the arguments
+		try:
+			self.args = parser.parse_args()
+		except argparse.ArgumentError:
+			sys.stdout.write(f'ERROR: Wrong or missing command line arguments.\nCall "./{os.path.basename(sys.argv[0])} -h | --help" to see how to handle the syntax.\n')
+			sys.exit(22) # 22 = Invalid argument
+	
+	## Create the TLS context, which is shared by all connections.
+	#  <br>
+	#  Due to the shared context, the clients can resume their TLS sessions
+	#  (session tickets or session ids) instead of a full handshake.
+	#
+	#  @return The TLS context.
+	def createSslContext(self):
+		context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+		context.load_cert_chain(self.args.certfile, self.args.keyfile)
+		if self.args.cafile != None:
+			context.load_verify_locations(self.args.cafile)
+			context.verify_mode = ssl.CERT_REQUIRED
+		# Issue session tickets for TLS 1.3 resumption
+		context.options &= ~ssl.OP_NO_TICKET
+		return context
+	
+	## Run the program.
+	#
+	#  @return The exit code as integer, which is 0 in case of success.
+	def run(self):
+		ssl_context = None
+		if self.args.certfile != None:
+			try:
+				ssl_context = self.createSslContext()
+			except (OSError, ssl.SSLError) as e:
+				sys.stdout.write(f'ERROR: Cannot load the TLS certificate: {e}\n')
+				return 1
+		elif not self.args.socket:
+			sys.stdout.write('ERROR: Neither a TLS certificate nor a Unix domain socket is defined.\n')
+			return 22 # 22 = Invalid argument
+		remote_control = UniversalRemoteControl(
+			self.args.gpio,
+			data_dir=self.args.data_dir,
+			verbose=self.args.verbose,
+			max_cached_waves=self.args.max_cached_waves,
+			lazy_loading=not self.args.eager_loading,
+			workers=self.args.workers,
+			use_scripts=self.args.scripts
+		)
+		server = RemoteControlServer(
+			AsyncUniversalRemoteControl(remote_control),
+			ssl_context,
+			self.args.idle_timeout,
+			self.args.verbose
+		)
+		return asyncio.run(self.serve(server))
+	
+	## Serve the requests until the program is terminated.
+	#
+	#  @param server The RemoteControlServer object.
+	#  @return The exit code as integer, which is 0 in case of success.
+	async def serve(self, server):
+		try:
+			if self.args.socket:
+				if not await server.listenUnix(self.args.socket):
+					sys.stdout.write(f'ERROR: Another daemon is already listening on "{self.args.socket}".\n')
+					await server.close()
+					return 1
+				sys.stdout.write(f'Listening on "{self.args.socket}".\n')
+			if server.ssl_context != None:
+				await server.listenTcp(self.args.address, self.args.port)
+				sys.stdout.write(f'Listening on port {self.args.port}.\n')
+		except OSError as e:
+			sys.stdout.write(f'ERROR: Cannot listen: {e}\n')
+			await server.close()
+			return 1
+		# Wait for SIGINT or SIGTERM
+		stop = asyncio.Event()
+		loop = asyncio.get_running_loop()
+		for signal_number in [signal.SIGINT, signal.SIGTERM]:
+			loop.add_signal_handler(signal_number, stop.set)
+		await stop.wait()
+		await server.close()
+		sys.stdout.write(f'The program has been successfully completed.\n')
+		return 0
+
+
+# MAIN PROGRAM
+# Create the class object
+ircdp = IRCDaemonProgram()
+# Run the main program
+sys.exit(ircdp.run())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Debug.
+	A module to attach the IRC utilities to the Eclipse/PyDev remote debugger.
+	Copyright (C) 2021 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Debug.
+#  A module to attach the IRC utilities to the Eclipse/PyDev remote debugger.
+#  It is imported only, if a program is started in "debug" mode, so the
+#  programs do not compile this bootstrap on each launch.
+#  Created on 2021-06-30 (split from "irc_learn.py" and "irc_send.py").
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import os
+import sys
+
+
+# ENABLE REMOTE DEBUGGING IN ECLIPSE DEVELOPING ENVIRONMENT:
+# Remote debug service is available on the development workstation at port 5678".
+# Start this program on the remote system with parameter "--db" or "--debug" as last parameter.
+# 
+# SOURCE SYNCHRONISATION:
+# While developing, use WinSCP on development workstation to permanently keep 
+# the development folder on the target Linux test machine up-to-date.
+#
+#
+# IN CASE OF FAILURE:
+#    * Close Eclipse.
+#    * Delete the folder "<workspace>/.metadata/.plugins/org.eclipse.e4.workbench",
+#      where "<workspace>" is the folder of your Eclipse workspace.
+#        * This will reinitialize your Eclipse workbench settings.
+#		 * WARNING: Do this only, if you have you have eliminated all other problems.
+#    * Open Eclipse.
+#    * Ensure that the "PyDev plug-in" for Eclipse is installed and up-to-date
+#      on the development workstation and the "PyDev" menu item is visible
+#      in the "Debug" perspective.
+#        * See [Menu] -> Help -> Eclipse Marketplace -> Installed.
+#    * Ensure the the "pydevd" is installed on the test machine:
+#        * # pip show pydevd
+#        * # pip install pydevd==
+#        * It is recommended to update it, if a newer version is available.
+#            * # pip install pydevd --upgrade
+#    * Set the perspective in the upper right corner in Eclipse:
+#        * Select the "PyDev" perspective (blue snake icon).
+#        * Open the Python file, which will be debugged.
+#        * Select the "Debug" perspective (green bug icon).
+#    * Start the remote debugging server via [Menu] -> PyDev -> Start Debug Server
+#    * Ensure that all the remote debugging data are up to date and valid:
+#        * The source folders (local and remote)
+#            * See below: "MY_PATHS_FROM_ECLIPSE_TO_PYTHON". ESSENTIAL!!!
+#        * The port forwarding rules on the network components between
+#          the test machine and the development workstation, if any.
+#        * The environment variable "DEBUG_HOSTNAME" in the 
+#          login shell of the test user and root user on the test machine. ESSENTIAL!!!        
+#    * Start the script which will be debugged on the remote test machine.
+#    * Wait ~15 seconds until the script execution will stop at the 
+#      first code line after the "pydevd.settrace( ... )" command (see below).
+#      SUCCESS!!!
+#    * Finally debug the script. 
+# 
+## Connect to the remote debug server on the development workstation.
+#  The program stops at the first code line after the call.
+#
+def enableRemoteDebugging():
+	# Append PydDev remote debugger
+	# Import the PyDev remote debugger
+	import pydevd 
+	from pydevd_file_utils import setup_client_server_paths
+	import socket 
+	# Configure the Eclipse project path 
+	# on the Windows Development Workstation within the "eclipse-workspace" folder
+	# and on the remote test machine 
+	# exactly in this order and all paths must be absolute:
+	hostname = socket.gethostname()
+	MY_PATHS_FROM_ECLIPSE_TO_PYTHON = [
+		(
+			f'C:\\Users\\Paul\\eclipse-workspace\\{hostname}-irrcd', # local (development workstation)
+			f'/home/pi/eclipse-workspace/{hostname}-irrcd'  # remote (test machine)
+		)
+	]
+	debug_hostname = os.environ['DEBUG_HOSTNAME'] # The localhost IP address on which the debug server is listening 
+	if debug_hostname == None: debug_hostname = 'unknown_host'
+	debug_port = 5678 # The TCP/IP port on which the debug server is listening
+	# Enable remote debugging 
+	setup_client_server_paths(MY_PATHS_FROM_ECLIPSE_TO_PYTHON)	
+	try: 
+		pydevd.settrace(debug_hostname, port=debug_port, stdoutToServer=True, stderrToServer=True)
+	except:
+		print(f'ERROR: Cannot connect to debugger at "tcp://{debug_hostname}:{debug_port}".')
+		sys.exit(1)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Environment.
+	A module to check the platform and the dependencies of the IRC utilities.
+	Copyright (C) 2021 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Environment.
+#  A module to check the platform and the dependencies of the IRC utilities.
+#  Created on 2021-06-30 (split from "irc_learn.py" and "irc_send.py").
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import glob
+import json
+import os
+import subprocess
+import sys
+
+
+## A probe of the Linux distribution and the LIRC installation.
+#  <br>
+#  Asking "apt" if LIRC is installed takes more than a second on a Raspberry Pi Zero.
+#  So the result is cached in a small state file together with a fingerprint of the
+#  system, which consists of the modification time of the "dpkg" status file and
+#  the contents of the OS release files. The system is probed again only, if the
+#  fingerprint has changed, e.g. after a package has been installed or removed.
+#
+class EnvironmentProbe:
+	
+	## Default path of the state file.
+	CACHE_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), '.environment.json')
+	
+	## Path of the "dpkg" status file, which is modified by each package installation.
+	DPKG_STATUS = '/var/lib/dpkg/status'
+	
+	## File name pattern of the OS release files.
+	RELEASE_FILES = '/etc/*-release'
+	
+	## Path of the state file.
+	filepath = CACHE_FILE
+	
+	## CONSTRUCTOR.
+	#
+	#  @param filepath Path of the state file. Default: CACHE_FILE.
+	def __init__(self, filepath=CACHE_FILE):
+		self.filepath = filepath
+	
+	## Get the facts about the system, from the state file if the system has not been changed.
+	#
+	#  @return A dictionary of the facts "id_like", "distribution_id", "version_id", "version_codename"
+	#  (each "unknown" if not available), "release_found" (True, if the OS release files have been read)
+	#  and "lirc_rc" (return code of "apt") and "lirc_installed".
+	def probe(self):
+		fingerprint = self.getFingerprint()
+		facts = self.load(fingerprint)
+		if facts == None:
+			facts = self.parseRelease(fingerprint['release'])
+			facts['lirc_rc'], facts['lirc_installed'] = self.checkLirc()
+			# Do not cache a failing check, which could be temporary
+			if facts['lirc_rc'] == 0:
+				self.save(fingerprint, facts)
+		return facts
+	
+	## Get the fingerprint of the system.
+	#
+	#  @return A dictionary of the "dpkg" status modification time in nanoseconds (or None) and the OS release contents.
+	def getFingerprint(self):
+		try:
+			dpkg_status = os.stat(self.DPKG_STATUS).st_mtime_ns
+		except OSError:
+			dpkg_status = None
+		release = ''
+		for filepath in sorted(glob.glob(self.RELEASE_FILES)):
+			try:
+				with open(filepath, 'r') as file:
+					release += file.read()
+			except OSError:
+				pass
+		return {'dpkg_status': dpkg_status, 'release': release}
+	
+	## Parse the contents of the OS release files.
+	#
+	#  @param release The contents of the OS release files.
+	#  @return A dictionary of the distribution facts (see "probe").
+	def parseRelease(self, release):
+		facts = {
+			'release_found': release != '',
+			'id_like': 'unknown',
+			'distribution_id': 'unknown',
+			'version_id': 'unknown',
+			'version_codename': 'unknown'
+		}
+		items = release.strip().replace('"','').split('\n')
+		find0 = 'ID_LIKE='
+		find1 = 'ID='
+		find2 = 'VERSION_ID='
+		find3 = 'VERSION_CODENAME='
+		for item in items:
+			if item.startswith(find0):
+				facts['id_like'] = item.replace(find0, '').strip().lower()
+			elif item.startswith(find1):
+				facts['distribution_id'] = item.replace(find1, '').strip().lower()
+			elif item.startswith(find2):
+				facts['version_id'] = item.replace(find2, '').strip().lower()
+			elif item.startswith(find3):
+				facts['version_codename'] = item.replace(find3, '').strip().lower()
+		return facts
+	
+	## Check if LIRC is installed (this will take a while).
+	#
+	#  @return A tuple of the return code of "apt" and True, if LIRC is installed.
+	def checkLirc(self):
+		command = 'apt -qq list lirc 2>/dev/null'
+		p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, universal_newlines=True)
+		std_out = p.communicate()[0].strip()
+		return p.returncode, std_out.endswith('[installed]')
+	
+	## Load the cached facts from the state file.
+	#
+	#  @param fingerprint The current fingerprint of the system.
+	#  @return The dictionary of the facts or None, if there are no valid cached facts.
+	def load(self, fingerprint):
+		try:
+			with open(self.filepath, 'r') as file:
+				state = json.load(file)
+		except (OSError, ValueError):
+			return None
+		if not isinstance(state, dict) or state.get('fingerprint') != fingerprint:
+			return None
+		return state.get('facts')
+	
+	## Save the facts to the state file.
+	#
+	#  @param fingerprint The current fingerprint of the system.
+	#  @param facts The dictionary of the facts.
+	#  @return True, if the state file has been written.
+	def save(self, fingerprint, facts):
+		temporary_filepath = f'{self.filepath}.tmp'
+		try:
+			with open(temporary_filepath, 'w') as file:
+				json.dump({'fingerprint': fingerprint, 'facts': facts}, file, indent='\t')
+			os.replace(temporary_filepath, self.filepath)
+		except OSError as e:
+			# Without the state file the system is probed on each launch
+			sys.stderr.write(f'WARNING: Cannot write the state file "{self.filepath}": {e}\n')
+			return False
+		return True
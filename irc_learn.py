@@ -30,93 +30,32 @@
 # Import language libraries
 
 import argparse
-import json
 import os
 import platform
-import signal
 import sys
 
 #*****************************************************************************************************
 # ENABLE REMOTE DEBUGGING IN ECLIPSE DEVELOPING ENVIRONMENT:
 # Remote debug service is available on the development workstation at port 5678".
 # Start this program on the remote system with parameter "--db" or "--debug" as last parameter.
-# 
-# SOURCE SYNCHRONISATION:
-# While developing, use WinSCP on development workstation to permanently keep 
-# the development folder on the target Linux test machine up-to-date.
-#
-#
-# IN CASE OF FAILURE:
-#    * Close Eclipse.
-#    * Delete the folder "<workspace>/.metadata/.plugins/org.eclipse.e4.workbench",
-#      where "<workspace>" is the folder of your Eclipse workspace.
-#        * This will reinitialize your Eclipse workbench settings.
-#		 * WARNING: Do this only, if you have you have eliminated all other problems.
-#    * Open Eclipse.
-#    * Ensure that the "PyDev plug-in" for Eclipse is installed and up-to-date
-#      on the development workstation and the "PyDev" menu item is visible
-#      in the "Debug" perspective.
-#        * See [Menu] -> Help -> Eclipse Marketplace -> Installed.
-#    * Ensure the the "pydevd" is installed on the test machine:
-#        * # pip show pydevd
-#        * # pip install pydevd==
-#        * It is recommended to update it, if a newer version is available.
-#            * # pip install pydevd --upgrade
-#    * Set the perspective in the upper right corner in Eclipse:
-#        * Select the "PyDev" perspective (blue snake icon).
-#        * Open the Python file, which will be debugged.
-#        * Select the "Debug" perspective (green bug icon).
-#    * Start the remote debugging server via [Menu] -> PyDev -> Start Debug Server
-#    * Ensure that all the remote debugging data are up to date and valid:
-#        * The source folders (local and remote)
-#            * See below: "MY_PATHS_FROM_ECLIPSE_TO_PYTHON". ESSENTIAL!!!
-#        * The port forwarding rules on the network components between
-#          the test machine and the development workstation, if any.
-#        * The environment variable "DEBUG_HOSTNAME" in the 
-#          login shell of the test user and root user on the test machine. ESSENTIAL!!!        
-#    * Start the script which will be debugged on the remote test machine.
-#    * Wait ~15 seconds until the script execution will stop at the 
-#      first code line after the "pydevd.settrace( ... )" command (see below).
-#      SUCCESS!!!
-#    * Finally debug the script. 
+# See "irc_debug.py" how to set up the remote debugging.
 # 
 if len(sys.argv) >= 2 and sys.argv[-1] in ['-db', '--debug']:
-	# Append PydDev remote debugger
-	# Import the PyDev remote debugger
-	import pydevd 
-	from pydevd_file_utils import setup_client_server_paths
-	import socket 
-	# Configure the Eclipse project path 
-	# on the Windows Development Workstation within the "eclipse-workspace" folder
-	# and on the remote test machine 
-	# exactly in this order and all paths must be absolute:
-	hostname = socket.gethostname()
-	MY_PATHS_FROM_ECLIPSE_TO_PYTHON = [
-		(
-			f'C:\\Users\\Paul\\eclipse-workspace\\{hostname}-irrcd', # local (development workstation)
-			f'/home/pi/eclipse-workspace/{hostname}-irrcd'  # remote (test machine)
-		)
-	]
-	debug_hostname = os.environ['DEBUG_HOSTNAME'] # The localhost IP address on which the debug server is listening 
-	if debug_hostname == None: debug_hostname = 'unknown_host'
-	debug_port = 5678 # The TCP/IP port on which the debug server is listening
-	# Enable remote debugging 
-	setup_client_server_paths(MY_PATHS_FROM_ECLIPSE_TO_PYTHON)	
-	try: 
-		pydevd.settrace(debug_hostname, port=debug_port, stdoutToServer=True, stderrToServer=True)
-	except:
-		print(f'ERROR: Cannot connect to debugger at "tcp://{debug_hostname}:{debug_port}".')
-		sys.exit(1)
+	# Import the PyDev remote debugger bootstrap only in "debug" mode
+	from irc_debug import enableRemoteDebugging
+	enableRemoteDebugging()
 
 #*****************************************************************************************************
 
 
-# Import community packages
+# Import project modules
 
-try:
-	import subprocess 
-except:
-	print('ERROR: Cannot find library "subprocess".\nExecute "pip install subprocess" to setup it.')
+from irc_capture import LircCapture
+from irc_env import EnvironmentProbe
+from irc_match import SequenceMatcher
+from irc_model import Device, Key
+from irc_normalize import SequenceNormalizer
+from irc_protocol import ProtocolDecoder
 
 
 ## An application class to to suitable record IR remote control codes.
@@ -126,8 +65,17 @@ class IRCLearningProgram:
 	## The command line arguments object.
 	args = None
 	
-	## The current subprocess. Default: None.
-	p = None
+	## The capture of the raw IR signal. Default: None.
+	capture = None
+	
+	## The normalizer of the IR signal sequences. Default: None.
+	normalizer = None
+	
+	## The matcher of the IR signal sequences. Default: None.
+	matcher = None
+	
+	## The decoder of the standard IR protocols. Default: None.
+	decoder = None
 	
 	## CONSTRUCTOR.
 	#
@@ -221,7 +169,7 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 		parser.add_argument(
 			'-d', 
 			'--device', 
-			help='Define the LIRC recording device path. Default: "/dev/lirc1".', 
+			help='Define the LIRC recording device path or the path of a file or named pipe with recorded LIRC "mode2" samples (e.g. "cat /dev/lirc1 > capture.bin"). Default: "/dev/lirc1".', 
 			type=str, 
 			default='/dev/lirc1'
 		)
@@ -251,6 +199,12 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 			type=float, 
 			default=0.15
 		)
+		parser.add_argument(
+			'-n', 
+			'--normalize', 
+			help='Normalize all keys of the existing output file in one pass instead of recording keys (e.g. after changing "--max_deviation").', 
+			action='store_true'
+		)
 		parser.add_argument(
 			'-o', 
 			'--output', 
@@ -258,6 +212,12 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 			type=str, 
 			required=True
 		)
+		parser.add_argument(
+			'-r', 
+			'--raw', 
+			help='Store the raw IR signal sequences of all keys instead of the protocol, address and command of the recognized standard IR protocols (NEC, Kaseikyo, Sony, RC5, RC6).', 
+			action='store_true'
+		)
 		parser.add_argument(
 			'-rc', 
 			'--repeat_count', 
@@ -298,6 +258,9 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 		except argparse.ArgumentError:
 			sys.stdout.write(f'ERROR: Wrong or missing command line arguments.\nCall "./{os.path.basename(sys.argv[0])} -h | --help" to see how to handle the syntax.\n')
 			sys.exit(22) # 22 = Invalid argument
+		self.normalizer = SequenceNormalizer(self.args.max_deviation, self.args.verbose)
+		self.matcher = SequenceMatcher(self.args.max_deviation)
+		self.decoder = ProtocolDecoder(self.args.max_deviation)
 		# Technical checks
 		os_name = os.name
 		pf_name = platform.system()
@@ -305,66 +268,52 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 			sys.stdout.write(f'ERROR: This program does not run on "{os_name}/{pf_name}". Run it on "posix\Linux" only.')
 			sys.exit(1) # 1 = Operation not permitted
 		if not self.args.bypass_checks: 
+			# Probe the system only, if it has been changed since the last launch
+			environment = EnvironmentProbe().probe()
 			# RELEASE: Get the Linux version code name
-			command = 'cat /etc/*-release 2>/dev/null';
-			p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, universal_newlines=True)
-			std_out = p.communicate()[0].strip()
-			rc = p.returncode
-			id_like = 'unknown'
-			distribution_id = "unknown"
-			version_id = 'unknown'
-			version_codename = 'unknown'
-			if rc != 0:
-				sys.stdout.write(f'WARNING: Cannot determine the system OS release information (return code {rc}).\n')
-			else:
-				items = std_out.replace('"','').split('\n')
-				find0 = 'ID_LIKE='
-				find1 = 'ID='
-				find2 = 'VERSION_ID='
-				find3 = 'VERSION_CODENAME='
-				for item in items:
-					if item.startswith(find0): 
-						id_like = item.replace(find0, '').strip().lower()
-					elif item.startswith(find1): 
-						distribution_id = item.replace(find1, '').strip().lower()
-					elif item.startswith(find2):
-						version_id = item.replace(find2, '').strip().lower()
-					elif item.startswith(find3):
-						version_codename = item.replace(find3, '').strip().lower()
+			id_like = environment['id_like']
+			distribution_id = environment['distribution_id']
+			version_id = environment['version_id']
+			version_codename = environment['version_codename']
+			if not environment['release_found']:
+				sys.stdout.write(f'WARNING: Cannot determine the system OS release information.\n')
 			if self.args.verbose: sys.stdout.write(f'Linux distribution is: {id_like}/{distribution_id} {version_id} ({version_codename})\n')
 			if id_like != 'debian':
 				sys.stdout.write(f'ERROR: This program is not tested on Linux distributions like "{id_like}".\nIt is designed for "debian" distributions (e.g raspbian, ubuntu, etc.) only.\n')
 				sys.exit(1) # 1 = Operation not permitted
-			# DEPENDENCY: Check if LIRC is installed (this will take a while)
-			command = 'apt -qq list lirc 2>/dev/null'
-			p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, universal_newlines=True)
-			std_out = p.communicate()[0].strip()
-			rc = p.returncode
+			# DEPENDENCY: Check if LIRC is installed
+			rc = environment['lirc_rc']
 			if rc != 0:
 				sys.stdout.write(f'ERROR: Cannot determine that LIRC is installed on this system (return code {rc}).\n')
 				sys.exit(1) # 1 = Operation not permitted
-			if not std_out.endswith('[installed]'):
+			if not environment['lirc_installed']:
 				sys.stdout.write(f'ERROR: LIRC is not installed on this system.\nExecute "sudo apt install lirc" to install it.\nYou must follow to the system-specific LIRC setup instructions\nfor "{distribution_id} {version_codename}".\n\n')
 				sys.exit(65) # 65 = package not installed
 			if self.args.verbose: sys.stdout.write('LIRC is installed on this system.\n\n')
-
-	## Analyze the output texts, determine the IR signal first key press and 
+	
+	## Analyze the received IR signal, determine the IR signal first key press and 
 	#  repeated key press as array of unsigned integers {H-signal, L-signal, ..., H-signal] 
 	#  of pulse and space widths in microseconds.
 	#  In addition detect the repeat space between the signal repetitions. 
 	#
-	#  @param output Console output text of the key IR signal recording.
+	#  @param events The events of the key IR signal recording (see "receiveIRSignal").
 	#  @return A tuple of result as boolean, first as array, repetition as array and repeat_space as integer (microseconds).
-	def analyzeOutput(self, output):
-		# Divide the console output texts line by line
-		# and remove the first 3 rows 
-		lines1 = output.split('\n')[3:]
-		if self.args.verbose: sys.stdout.write(f'IR recording lines:\n{lines1}\n')
+	def analyzeSignal(self, events):
 		# Extract the sequence 
 		try:
-			result, sequence, repetition, repeat_space = self.extractSequence(lines1)
+			result, sequence, repetition, repeat_space = self.extractSequence(events)
 			if not result: raise Exception("Cannot extract sequence.")
-		except:
+		except KeyboardInterrupt:
+			sys.stdout.write(f'\nThe program has been canceled by the user.\n\n')
+			sys.exit(125) # 125 = operation canceled
+		except EOFError as e:
+			# A recorded file or pipe does not contain any more key presses. Do not try again.
+			sys.stdout.write(f'ERROR: {e} It does not contain any more key presses.\n')
+			sys.exit(61) # 61 = no data available
+		except OSError as e:
+			sys.stdout.write(f'ERROR: Cannot read the IR signal from "{self.args.device}": {e}\n')
+			return False, None, None, 0
+		except Exception:
 			return False, None, None, 0
 		if self.args.verbose: sys.stdout.write(f'Received sequence:\n{sequence}\n')
 		if self.args.verbose: sys.stdout.write(f'Repeted sequence:\n{repetition}\n')
@@ -378,29 +327,8 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 	#  @param s The sublist to find.
 	#  @return A tuple of the result as boolean and the index where "s" has been found in "l".  
 	def isSublist(self, l, s):
-		result = False
-		index = 0
-		if s == []:
-			result = True
-		elif s == l:
-			result = True
-		elif len(s) > len(l):
-			result = False
-		else:
-			for i in range(len(l)):
-				if l[i] == s[0]:
-					n = 1
-					while (
-						n < len(s) 
-						and 
-						l[i + n] == s[n]
-					):
-						n += 1
-					if n == len(s):
-						result = True
-						index = i
-						break
-		return result, index
+		index = self.matcher.find(l, s, similar=False)
+		return index >= 0, max(index, 0)
 	
 	## Check using fuzzy logic if the list "s" is a similar sublist of the list "l".
 	#
@@ -408,98 +336,49 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 	#  @param s The sublist to find.
 	#  @return A tuple of the result as boolean and the index where "s" has been found in "l".  
 	def isSimilarSublist(self, l, s):
-		result = False
-		index = 0
-		if s == []:
-			result = True
-		elif s == l:
-			result = True
-		elif len(s) > len(l):
-			result = False
-		else:
-			for i in range(len(l)):
-				if self.checkDifferenceDeviation(l[i], s[0]):
-					n = 1
-					while (
-						n < len(s) 
-						and 
-						self.checkDifferenceDeviation(l[i + n], s[n])
-					): 
-						n += 1
-					if n == len(s):
-						result = True
-						index = i
-						break
-		return result, index
-
+		index = self.matcher.find(l, s)
+		return index >= 0, max(index, 0)
+	
 	## Compare two lists using fuzzy logic.
 	#
 	#  @param l1 The first list.
 	#  @param l2 The second list.
 	#  @return The boolean result as element of {True =  list are similar equal, False = list are not equal}.  
 	def isSimilarListPair(self, l1, l2):
-		result = True
-		if len(l1) != len(l2):
-			result = False
-		else:
-			for i in range(len(l1)):
-				if not self.checkDifferenceDeviation(l1[i], l2[i]):
-					result = False
-					break
-		return result
-
-	## Analyze the lines and extract the IR sequence data.
+		return self.matcher.isSimilarPair(l1, l2)
+	
+	## Extract the IR sequence data from the received events.
 	#
-	#  @param lines The lines of the console output text.
+	#  @param events The events as tuples of the name as element of {"pulse"; "space"; "timeout"} and the duration in microseconds.
 	#  @return A tuple of result as boolean, first as array, repetition as array and repeat_space as integer (microseconds).
-	def extractSequence(self, lines):
+	def extractSequence(self, events):
 		if self.args.verbose: sys.stdout.write(f'Extracting sequence ...\n')
 		# Extract the sequences
 		sequences = []
-		i = 0
-		l = len(lines)
+		inner_sequence = []
 		repeat_space_count  = 0
 		repeat_space_sum = 0
-		# Searching for relevant data
-		flag = False
-		while i < l:
-			inner_sequence = []
-			while i < l:
-				line = lines[i].strip()
-				if line == '': continue
-				words = line.split(' ')
-				if words[0] in ['pulse', 'space']:
-					length = int(words[1])
-					if length > 32768:
-						sys.stdout.write(f'ERROR: The text line {json.dumps(line)} shows that LIRC/mode2 is not working as expected. Check LIRC configuration. Reboot your system to repair.')
-						# Error due to LIRC malfuction
-						return False, None, None, 0 
-					inner_sequence.append(length)
-					i += 1
-					# Now we are in the relevant data
-					flag = True
-				elif words[0] == 'timeout':
-					sequences.append(inner_sequence)
-					i += 1
-					repeat_space_count += 1
-					timeout = int(words[1])
-					if timeout > 65532:
-						sys.stdout.write(f'ERROR: The text line {json.dumps(line)} shows that LIRC/mode2 is not working as expected. Check LIRC configuration. Reboot your system to repair.')
-						# Error due to LIRC malfuction
-						return False, None, None, 0 
-					repeat_space_sum += timeout
-					# Now we are in the relevant data
-					flag = True
-					break
-				else:
-					if flag:
-						sys.stdout.write(f'ERROR: The text line {json.dumps(line)} from "mode2" does not contain the expected key words.\n')
-						# Error or protocol deviation
-						return False, None, None, 0 
-					else:
-						# Ignore the first lines, which does not contain relevant data
-						i += 1
-
+		for name, length in events:
+			if name == 'timeout':
+				sequences.append(inner_sequence)
+				inner_sequence = []
+				repeat_space_count += 1
+				if length > 65532:
+					sys.stdout.write(f'ERROR: The event "{name} {length}" shows that LIRC is not working as expected. Check LIRC configuration. Reboot your system to repair.\n')
+					# Error due to LIRC malfuction
+					return False, None, None, 0 
+				repeat_space_sum += length
+			elif name == 'space' and inner_sequence == []:
+				# Ignore the gap before the first H-signal of a sequence
+				continue
+			else:
+				if length > 32768:
+					sys.stdout.write(f'ERROR: The event "{name} {length}" shows that LIRC is not working as expected. Check LIRC configuration. Reboot your system to repair.\n')
+					# Error due to LIRC malfuction
+					return False, None, None, 0 
+				inner_sequence.append(length)
+		if self.args.verbose and inner_sequence != []: sys.stdout.write(f'Ignored sequence without timeout: {inner_sequence}\n')
+	
 		# Calculate the average of the spaces between repetitions
 		repeat_space = int(round(repeat_space_sum / repeat_space_count))
 		# Remove all sequences with length less than 3
@@ -511,7 +390,7 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 		if len(sequences) < 2:
 			if len(sequences) == 1 and self.args.allow_singleshot: 
 				if self.args.verbose: sys.stdout.write(f'Received single shot sequence: {sequences}\n')
-				sequence = self.normalize(sequences[0])
+				sequence = self.normalizer.normalize(sequences[0])
 				return True, sequence, None, 0
 			else:
 				if self.args.verbose: sys.stdout.write(f'ERROR: Too few sequences has been been recorded. This is insufficient for a precise analysis.\n')
@@ -541,7 +420,7 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 					short_repeat_sequence = sequence
 					short_repeat_count += 1
 			# Normalize the longest selected sequences in one pass
-			longest_sequence, longest_repetition = self.normalizeTwoSequences(longest_sequence, longest_repetition)
+			longest_sequence, longest_repetition = self.normalizer.normalizeSequences([longest_sequence, longest_repetition])
 			# Detect the protocol and output related data
 			if longest_count == 1 and short_repeat_count > 0:
 				# Single or double layer with short repetition  
@@ -557,46 +436,6 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 				sys.stdout.write(f'ERROR: Too few sequences.\nPress the key down longer (e.g. 1 second).\n')
 				return False, None, None, 0
 			
-	## Normalize two sequences in one pass.
-	#
-	#  @param sequence1	The first sequence.	
-	#  @param sequence2 The second sequence.
-	#  @return Return the two normalized sequences as a tuple.
-	def normalizeTwoSequences(self, sequence1, sequence2):
-		p1 = 0
-		l1 = len(sequence1)
-		p2 = p1 + l1
-		l2 = len(sequence2)
-		joined_sequence = sequence1 + sequence2
-		joined_sequence = self.normalize(joined_sequence)
-		sequence1 = joined_sequence[p1:p1 + l1]
-		sequence2 = joined_sequence[p2:p2 + l2]
-		return sequence1, sequence2
-		
-	## Normalize four sequences in one pass.
-	#
-	#  @param sequence1	The first sequence.	
-	#  @param sequence2 The second sequence.
-	#  @param sequence3	The third sequence.	
-	#  @param sequence4 The forth sequence.
-	#  @return Return the four normalized sequences as a tuple.
-	def normalizeFourSequences(self, sequence1, sequence2, sequence3, sequence4):
-		p1 = 0
-		l1 = len(sequence1)
-		p2 = p1 + l1
-		l2 = len(sequence2)
-		p3 = p2 + l2
-		l3 = len(sequence3)
-		p4 = p3 + l3
-		l4 = len(sequence4)
-		joined_sequence = sequence1 + sequence2 + sequence3 + sequence4
-		joined_sequence = self.normalize(joined_sequence)
-		sequence1 = joined_sequence[p1:p1 + l1]
-		sequence2 = joined_sequence[p2:p2 + l2]
-		sequence3 = joined_sequence[p3:p3 + l3]
-		sequence4 = joined_sequence[p4:p4 + l4]
-		return sequence1, sequence2, sequence3, sequence4
-			
 	## Check using fuzzy logic if the item {pulse; space} selected by item_index has a similar width in all the sequences.
 	#  
 	#  @param sequences The sequences in analysis.
@@ -622,167 +461,21 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 		return True, normalized_item_value
 	
 	## Use fuzzy logic to check whether the difference deviation is similar or not.
-	#  <br>
-	#  NOTE: The similarity results from the fact that IR remote controls do not have  
-	#  crystal oscillators and their clock frequency is therefore influenced by 
-	#  thermal noise, electomagnetic noise, humidity noise, and voltage noise from the energy source.
-	#  <br> 
-	#  In addition, small firmware bugs that remain undetected in the manufacturer's 
-	#  tests can affect the pulse and gap lengths.
-	#  <br>
-	#  Thus, the pulse and gap widths of the IR signal deviate randomly from the values ​​defined by the manufacturer each time.
+	#  See "SequenceMatcher" for the root causes of the deviations.
 	#  
 	#  @param val1 The first value.
 	#  @param val2 The second value.
 	#  @return The result as boolean as element of {True = the pulses or gaps are ~equal; False = the pulses or gaps are ~not equal}. 
 	def checkDifferenceDeviation(self, val1, val2):
-		return (self.calculateDifferenceDeviation(val1, val2) <= self.args.max_deviation)
+		return self.matcher.isSimilar(val1, val2)
 		
-	## Calculate the deviation of the difference between two values based on the average of both values as a positive float number between 0.0 and 1.0.
+	## Receive an IR signal from the LIRC device, file or named pipe.
 	#
-	#  @param val1 The first value.
-	#  @param val2 The second value.
-	#  @return The positive deviation as float.
-	def calculateDifferenceDeviation(self, val1, val2):
-		# Avoid the "division by zero error" in all possibles cases
-		if val1 == 0 and val2 == 0:
-			return float(0.0)
-		# Ensure a positive deviation float number value based on the average of both values
-		if val2 > val1:
-			return (float(val2) - float(val1)) / ((float(val1) + float(val2)) / 2.0)
-		else:
-			return (float(val1) - float(val2)) / ((float(val1) + float(val2)) / 2.0)
-		
-	## Use fuzzy logic to normalize an IR signal sequence.
-	#  See the comments in the code for more details.
-	#
-	#  @param sequence The list of pulse/gap length values of an IR signal sequence.  	
-	#  @return The the normalized sequence.
-	def normalize(self, sequence):
-		# Forked from souri-t on GitHub by mpk 
-		# Original source: https://github.com/souri-t/RemoteControl-RPI/blob/master/remote/bin/irrp
-		#
-		# by mpk: Code review and adoption to the interfaces of this program and my quality level. 
-		# by souri-t a by mpk: Reviewed explanation:
-		"""
-		Typically a code will be made up of two or three distinct
-		marks (carrier) and spaces (no carrier) of different lengths.
-	
-		Because of transmission and reception errors those pulses
-		which should all be x microseconds long will have a variance 
-		around x. See the root causes of this behavior in the Doxygen
-		comment lines before the method "checkDifferenceDeviation" 
-		of this class.
-	
-		This function identifies the distinct pulses and takes the
-		average of the lengths making up each distinct pulse.
-		Marks and spaces are processed separately.
-	
-		This makes the eventual generation of IR signal sequences 
-		by the sender much more accurate.
-	
-		Input
-	
-		M    S    M	  S	  M	  S	  M	  S	   M   S    M
-		9000 4500 600 540 620 560 590 1660 620 1690 615
-	
-		Distinct marks
-	
-		9000                average 9000
-		600 620 590 620 615 average  609
-	
-		Distinct spaces
-	
-		4500                average 4500
-		540 560             average  550
-		1660 1690           average 1675
-	
-		Output
-	
-		M    S    M	  S   M	  S	  M	  S	   M   S    M
-		9000 4500 609 550 609 550 609 1675 609 1675 609
-		"""
-		# mpk: Calculate the min. and max. tolerance values by argument of this program 
-		toler_min = float(1.0) - self.args.max_deviation 
-		toler_max = float(1.0) + self.args.max_deviation
-		# Verbosely output the sequence before changes
-		if self.args.verbose:
-			print(f"Sequence before normalizing:\n{sequence}\n\n")
-		# Change the sequence
-		entries = len(sequence)
-		p = [0] * entries # Set all entries not processed
-		for i in range(entries):
-			if not p[i]: # Not processed?
-				v = sequence[i]
-				tot = v
-				similar = 1.0
-				# Find all pulses with similar lengths to the start pulse
-				for j in range(i + 2, entries, 2):
-					if not p[j]: # Unprocessed
-						if (sequence[j] * toler_min) < v < (sequence[j] * toler_max): # Similar
-							tot = tot + sequence[j]
-							similar += 1.0
-				# Calculate the average pulse length
-				newv = round(tot / similar, 2)
-				sequence[i] = int(round(newv)) # mpk: Integer values needed in this program
-				# Set all similar pulses to the average value
-				for j in range(i + 2, entries, 2):
-					if not p[j]: # Unprocessed.
-						if (sequence[j] * toler_min) < v < (sequence[j] * toler_max): # Similar
-							sequence[j] = int(round(newv)) # mpk: Integer values needed in this program
-							p[j] = 1
-		# Verbosely output the sequence after changes
-		if self.args.verbose:
-			print(f"Sequence after normalizing:\n{sequence}\n\n")
-		# Return the changed sequence
-		return sequence
-
-	## Do what to do, when the hanger hangs after receiving the IR signal.
-	#
-	# @param signum Unused.
-	# @param frame Unused.
-	def _hanger_sigalrm_handler(self, signum, frame): #@UnusedVariable
-		# Kill the LIRC mode2 process
-		self.p.kill()
-		# Raise a runtime error to leave the receiver endless loop
-		raise RuntimeError('Timeout')
-	
-	## Receive an IR signal using the tool LIRC mode2.
-	#
-	#  @return The console text output from LIRC mode2.
+	#  @return A generator of the events as tuples of the name as element of {"pulse"; "space"; "timeout"} and the duration in microseconds.
 	def receiveIRSignal(self):
-		output = ''
-		# Record the data from Infrared Remote Control using "LIRC mode2"
-		command = f'mode2 -d {self.args.device}'
-		self.p = subprocess.Popen(command, shell=True, bufsize=0, stdin=None, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding='utf8')
-		# ALARM: Define callback handler to detect, when IR signal has finished
-		signal.signal(signal.SIGALRM, self._hanger_sigalrm_handler) #@UndefinedVariable
-		# ALARM: Wait for no output after the IR signal has been received. Not before.
-		count = 10
-		receiving = False
-		# The receiver endless loop
-		while True:
-			try: 
-				# ALARM: Start observing the "hanger"
-				if receiving: signal.alarm(self.args.timeout) #@UndefinedVariable
-				# Read a single line from console output
-				# ALARM: Execute the "hanger"
-				line = self.p.stdout.readline()
-				# ALARM: Stop observing the "hanger"
-				signal.alarm(0) #@UndefinedVariable
-				# Add the line to the output
-				output += line 
-				# ALARM: Divert the possibilities
-				count -= 1
-				if (not receiving) and count <= 0:
-					receiving = True
-			except KeyboardInterrupt:
-				sys.stdout.write(f'\nThe program has been canceled by the user.\n\n')
-				sys.exit(125) # 125 = operation canceled
-			except RuntimeError:
-				# IR data received
-				break
-		return output.strip()
+		if self.capture == None:
+			self.capture = LircCapture(self.args.device)
+		return self.capture.receive(self.args.timeout)
 	
 	## Record and verify the IR signal from the remote control.
 	#
@@ -794,10 +487,9 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 			key_dict = {}
 			# PASS 1:
 			sys.stdout.write(f'Press the "{key_name}" key for the first time ...\n')
-			output = self.receiveIRSignal()
-			if self.args.verbose: sys.stdout.write(f'FIRST RECORD:\n{output}\n\n')
+			events = self.receiveIRSignal()
 			# Perform the analysis
-			result, sequence1, repetition1, repeat_space1 = self.analyzeOutput(output)
+			result, sequence1, repetition1, repeat_space1 = self.analyzeSignal(events)
 			if not result:
 				if self.args.verbose: sys.stdout.write('ERROR: The output analysis failed at first recording.\n')
 				sys.stdout.write(f'ERROR: The recording for key "{key_name}" failed at first recording. Try again.\n\n')
@@ -819,17 +511,16 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 				return key_dict
 			# PASS 2:
 			sys.stdout.write(f'Press the key "{key_name}" a second time ...\n')
-			output = self.receiveIRSignal()
-			if self.args.verbose: sys.stdout.write(f'SECOND RECORD:\n{output}\n\n')
+			events = self.receiveIRSignal()
 			# Perform the analysis
-			result, sequence2, repetition2, repeat_space2 = self.analyzeOutput(output) #@UnusedVariable
+			result, sequence2, repetition2, repeat_space2 = self.analyzeSignal(events) #@UnusedVariable
 			if not result:
 				if self.args.verbose: sys.stdout.write('ERROR: The output analysis failed at second recording.\n')
 				sys.stdout.write(f'ERROR: The recording for key "{key_name}" failed at second recording. Try again.\n\n')
 				# Try again. Repeat the recording for this key.
 				continue
 			# Normalize the two sequences
-			sequence1, sequence2 = self.normalizeTwoSequences(sequence1, sequence2)
+			sequence1, sequence2 = self.normalizer.normalizeSequences([sequence1, sequence2])
 			if self.isSimilarListPair(sequence1, sequence2):
 				# Single layer protocol detected
 				key_dict = { 
@@ -847,10 +538,9 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 				sys.stdout.write(f'\nDouble layer protocol detected for the key "{key_name}".\nYou need to do 2 further key presses.\n\n')
 				# PASS 3:
 				sys.stdout.write(f'Press the key "{key_name}" a third time ...\n')
-				output = self.receiveIRSignal()
-				if self.args.verbose: sys.stdout.write(f'THIRD RECORD:\n{output}\n\n')
+				events = self.receiveIRSignal()
 				# Perform the analysis
-				result, sequence3, repetition3, repeat_space3 = self.analyzeOutput(output) #@UnusedVariable
+				result, sequence3, repetition3, repeat_space3 = self.analyzeSignal(events) #@UnusedVariable
 				if not result:
 					if self.args.verbose: sys.stdout.write('ERROR: The output analysis failed at third recording.\n')
 					sys.stdout.write(f'ERROR: The recording for key "{key_name}" failed at the third recording. Try again.\n\n')
@@ -858,10 +548,9 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 					continue
 				# PASS 4:
 				sys.stdout.write(f'Press the key "{key_name}" a forth time ...\n')
-				output = self.receiveIRSignal()
-				if self.args.verbose: sys.stdout.write(f'FOURTH RECORD:\n{output}\n\n')
+				events = self.receiveIRSignal()
 				# Perform the analysis
-				result, sequence4, repetition4, repeat_space4 = self.analyzeOutput(output) #@UnusedVariable
+				result, sequence4, repetition4, repeat_space4 = self.analyzeSignal(events) #@UnusedVariable
 				if not result:
 					if self.args.verbose: sys.stdout.write('ERROR: The output analysis failed at fourth recording.\n')
 					sys.stdout.write(f'ERROR: The recording for key "{key_name}" failed at fourth recording. Try again.\n\n')
@@ -873,9 +562,9 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 				# And check if the sequence of the second key press 
 				# is similar to 
 				# the sequence of the sequence if the forth key press.
-				sequence1, sequence2, sequence3, sequence4 = self.normalizeFourSequences(sequence1, sequence2, sequence3, sequence4)
+				sequence1, sequence2, sequence3, sequence4 = self.normalizer.normalizeSequences([sequence1, sequence2, sequence3, sequence4])
 				if self.isSimilarListPair(sequence1, sequence3) and self.isSimilarListPair(sequence2, sequence4):
-					repetition1, repetition2 = self.normalizeTwoSequences(repetition1, repetition2)
+					repetition1, repetition2 = self.normalizer.normalizeSequences([repetition1, repetition2])
 					key_dict = {
 						'type': 2, 
 						'first': sequence1, 
@@ -896,6 +585,19 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 			# Finish the recording for this key
 			return key_dict
 			
+	## Replace the recorded sequences of a key by its protocol, address and command, if a standard IR protocol is recognized.
+	#
+	#  @param key_name The name of the key.
+	#  @param data The dictionary of the recorded key.
+	#  @return The Key object.
+	def recognizeKey(self, key_name, data):
+		if not self.args.raw:
+			compact_data = self.decoder.decodeKey(data)
+			if compact_data != None:
+				sys.stdout.write(f'Key "{key_name}" recognized as protocol "{compact_data["protocol"]}" with address {compact_data["address"]} and command {compact_data["command"]}.\n')
+				data = compact_data
+		return Key.fromDict(key_name, data)
+	
 	## Run the object.
 	#
 	def run(self):
@@ -911,40 +613,31 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 		sys.stdout.write(f'Output file: {self.args.output}\n')
 		# Receive the IR signal data
 		if os.path.isfile(self.args.output):
-			# Load existing output file as text 
+			# Load existing output file
 			# Backwards compatible to files generated by the simple "irrp.py"
-			with open(self.args.output, 'r') as text_file:
-				text = text_file.read()	
-			keys = json.loads(text)
-			keys_stringlist = ' '.join(list(keys.keys()))
-			key_names = keys_stringlist.split()
-			first_item = keys[key_names[0]]
-			# In the simple program the first item is a list, not a dict
-			if type(first_item) is list:
-				# Automatically migrate to the new data model
-				new_keys = {}
-				for key_name in key_names:
-					new_key = {
-						'type': 0,
-						'first': keys[key_name],
-						'next': None,
-						'repetition_first': None,
-						'repetition_next': None,
-						'repeat_count': 0,
-						'repeat_space': 0,
-						'timeout_space': None
-					}
-					new_keys[key_name] = new_key
-				keys = new_keys
+			try:
+				keys = dict(Device.load(self.args.output).keys)
+			except (OSError, ValueError) as e:
+				sys.stdout.write(f'ERROR: Cannot load the output file "{self.args.output}": {e}\n')
+				return 1
+			key_names = list(keys)
 			if self.args.verbose:
-				text = json.dumps(keys, indent="\t", sort_keys=True) 
+				text = Device(irc_name, self.args.output, keys).toJson()
 				sys.stdout.write(f'Current content: \n{text}\n\n')
 			text1 = ' '.join(key_names)
 			sys.stdout.write(f'Currently existing keys: \n{text1}\n\n')
 		else: 
 			keys = {}
 			sys.stdout.write(f'The data for the infrared remote control "{irc_name}" will be created from scratch.\n')
-		if self.args.key_names != '':
+		if self.args.normalize:
+			# Normalize the existing keys only
+			if len(keys) == 0:
+				sys.stdout.write(f'ERROR: There are no keys to normalize in the output file "{self.args.output}".\n')
+				return 1
+			keys = dict(self.normalizer.normalizeDevice(Device.fromKeys(irc_name, self.args.output, keys)).keys)
+			keys = {key_name: self.recognizeKey(key_name, key.toDict()) for key_name, key in keys.items()}
+			sys.stdout.write(f'All keys have been normalized with max. deviation {self.args.max_deviation}.\n\n')
+		elif self.args.key_names != '':
 			# Use key names from command line argument "--key_names"
 			key_names = [word.lower() for word in self.args.key_names.split()]
 			key_names.sort()
@@ -952,7 +645,7 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 			sys.stdout.write(f'Keys to create/update: \n{text2}\n\n')
 			for key_name in key_names:
 				data = self.recordKey(key_name)
-				keys[key_name] = data
+				keys[key_name] = self.recognizeKey(key_name, data)
 		else:
 			# Enter the key names manually
 			while True:
@@ -964,9 +657,9 @@ $ ./irc_learn.py --output data/iiyama_monitor_prolite_tf3238msc.json --key_names
 					return 125 # 125 = operation canceled
 				if key_name == '': break
 				data = self.recordKey(key_name)
-				keys[key_name] = data
+				keys[key_name] = self.recognizeKey(key_name, data)
 		# Save the keys data of the infrared remote control to the output file
-		text = json.dumps(keys, indent="\t", sort_keys=True)
+		text = Device(irc_name, self.args.output, keys).toJson()
 		if self.args.dry_run:
 			sys.stdout.write(f'\nThe new output content could be:\n{text}\n\n')
 			sys.stdout.write(f'The dry run of the program has succeeded.\n\n')
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Match.
+	A module to find IR signal sequences in each other, tolerating the deviations of the widths.
+	Copyright (C) 2021 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Match.
+#  A module to find IR signal sequences in each other, tolerating the deviations of the widths.
+#  Created on 2021-06-30 (split from "irc_learn.py").
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import bisect
+import math
+
+
+## A compiled pattern of an IR signal sequence, which is found in a sequence in linear time.
+#  <br>
+#  Each width of the pattern accepts an interval of widths. The interval end points
+#  divide the widths into at most 2 * length + 1 buckets, where each bucket has a
+#  constant bit mask of the pattern positions, which accept its widths. The search
+#  is a bit-parallel "shift-and" over the bucket masks of the sequence: Bit k of the
+#  state is set, if the last k + 1 widths of the sequence match the first k + 1 widths
+#  of the pattern.
+#
+class SequencePattern:
+	
+	__slots__ = ('length', 'points', 'masks')
+	
+	## CONSTRUCTOR.
+	#
+	#  @param intervals The list of the accepted intervals (minimum, maximum) of the widths per pattern position.
+	def __init__(self, intervals):
+		self.length = len(intervals)
+		# The start of each interval sets its bit and the end clears it
+		events = []
+		for k, (minimum, maximum) in enumerate(intervals):
+			events.append((minimum, k))
+			events.append((maximum + 1, k))
+		events.sort()
+		# The sorted start points of the buckets
+		self.points = []
+		# The bit masks of the buckets, where the first bucket is below all intervals
+		self.masks = [0]
+		mask = 0
+		for point, k in events:
+			mask ^= 1 << k
+			if len(self.points) > 0 and self.points[-1] == point:
+				self.masks[-1] = mask
+			else:
+				self.points.append(point)
+				self.masks.append(mask)
+	
+	## Find the pattern in a sequence.
+	#
+	#  @param sequence The sequence of widths where to find.
+	#  @param start The index where to start the search. Default: 0.
+	#  @return The index where the pattern has been found or -1.
+	def find(self, sequence, start=0):
+		if self.length == 0:
+			return start if start <= len(sequence) else -1
+		points = self.points
+		masks = self.masks
+		goal = 1 << (self.length - 1)
+		state = 0
+		for i in range(start, len(sequence)):
+			state = ((state << 1) | 1) & masks[bisect.bisect_right(points, sequence[i])]
+			if state & goal:
+				return i - self.length + 1
+		return -1
+	
+	## Check if a sequence matches the whole pattern.
+	#
+	#  @param sequence The sequence of widths.
+	#  @return True, if the sequence has the same length and each width is accepted.
+	def matches(self, sequence):
+		return len(sequence) == self.length and self.find(sequence) == 0
+
+
+## A matcher of IR signal sequences using fuzzy logic.
+#  <br>
+#  NOTE: The similarity results from the fact that IR remote controls do not have
+#  crystal oscillators and their clock frequency is therefore influenced by
+#  thermal noise, electomagnetic noise, humidity noise, and voltage noise from the energy source.
+#  <br>
+#  In addition, small firmware bugs that remain undetected in the manufacturer's
+#  tests can affect the pulse and gap lengths.
+#  <br>
+#  Thus, the pulse and gap widths of the IR signal deviate randomly from the values defined by the manufacturer each time.
+#  <br>
+#  Two widths are similar, if their difference deviation (see "calculateDifferenceDeviation")
+#  is not greater than the maximum deviation. The widths, which are similar to a width,
+#  are an interval, which is calculated once per width and cached. So the matching
+#  compares integers only.
+#
+class SequenceMatcher:
+	
+	## The maximum item value difference deviation (between 0.0 and 2.0 exclusive). Default: 0.15.
+	max_deviation = 0.15
+	
+	## The cache of the intervals of similar widths {width: (minimum, maximum)}. Default: None.
+	bounds = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param max_deviation The maximum item value difference deviation (between 0.0 and 2.0 exclusive). Default: 0.15.
+	def __init__(self, max_deviation=0.15):
+		self.max_deviation = max_deviation
+		self.bounds = {}
+	
+	## Calculate the deviation of the difference between two values based on the average of both values as a positive float number between 0.0 and 2.0.
+	#
+	#  @param val1 The first value.
+	#  @param val2 The second value.
+	#  @return The positive deviation as float.
+	@staticmethod
+	def calculateDifferenceDeviation(val1, val2):
+		# Avoid the "division by zero error" in all possibles cases
+		if val1 == 0 and val2 == 0:
+			return float(0.0)
+		# Ensure a positive deviation float number value based on the average of both values
+		if val2 > val1:
+			return (float(val2) - float(val1)) / ((float(val1) + float(val2)) / 2.0)
+		else:
+			return (float(val1) - float(val2)) / ((float(val1) + float(val2)) / 2.0)
+	
+	## Check if the difference deviation of two values is not greater than the maximum deviation.
+	#
+	#  @param val1 The first value.
+	#  @param val2 The second value.
+	#  @return The result as boolean as element of {True = the pulses or gaps are ~equal; False = the pulses or gaps are ~not equal}.
+	def isSimilar(self, val1, val2):
+		minimum, maximum = self.getBounds(val1)
+		return minimum <= val2 <= maximum
+	
+	## Get the interval of the widths, which are similar to a width.
+	#
+	#  @param width The width in microseconds as integer.
+	#  @return A tuple of the minimum and the maximum similar width.
+	def getBounds(self, width):
+		bounds = self.bounds.get(width)
+		if bounds == None:
+			deviation = self.max_deviation
+			ratio = (2.0 + deviation) / (2.0 - deviation)
+			# Estimate the interval and correct it by the exact calculation
+			minimum = max(0, math.ceil(width / ratio))
+			maximum = math.floor(width * ratio)
+			while minimum > 0 and self.calculateDifferenceDeviation(width, minimum - 1) <= deviation:
+				minimum -= 1
+			while self.calculateDifferenceDeviation(width, minimum) > deviation:
+				minimum += 1
+			while self.calculateDifferenceDeviation(width, maximum + 1) <= deviation:
+				maximum += 1
+			while self.calculateDifferenceDeviation(width, maximum) > deviation:
+				maximum -= 1
+			bounds = self.bounds[width] = (minimum, maximum)
+		return bounds
+	
+	## Compile a pattern.
+	#
+	#  @param pattern The sequence of widths to find.
+	#  @param similar True to accept similar widths, False to accept equal widths only. Default: True.
+	#  @return The SequencePattern object.
+	def compile(self, pattern, similar=True):
+		if similar:
+			return SequencePattern([self.getBounds(width) for width in pattern])
+		return SequencePattern([(width, width) for width in pattern])
+	
+	## Find a pattern in a sequence.
+	#
+	#  @param sequence The sequence of widths where to find.
+	#  @param pattern The sequence of widths to find.
+	#  @param similar True to accept similar widths, False to accept equal widths only. Default: True.
+	#  @return The index where the pattern has been found or -1.
+	def find(self, sequence, pattern, similar=True):
+		if len(pattern) > len(sequence):
+			return -1
+		return self.compile(pattern, similar).find(sequence)
+	
+	## Check if two sequences have the same length and similar widths.
+	#
+	#  @param sequence1 The first sequence.
+	#  @param sequence2 The second sequence.
+	#  @return True, if the sequences are similar.
+	def isSimilarPair(self, sequence1, sequence2):
+		if len(sequence1) != len(sequence2):
+			return False
+		for width1, width2 in zip(sequence1, sequence2):
+			minimum, maximum = self.getBounds(width1)
+			if not minimum <= width2 <= maximum:
+				return False
+		return True
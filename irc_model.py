@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Model.
+	A module of the data model of the IR remote control devices and their keys.
+	Copyright (C) 2021 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Model.
+#  A module of the data model of the IR remote control devices and their keys.
+#  Created on 2021-07-08 (split from "irc_api.py").
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import array
+import json
+import os
+import types
+
+# Import project modules
+
+from irc_protocol import PROTOCOLS
+
+
+## A key of an IR remote control.
+#  <br>
+#  The IR signal sequences [H-signal, L-signal, ..., H-signal] in microseconds
+#  are stored as compact arrays of unsigned integers instead of lists of Python ints.
+#  <br>
+#  A key of a standard IR protocol (see "irc_protocol") is stored in the JSON data file
+#  as protocol, address, command and toggle bit only. Its sequences are synthesized.
+#
+class Key:
+	
+	__slots__ = (
+		'name',
+		'type',
+		'first',
+		'next',
+		'repetition_first',
+		'repetition_next',
+		'repeat_count',
+		'repeat_space',
+		'timeout_space',
+		'protocol',
+		'address',
+		'command',
+		'toggle'
+	)
+	
+	## Protocol type: A single IR signal sequence without repetitions.
+	TYPE_SINGLE_SHOT = 0
+	
+	## Protocol type: The first IR signal sequence is followed by repetitions.
+	TYPE_SINGLE_LAYER = 1
+	
+	## Protocol type: Each second key press sends the "next" layer of IR signal sequences.
+	TYPE_DOUBLE_LAYER = 2
+	
+	## Names of the IR signal sequences of a key.
+	SEQUENCES = ('first', 'next', 'repetition_first', 'repetition_next')
+	
+	## Default space (L-signal) between 2 key presses in microseconds, if the key has no repeat space.
+	PRESS_SPACE = 32000
+	
+	## CONSTRUCTOR.
+	#
+	#  @param name The name of the key.
+	#  @param type The protocol type as element of {TYPE_SINGLE_SHOT; TYPE_SINGLE_LAYER; TYPE_DOUBLE_LAYER}. Default: TYPE_SINGLE_SHOT.
+	#  @param first The IR signal sequence of the first key press.
+	#  @param next The IR signal sequence of the next key press (double layer protocol) or None. Default: None.
+	#  @param repetition_first The repeated IR signal sequence of the first key press or None. Default: None.
+	#  @param repetition_next The repeated IR signal sequence of the next key press or None. Default: None.
+	#  @param repeat_count The count of repetitions. Default: 0.
+	#  @param repeat_space The space (L-signal) between 2 repetitions in microseconds. Default: 0.
+	#  @param timeout_space The time in seconds after a key press is forgotten (double layer protocol) or None. Default: None.
+	#  @param protocol The name of the IR protocol (see "irc_protocol.PROTOCOLS") or None for raw sequences. Default: None.
+	#  @param address The address of the device in the IR protocol. Default: 0.
+	#  @param command The command of the key in the IR protocol. Default: 0.
+	#  @param toggle The toggle bit of the first key press in the IR protocol. Default: 0.
+	#  @exception KeyError The IR protocol is unknown.
+	#  @exception ValueError The IR protocol does not support the protocol type.
+	def __init__(
+			self,
+			name,
+			type=TYPE_SINGLE_SHOT,
+			first=None,
+			next=None,
+			repetition_first=None,
+			repetition_next=None,
+			repeat_count=0,
+			repeat_space=0,
+			timeout_space=None,
+			protocol=None,
+			address=0,
+			command=0,
+			toggle=0
+	):
+		self.name = name
+		self.type = type
+		self.protocol = protocol
+		self.address = address
+		self.command = command
+		self.toggle = toggle
+		if protocol != None and first == None:
+			# Synthesize the sequences of the IR protocol
+			frames = self.getFrames()
+			first, next, repetition_first, repetition_next = (
+				None if frames[sequence_name] == None else frames[sequence_name].toSequence() for sequence_name in self.SEQUENCES
+			)
+		self.first = self.toArray(first)
+		self.next = self.toArray(next)
+		self.repetition_first = self.toArray(repetition_first)
+		self.repetition_next = self.toArray(repetition_next)
+		self.repeat_count = repeat_count
+		self.repeat_space = repeat_space
+		self.timeout_space = timeout_space
+	
+	## Convert a list of durations to a compact array.
+	#  Other sequence objects (e.g. the views of a pack) are kept as they are.
+	#
+	#  @param sequence The list of durations in microseconds or None.
+	#  @return An array of unsigned 16 bit integers or, if a duration exceeds 65535, of unsigned 32 bit integers.
+	@staticmethod
+	def toArray(sequence):
+		if not isinstance(sequence, list):
+			return sequence
+		if max(sequence, default=0) <= 0xFFFF:
+			return array.array('H', sequence)
+		return array.array('I', sequence)
+	
+	## Create a key from its JSON data.
+	#
+	#  @param name The name of the key.
+	#  @param data The dictionary of the key data.
+	#  @return The Key object.
+	@classmethod
+	def fromDict(cls, name, data):
+		return cls(
+			name,
+			data['type'],
+			# The sequences of a key of an IR protocol are synthesized
+			data['first'] if data.get('protocol') == None else None,
+			data.get('next'),
+			data.get('repetition_first'),
+			data.get('repetition_next'),
+			data.get('repeat_count', 0),
+			data.get('repeat_space', 0),
+			data.get('timeout_space'),
+			data.get('protocol'),
+			data.get('address', 0),
+			data.get('command', 0),
+			data.get('toggle', 0)
+		)
+	
+	## Get the frames of the IR protocol of this key.
+	#
+	#  @return The dictionary of the frames (see "irc_protocol.Protocol.getFrames") or None for raw sequences.
+	def getFrames(self):
+		if self.protocol == None:
+			return None
+		return PROTOCOLS[self.protocol].getFrames(self.type, self.address, self.command, self.toggle)
+	
+	## Get the IR signal sequences to send.
+	#  A key of a standard IR protocol is sent by the frames of its symbol waves instead of its synthesized sequences.
+	#
+	#  @return The dictionary {sequence_name: sequence, Frame or None} of all SEQUENCES.
+	def getSequences(self):
+		frames = self.getFrames()
+		if frames != None:
+			return frames
+		return {sequence_name: getattr(self, sequence_name) for sequence_name in self.SEQUENCES}
+	
+	## Get the space (L-signal) between 2 presses of this key.
+	#
+	#  @return The space in microseconds.
+	def getPressSpace(self):
+		return self.repeat_space or self.PRESS_SPACE
+	
+	## Select the IR signal sequences of a key press depending on the protocol type.
+	#
+	#  @param first_layer True to select the first layer, False to select the next layer of the double layer protocol. Default: True.
+	#  @param no_repeat Do not select the repetitions. Default: False.
+	#  @return The list of IR signal sequences [first, repetition, ..., repetition].
+	#  @exception ValueError The protocol type is unknown.
+	def selectSequences(self, first_layer=True, no_repeat=False):
+		sequences = self.getSequences()
+		if self.type == self.TYPE_SINGLE_SHOT:
+			return [sequences['first']]
+		if self.type == self.TYPE_SINGLE_LAYER or (self.type == self.TYPE_DOUBLE_LAYER and first_layer):
+			first, repetition = sequences['first'], sequences['repetition_first']
+		elif self.type == self.TYPE_DOUBLE_LAYER:
+			first, repetition = sequences['next'], sequences['repetition_next']
+		else:
+			raise ValueError(f'Unknown protocol type "{self.type}".')
+		if no_repeat:
+			return [first]
+		return [first] + [repetition]*self.repeat_count
+	
+	## Select the IR signal sequences of N presses of this key.
+	#  The presses alternate with a period of 2 at most.
+	#
+	#  @param count The count of the key presses. Default: 1.
+	#  @param no_repeat Do not select the repetitions. Default: False.
+	#  @param toggle Function without arguments, which advances the key state of the double layer protocol 
+	#  and returns True for the first layer (see "irc_api.ToggleStateStore.toggle") or None to select the first layer. Default: None.
+	#  @return The list of the alternating presses, each as list of IR signal sequences (see "selectSequences").
+	#  @exception ValueError The protocol type is unknown.
+	def selectPresses(self, count=1, no_repeat=False, toggle=None):
+		presses = []
+		for n in range(count):
+			first_layer = self.type != self.TYPE_DOUBLE_LAYER or toggle == None or toggle()
+			sequences = self.selectSequences(first_layer, no_repeat)
+			if n < 2:
+				presses.append(sequences)
+		if len(presses) > 1 and presses[1] == presses[0]:
+			del presses[1:]
+		return presses
+	
+	## Get the JSON data of this key.
+	#
+	#  @return The dictionary of the key data with the sequences as lists or with the parameters of its IR protocol.
+	def toDict(self):
+		data = {
+			'type': self.type,
+			'repeat_count': self.repeat_count,
+			'repeat_space': self.repeat_space,
+			'timeout_space': self.timeout_space
+		}
+		if self.protocol != None:
+			data.update({'protocol': self.protocol, 'address': self.address, 'command': self.command, 'toggle': self.toggle})
+			return data
+		for sequence_name in self.SEQUENCES:
+			sequence = getattr(self, sequence_name)
+			data[sequence_name] = None if sequence == None else list(sequence)
+		return data
+
+
+## A device, which is controlled by an IR remote control.
+#  <br>
+#  This is the single point, where the JSON data files are loaded and
+#  the former "irrp.py" recordings are migrated to the actual data model.
+#
+class Device:
+	
+	__slots__ = ('name', 'filepath', 'keys')
+	
+	## CONSTRUCTOR.
+	#
+	#  @param name The name of the device, which is the file name without extension.
+	#  @param filepath The path of the JSON data file.
+	#  @param keys The read-only mapping of the keys {key_name: Key}.
+	def __init__(self, name, filepath, keys):
+		self.name = name
+		self.filepath = filepath
+		self.keys = keys
+	
+	## Load a device from its JSON data file.
+	#
+	#  @param filepath The path of the JSON data file.
+	#  @return The Device object.
+	#  @exception OSError The file cannot be opened.
+	#  @exception ValueError The file is not a valid JSON data file.
+	@classmethod
+	def load(cls, filepath):
+		with open(filepath, 'r') as file:
+			data = json.load(file)
+		if not isinstance(data, dict):
+			raise ValueError(f'The file "{filepath}" does not contain a dictionary of keys.')
+		try:
+			keys = {key_name: Key.fromDict(key_name, key_data) for key_name, key_data in cls.migrate(data).items()}
+		except (KeyError, TypeError, OverflowError, ValueError) as e:
+			raise ValueError(f'The file "{filepath}" contains an invalid key: {e}')
+		return cls.fromKeys(os.path.splitext(os.path.basename(filepath))[0], filepath, keys)
+	
+	## Create a device with a read-only mapping of its keys.
+	#
+	#  @param name The name of the device.
+	#  @param filepath The path of the JSON data file.
+	#  @param keys The dictionary of the keys {key_name: Key}.
+	#  @return The Device object.
+	@classmethod
+	def fromKeys(cls, name, filepath, keys):
+		return cls(name, filepath, types.MappingProxyType(keys))
+	
+	## Support pickling, e.g. to return a device from a worker process.
+	#  The read-only mapping of the keys cannot be pickled itself.
+	#
+	def __reduce__(self):
+		return (self.fromKeys, (self.name, self.filepath, dict(self.keys)))
+	
+	## Ensure downwards compatibility to former "irrp.py" recordings.
+	#
+	#  @param data The dictionary of the keys loaded from a JSON file.
+	#  @return The dictionary of the keys in the actual data model.
+	@staticmethod
+	def migrate(data):
+		if len(data) == 0:
+			return data
+		# In the simple program the first item is a list, not a dict
+		if type(next(iter(data.values()))) is list:
+			# Automatically migrate to the new data model
+			new_data = {}
+			for key_name in data:
+				new_data[key_name] = {
+					'type': 0,
+					'first': data[key_name],
+					'next': None,
+					'repetition_first': None,
+					'repetition_next': None,
+					'repeat_count': 0,
+					'repeat_space': 0,
+					'timeout_space': None
+				}
+			data = new_data
+		return data
+	
+	## Get the JSON text of this device.
+	#
+	#  @return The JSON text.
+	def toJson(self):
+		return json.dumps({key_name: key.toDict() for key_name, key in self.keys.items()}, indent="\t", sort_keys=True)
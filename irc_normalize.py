@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Normalize.
+	A module to normalize the pulse and space widths of the learned IR signal sequences.
+	Copyright (C) 2021 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Normalize.
+#  A module to normalize the pulse and space widths of the learned IR signal sequences.
+#  Created on 2021-06-30 (split from "irc_learn.py").
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import bisect
+import sys
+
+# Import community libraries
+
+try:
+	import numpy
+except ImportError:
+	# The pure Python implementation is used instead
+	numpy = None
+
+# Import project modules
+
+from irc_model import Device, Key
+
+
+## A normalizer of IR signal sequences using fuzzy logic.
+#  <br>
+#  Forked from souri-t on GitHub by mpk.
+#  Original source: https://github.com/souri-t/RemoteControl-RPI/blob/master/remote/bin/irrp
+#  <br>
+#  Typically a code will be made up of two or three distinct
+#  marks (carrier) and spaces (no carrier) of different lengths.
+#  Because of transmission and reception errors those pulses
+#  which should all be x microseconds long will have a variance
+#  around x (see "SequenceMatcher" in "irc_match").
+#  <br>
+#  This normalizer identifies the distinct pulses and takes the
+#  average of the lengths making up each distinct pulse.
+#  Marks and spaces are processed separately.
+#  This makes the eventual generation of IR signal sequences
+#  by the sender much more accurate.
+#  <pre>
+#  Input
+#
+#  M    S    M   S   M   S   M   S    M   S    M
+#  9000 4500 600 540 620 560 590 1660 620 1690 615
+#
+#  Distinct marks
+#
+#  9000                average 9000
+#  600 620 590 620 615 average  609
+#
+#  Distinct spaces
+#
+#  4500                average 4500
+#  540 560             average  550
+#  1660 1690           average 1675
+#
+#  Output
+#
+#  M    S    M   S   M   S   M   S    M   S    M
+#  9000 4500 609 550 609 550 609 1675 609 1675 609
+#  </pre>
+#  The first unprocessed width (in sequence order) opens a cluster of all unprocessed
+#  widths, which are similar to it. Because the similar widths are a contiguous range
+#  of the sorted widths, each cluster is found by a binary search instead of a scan
+#  over the whole sequence. The result is the same as of the original pairwise scan.
+#
+class SequenceNormalizer:
+	
+	## The maximum item value difference deviation (between 0.0 and 1.0 exclusive). Default: 0.15.
+	max_deviation = 0.15
+	
+	## True, if NumPy is used. Default: True, if NumPy is installed.
+	use_numpy = numpy != None
+	
+	## Allow verbose output to console. Default: False.
+	verbose = False
+	
+	## CONSTRUCTOR.
+	#
+	#  @param max_deviation The maximum item value difference deviation (between 0.0 and 1.0 exclusive). Default: 0.15.
+	#  @param verbose Allow verbose output to console. Default: False.
+	#  @param use_numpy Use NumPy, if it is installed. Default: True.
+	def __init__(self, max_deviation=0.15, verbose=False, use_numpy=True):
+		self.max_deviation = max_deviation
+		self.verbose = verbose
+		self.use_numpy = use_numpy and numpy != None
+	
+	## Normalize an IR signal sequence.
+	#
+	#  @param sequence The list of pulse/gap length values of an IR signal sequence.
+	#  @return The normalized sequence as a new list.
+	def normalize(self, sequence):
+		# Verbosely output the sequence before changes
+		if self.verbose: sys.stdout.write(f'Sequence before normalizing:\n{list(sequence)}\n\n')
+		# Normalize the marks and the spaces separately
+		result = list(sequence)
+		cluster = self.clusterArray if self.use_numpy else self.clusterList
+		result[0::2] = cluster(result[0::2])
+		result[1::2] = cluster(result[1::2])
+		# Verbosely output the sequence after changes
+		if self.verbose: sys.stdout.write(f'Sequence after normalizing:\n{result}\n\n')
+		return result
+	
+	## Normalize several sequences in one pass, so that the same widths get the same average values.
+	#  The sequences are joined in the given order, normalized and split again.
+	#
+	#  @param sequences The list of sequences.
+	#  @return The list of the normalized sequences.
+	def normalizeSequences(self, sequences):
+		joined_sequence = []
+		for sequence in sequences:
+			joined_sequence.extend(sequence)
+		joined_sequence = self.normalize(joined_sequence)
+		result = []
+		position = 0
+		for sequence in sequences:
+			result.append(joined_sequence[position:position + len(sequence)])
+			position += len(sequence)
+		return result
+	
+	## Normalize all sequences of a key in one pass.
+	#
+	#  @param key The Key object.
+	#  @return The normalized Key object.
+	def normalizeKey(self, key):
+		names = [name for name in Key.SEQUENCES if getattr(key, name) != None]
+		sequences = self.normalizeSequences([list(getattr(key, name)) for name in names])
+		data = key.toDict()
+		data.update(zip(names, sequences))
+		return Key.fromDict(key.name, data)
+	
+	## Normalize all keys of a device, e.g. of a whole data file.
+	#
+	#  @param device The Device object.
+	#  @return The normalized Device object.
+	def normalizeDevice(self, device):
+		keys = {key_name: self.normalizeKey(key) for key_name, key in device.keys.items()}
+		return Device.fromKeys(device.name, device.filepath, keys)
+	
+	## Get the tolerance factors of the similarity.
+	#  A width "w" is similar to "v", if "w * minimum < v < w * maximum".
+	#
+	#  @return A tuple of the minimum and maximum factor as float.
+	def getTolerance(self):
+		return float(1.0) - self.max_deviation, float(1.0) + self.max_deviation
+	
+	## Replace the widths by the average of their clusters using NumPy.
+	#
+	#  @param widths The list of the mark or space widths.
+	#  @return The list of the normalized widths.
+	def clusterArray(self, widths):
+		if len(widths) == 0:
+			return []
+		toler_min, toler_max = self.getTolerance()
+		values = numpy.asarray(widths, dtype=numpy.int64)
+		order = numpy.argsort(values, kind='stable')
+		lower = values[order] * toler_min
+		upper = values[order] * toler_max
+		remaining = numpy.ones(len(values), dtype=bool)
+		result = values.copy()
+		i = 0
+		while True:
+			# Find the next unprocessed width, which opens a cluster
+			unprocessed = numpy.flatnonzero(remaining[i:])
+			if len(unprocessed) == 0:
+				break
+			i += int(unprocessed[0])
+			v = int(values[i])
+			remaining[i] = False
+			# Find the similar unprocessed widths
+			members = order[numpy.searchsorted(upper, v, 'right'):numpy.searchsorted(lower, v, 'left')]
+			members = members[remaining[members]]
+			remaining[members] = False
+			# Set all similar widths to the average value
+			average = self.getAverage(v + int(values[members].sum()), 1 + len(members))
+			result[i] = average
+			result[members] = average
+		return result.tolist()
+	
+	## Replace the widths by the average of their clusters in pure Python.
+	#
+	#  @param widths The list of the mark or space widths.
+	#  @return The list of the normalized widths.
+	def clusterList(self, widths):
+		toler_min, toler_max = self.getTolerance()
+		order = sorted(range(len(widths)), key=widths.__getitem__)
+		lower = [widths[j] * toler_min for j in order]
+		upper = [widths[j] * toler_max for j in order]
+		remaining = [True] * len(widths)
+		result = list(widths)
+		for i in range(len(widths)):
+			# Each unprocessed width opens a cluster
+			if not remaining[i]:
+				continue
+			v = widths[i]
+			remaining[i] = False
+			# Find the similar unprocessed widths
+			members = [j for j in order[bisect.bisect_right(upper, v):bisect.bisect_left(lower, v)] if remaining[j]]
+			# Set all similar widths to the average value
+			average = self.getAverage(v + sum(widths[j] for j in members), 1 + len(members))
+			result[i] = average
+			for j in members:
+				remaining[j] = False
+				result[j] = average
+		return result
+	
+	## Calculate the average width of a cluster.
+	#
+	#  @param total The sum of the widths.
+	#  @param count The count of the widths.
+	#  @return The average width as integer.
+	@staticmethod
+	def getAverage(total, count):
+		return int(round(round(total / float(count), 2))) # mpk: Integer values needed in this program
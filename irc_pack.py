@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Pack.
+	A module to compile the IR remote control data files into a memory-mapped binary pack.
+	Copyright (C) 2026 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Pack.
+#  A module to compile the IR remote control data files into a memory-mapped binary pack.
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+
+import array
+import collections.abc
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+# Import project modules
+
+from irc_model import Key
+
+
+## A binary pack of all devices in the data directory, which is read via a memory map.
+#  <br>
+#  The JSON files stay the editable source. The pack is compiled from them and
+#  records the modification time and size of each JSON file, so it is rebuilt,
+#  when a JSON file is newer than the pack.
+#  <br>
+#  Each device has a duration alphabet, which is the sorted list of the distinct 
+#  durations of all its sequences. Each sequence is stored once per device, 
+#  addressed by the hash of its content, as an array of symbol indices into the 
+#  alphabet. The keys refer to their sequences by index of the sequence table.
+#  <br>
+#  Layout (little endian):
+#    * Header: magic, version, device count.
+#    * Device table: file name, key table, sequence table, alphabet and JSON file state per device.
+#    * Key tables: name, type, repeat count, repeat space, timeout space,
+#      4 sequence indexes (first, next, repetition_first, repetition_next) and
+#      IR protocol name, toggle bit, address and command per key.
+#    * Sequence tables: content hash, symbol offset, length and symbol size per sequence.
+#    * String area: UTF-8 encoded file names and key names.
+#    * Data area: The alphabets as uint32 arrays and the sequences as uint8 symbol 
+#      arrays (or uint16, if an alphabet has more than 256 durations).
+#
+class DevicePack:
+	
+	## Default file name of the pack in the data directory.
+	FILE_NAME = '.devices.pack'
+	
+	## Magic bytes at the begin of the pack.
+	MAGIC = b'IRCP'
+	
+	## Version of the pack layout.
+	VERSION = 3
+	
+	## Header: magic, version, reserved, device count, device table offset.
+	HEADER = struct.Struct('<4sHHII')
+	
+	## Device: file name offset, file name length, key count, key table offset, 
+	#  sequence count, sequence table offset, alphabet length, alphabet offset, 
+	#  JSON modification time in ns, JSON size.
+	DEVICE = struct.Struct('<IHHIHIHIqQ')
+	
+	## Key: name offset, name length, type, repeat count, repeat space, timeout space (-1 = None),
+	#  4 x sequence index (NO_SEQUENCE = None), IR protocol name offset, IR protocol name length (0 = raw),
+	#  toggle bit, address, command.
+	KEY = struct.Struct('<IHBHIi' + 'H'*4 + 'IBBII')
+	
+	## Sequence: content hash, symbol offset, length, symbol size in bytes.
+	SEQUENCE = struct.Struct('<8sIHB')
+	
+	## Sequence index of a missing sequence.
+	NO_SEQUENCE = 0xFFFF
+	
+	## Names of the sequences of a key in the order of the key record.
+	SEQUENCES = ('first', 'next', 'repetition_first', 'repetition_next')
+	
+	## Path of the pack file.
+	filepath = ''
+	
+	## The memory map of the pack file. Default: None.
+	map = None
+	
+	## The "memoryview" of the memory map. Default: None.
+	buffer = None
+	
+	## Count of the devices in the pack.
+	device_count = 0
+	
+	## Offset of the device table in the pack.
+	device_table = 0
+	
+	## CONSTRUCTOR. Memory-map an existing pack file.
+	#
+	#  @param filepath Path of the pack file.
+	#  @exception OSError The pack file cannot be opened.
+	#  @exception ValueError The file is not a pack of this version.
+	def __init__(self, filepath):
+		self.filepath = filepath
+		with open(filepath, 'rb') as file:
+			self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.buffer = memoryview(self.map)
+		if len(self.buffer) < self.HEADER.size:
+			raise ValueError(f'The pack "{filepath}" is truncated.')
+		magic, version, reserved, device_count, device_table = self.HEADER.unpack_from(self.buffer, 0)
+		if magic != self.MAGIC or version != self.VERSION:
+			raise ValueError(f'The file "{filepath}" is not a pack of version {self.VERSION}.')
+		self.device_count = device_count
+		self.device_table = device_table
+	
+	## Get the devices of this pack.
+	#
+	#  @param data_dir The path of the data directory to compose the file paths of the devices.
+	#  @return A list of tuples (filepath, (mtime_ns, size), keys) with the keys as read-only mapping (see "PackKeys").
+	def getDevices(self, data_dir):
+		devices = []
+		for i in range(self.device_count):
+			(
+				name_offset, name_length, key_count, key_table, sequence_count, sequence_table, 
+				alphabet_length, alphabet_offset, mtime_ns, size
+			) = self.DEVICE.unpack_from(self.buffer, self.device_table + i*self.DEVICE.size)
+			file_name = self.getString(name_offset, name_length)
+			alphabet = tuple(self.getArray(alphabet_offset, alphabet_length, 4))
+			devices.append((
+				os.path.join(data_dir, file_name), 
+				(mtime_ns, size), 
+				PackKeys(self, key_table, key_count, sequence_table, alphabet)
+			))
+		return devices
+	
+	## Read a string of the string area.
+	#
+	#  @param offset The offset of the string in the pack.
+	#  @param length The length of the UTF-8 encoded string in bytes.
+	#  @return The string.
+	def getString(self, offset, length):
+		return str(self.buffer[offset:offset + length], 'utf-8')
+	
+	## Read an array of unsigned integers of the data area.
+	#
+	#  @param offset The offset of the array in the pack.
+	#  @param length The count of the items.
+	#  @param size The item size in bytes (1, 2 or 4).
+	#  @return The array as "memoryview" of the memory map or as copy on big endian systems.
+	def getArray(self, offset, length, size):
+		view = self.buffer[offset:offset + length*size].cast({1: 'B', 2: 'H', 4: 'I'}[size])
+		if size > 1 and sys.byteorder != 'little':
+			# The pack is little endian. Copy and swap the bytes on big endian systems.
+			items = array.array(view.format, view)
+			items.byteswap()
+			return memoryview(items)
+		return view
+	
+	## Read a sequence of a sequence table.
+	#
+	#  @param sequence_table The offset of the sequence table of the device.
+	#  @param index The index of the sequence.
+	#  @param alphabet The duration alphabet of the device.
+	#  @return The sequence (see "PackSequence") or None, if the index is NO_SEQUENCE.
+	def getSequence(self, sequence_table, index, alphabet):
+		if index == self.NO_SEQUENCE:
+			return None
+		digest, offset, length, size = self.SEQUENCE.unpack_from(self.buffer, sequence_table + index*self.SEQUENCE.size)
+		return PackSequence(digest, self.getArray(offset, length, size), alphabet)
+	
+	## Compute the content hash of a sequence.
+	#
+	#  @param sequence The sequence of durations in microseconds.
+	#  @return The hash as 8 bytes.
+	@staticmethod
+	def hashSequence(sequence):
+		return hashlib.blake2b(array.array('I', sequence).tobytes(), digest_size=8).digest()
+	
+	## Compile devices to a pack file.
+	#  The file is written to a temporary file and replaced atomically,
+	#  so readers of the former pack keep their memory map.
+	#
+	#  @param filepath Path of the pack file.
+	#  @param devices A list of tuples (file_name, (mtime_ns, size), keys) with the keys as mapping
+	#  {key_name: Key} (see "irc_model.Key").
+	@classmethod
+	def write(cls, filepath, devices):
+		strings = bytearray()
+		data = bytearray()
+		# Encode the devices with offsets relative to their section
+		encoded_devices = []
+		for file_name, state, keys in devices:
+			# Collect the distinct sequences by content
+			sequences = {}
+			for key in keys.values():
+				for sequence_name in cls.SEQUENCES:
+					sequence = getattr(key, sequence_name)
+					if sequence != None:
+						sequences.setdefault(tuple(sequence), len(sequences))
+			if len(sequences) >= cls.NO_SEQUENCE:
+				raise ValueError(f'The device "{file_name}" has too many sequences.')
+			alphabet = sorted({duration for sequence in sequences for duration in sequence})
+			symbols = {duration: symbol for symbol, duration in enumerate(alphabet)}
+			symbol_size = 1 if len(alphabet) <= 0x100 else 2
+			# Data: The alphabet and the symbol arrays
+			data += bytes(-len(data) % 4)
+			alphabet_offset = len(data)
+			data += cls.packArray('I', alphabet)
+			sequence_records = []
+			for sequence in sequences:
+				data += bytes(-len(data) % symbol_size)
+				sequence_records.append((cls.hashSequence(sequence), len(data), len(sequence), symbol_size))
+				data += cls.packArray('B' if symbol_size == 1 else 'H', [symbols[duration] for duration in sequence])
+			key_records = []
+			for key_name, key in keys.items():
+				encoded = key_name.encode('utf-8')
+				key_records.append([
+					len(strings),
+					len(encoded),
+					key.type,
+					key.repeat_count or 0,
+					key.repeat_space or 0,
+					-1 if key.timeout_space == None else key.timeout_space
+				] + [
+					cls.NO_SEQUENCE if getattr(key, sequence_name) == None else sequences[tuple(getattr(key, sequence_name))] 
+					for sequence_name in cls.SEQUENCES
+				])
+				strings += encoded
+				# The IR protocol. Its sequences are stored too, so they are not synthesized again, when the pack is read.
+				encoded = (key.protocol or '').encode('utf-8')
+				key_records[-1] += [len(strings), len(encoded), key.toggle, key.address, key.command]
+				strings += encoded
+			encoded = file_name.encode('utf-8')
+			encoded_devices.append((len(strings), len(encoded), state, key_records, sequence_records, alphabet_offset, len(alphabet)))
+			strings += encoded
+		# Compose the sections
+		key_tables_offset = cls.HEADER.size + len(devices)*cls.DEVICE.size
+		sequence_tables_offset = key_tables_offset + cls.KEY.size*sum(len(device[3]) for device in encoded_devices)
+		strings_offset = sequence_tables_offset + cls.SEQUENCE.size*sum(len(device[4]) for device in encoded_devices)
+		data_offset = strings_offset + len(strings)
+		data_offset += -data_offset % 4
+		device_table = bytearray()
+		key_tables = bytearray()
+		sequence_tables = bytearray()
+		for name_offset, name_length, (mtime_ns, size), key_records, sequence_records, alphabet_offset, alphabet_length in encoded_devices:
+			device_table += cls.DEVICE.pack(
+				strings_offset + name_offset,
+				name_length,
+				len(key_records),
+				key_tables_offset + len(key_tables),
+				len(sequence_records),
+				sequence_tables_offset + len(sequence_tables),
+				alphabet_length,
+				data_offset + alphabet_offset,
+				mtime_ns,
+				size
+			)
+			for fields in key_records:
+				fields[0] += strings_offset
+				fields[10] += strings_offset
+				key_tables += cls.KEY.pack(*fields)
+			for digest, offset, length, symbol_size in sequence_records:
+				sequence_tables += cls.SEQUENCE.pack(digest, data_offset + offset, length, symbol_size)
+		header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, len(devices), cls.HEADER.size)
+		temporary_filepath = f'{filepath}.tmp'
+		with open(temporary_filepath, 'wb') as file:
+			file.write(header)
+			file.write(device_table)
+			file.write(key_tables)
+			file.write(sequence_tables)
+			file.write(strings)
+			file.write(bytes(data_offset - strings_offset - len(strings)))
+			file.write(data)
+		os.replace(temporary_filepath, filepath)
+	
+	## Pack unsigned integers to little endian bytes.
+	#
+	#  @param type_code The "array" type code.
+	#  @param items The unsigned integers.
+	#  @return The bytes.
+	@staticmethod
+	def packArray(type_code, items):
+		packed = array.array(type_code, items)
+		if sys.byteorder != 'little':
+			packed.byteswap()
+		return packed.tobytes()
+
+
+## A sequence of durations in a pack, which is encoded as symbols of the duration alphabet of its device.
+#  <br>
+#  It behaves like a read-only list of durations in microseconds. Two sequences 
+#  are compared by their content hash.
+#
+class PackSequence(collections.abc.Sequence):
+	
+	## The content hash as 8 bytes.
+	digest = b''
+	
+	## The symbol indices as "memoryview" of the memory map. Default: None.
+	symbols = None
+	
+	## The duration alphabet of the device. Default: None.
+	alphabet = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param digest The content hash.
+	#  @param symbols The symbol indices.
+	#  @param alphabet The duration alphabet of the device.
+	def __init__(self, digest, symbols, alphabet):
+		self.digest = digest
+		self.symbols = symbols
+		self.alphabet = alphabet
+	
+	## Get a duration or a list of durations.
+	#
+	#  @param index The index or slice.
+	#  @return The duration in microseconds or a list of durations.
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self.alphabet[symbol] for symbol in self.symbols[index]]
+		return self.alphabet[self.symbols[index]]
+	
+	## Iterate over the durations.
+	#
+	def __iter__(self):
+		alphabet = self.alphabet
+		for symbol in self.symbols:
+			yield alphabet[symbol]
+	
+	## Get the count of the durations.
+	#
+	def __len__(self):
+		return len(self.symbols)
+	
+	## Compare with another sequence.
+	#
+	#  @param other Another PackSequence (compared by hash) or a sequence of durations.
+	#  @return True, if the durations are equal.
+	def __eq__(self, other):
+		if isinstance(other, PackSequence):
+			return self.digest == other.digest
+		if isinstance(other, collections.abc.Sequence):
+			return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+		return NotImplemented
+	
+	## Get the hash of the content.
+	#
+	def __hash__(self):
+		return hash(self.digest)
+	
+	## Get the printable representation.
+	#
+	def __repr__(self):
+		return f'PackSequence({list(self)})'
+
+
+## A read-only mapping of the keys of a device in a pack {key_name: key}.
+#  <br>
+#  The keys are decoded on demand to Key objects (see "irc_model.Key")
+#  with the sequences as PackSequence objects.
+#
+class PackKeys(collections.abc.Mapping):
+	
+	## The pack. Default: None.
+	pack = None
+	
+	## Offset of the key table in the pack.
+	key_table = 0
+	
+	## Count of the keys.
+	key_count = 0
+	
+	## Offset of the sequence table in the pack.
+	sequence_table = 0
+	
+	## The duration alphabet of the device. Default: None.
+	alphabet = None
+	
+	## Dictionary of the offsets of the key records {key_name: offset}, which is built on first access. Default: None.
+	index = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param pack The DevicePack.
+	#  @param key_table Offset of the key table in the pack.
+	#  @param key_count Count of the keys.
+	#  @param sequence_table Offset of the sequence table in the pack.
+	#  @param alphabet The duration alphabet of the device.
+	def __init__(self, pack, key_table, key_count, sequence_table, alphabet):
+		self.pack = pack
+		self.key_table = key_table
+		self.key_count = key_count
+		self.sequence_table = sequence_table
+		self.alphabet = alphabet
+		self.index = None
+	
+	## Get the index of the key records.
+	#
+	#  @return The dictionary {key_name: offset}.
+	def getIndex(self):
+		if self.index == None:
+			index = {}
+			for i in range(self.key_count):
+				offset = self.key_table + i*DevicePack.KEY.size
+				name_offset, name_length = struct.unpack_from('<IH', self.pack.buffer, offset)
+				index[self.pack.getString(name_offset, name_length)] = offset
+			self.index = index
+		return self.index
+	
+	## Decode a key.
+	#
+	#  @param key_name The name of the key.
+	#  @return The Key object with the sequences as PackSequence objects.
+	#  @exception KeyError The key is not found.
+	def __getitem__(self, key_name):
+		fields = DevicePack.KEY.unpack_from(self.pack.buffer, self.getIndex()[key_name])
+		sequences = [self.pack.getSequence(self.sequence_table, fields[6 + i], self.alphabet) for i in range(len(DevicePack.SEQUENCES))]
+		return Key(
+			key_name,
+			fields[2],
+			*sequences,
+			repeat_count=fields[3],
+			repeat_space=fields[4],
+			timeout_space=None if fields[5] < 0 else fields[5],
+			protocol=self.pack.getString(fields[10], fields[11]) if fields[11] > 0 else None,
+			address=fields[13],
+			command=fields[14],
+			toggle=fields[12]
+		)
+	
+	## Iterate over the key names in the order of the JSON file.
+	#
+	def __iter__(self):
+		return iter(self.getIndex())
+	
+	## Get the count of the keys.
+	#
+	def __len__(self):
+		return self.key_count
+
+
+# MAIN PROGRAM
+if __name__ == '__main__':
+	# Compile the pack of a data directory. Default: The "data" sub folder of this program.
+	from irc_api import DeviceRegistry
+	data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+	registry = DeviceRegistry(data_dir, verbose=True, workers=None)
+	if not registry.compilePack():
+		sys.exit(1)
+	sys.stdout.write(f'The pack "{registry.pack_path}" is up to date.\n')
@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+
+"""
+	IRC Protocol.
+	A module to decode and synthesize the IR signal sequences of standard IR protocols.
+	Copyright (C) 2026 Michael Paul Korthals.
+
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	any later version.
+
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+	GNU General Public License for more details.
+
+	You should have received a copy of the GNU General Public License
+	along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+## IRC Protocol.
+#  A module to decode and synthesize the IR signal sequences of standard IR protocols.
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+# Import project modules
+
+from irc_match import SequenceMatcher
+
+
+## A frame of an IR signal, which is composed of the symbols of its protocol.
+#  <br>
+#  Each symbol (e.g. a header or a bit) is a tuple of durations in microseconds,
+#  where a mark (H-signal) is positive and a space (L-signal) is negative.
+#  The few distinct symbols of a protocol are shared by all its frames, so the
+#  sender needs only a small set of waves per protocol (see "irc_api.WaveCache").
+#
+class Frame(tuple):
+	
+	## Get the IR signal sequence of this frame.
+	#
+	#  @return The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds as list.
+	def toSequence(self):
+		sequence = []
+		mark = False
+		for symbol in self:
+			for duration in symbol:
+				if sequence and (duration > 0) == mark:
+					# Join the adjacent marks or spaces of the symbols
+					sequence[-1] += abs(duration)
+				else:
+					sequence.append(abs(duration))
+					mark = duration > 0
+		return sequence
+
+
+## A standard IR protocol, which encodes an address, a command and a toggle bit.
+#  <br>
+#  Frames start with a mark and end with a mark, like the recorded IR signal sequences.
+#
+class Protocol:
+	
+	## Name of the protocol in the JSON data files.
+	name = ''
+	
+	## True, if the protocol has a toggle bit, which alternates with each key press (double layer protocol).
+	has_toggle = False
+	
+	## Dictionary of the synthesized frames {(key_type, address, command, toggle): frames}. Default: None.
+	frames = None
+	
+	## CONSTRUCTOR.
+	#
+	def __init__(self):
+		self.frames = {}
+	
+	## Compose the frame of a key press.
+	#
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @param toggle The toggle bit as element of {0; 1}.
+	#  @return The Frame object.
+	def getFrame(self, address, command, toggle):
+		raise NotImplementedError()
+	
+	## Compose the frame, which is repeated as long as the key is pressed.
+	#
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @param toggle The toggle bit as element of {0; 1}.
+	#  @return The Frame object.
+	def getRepetitionFrame(self, address, command, toggle):
+		return self.getFrame(address, command, toggle)
+	
+	## Decode the address, the command and the toggle bit of an IR signal sequence.
+	#  The result must be verified by synthesizing the sequence again (see "ProtocolDecoder").
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @return A tuple of the address, the command and the toggle bit or None, if it is not a frame of this protocol.
+	def decode(self, sequence):
+		raise NotImplementedError()
+	
+	## Get the frames of a key, which the sender uses for its protocol type (see "irc_model.Key").
+	#
+	#  @param key_type The protocol type of the key as element of {0 = single shot; 1 = single layer; 2 = double layer}.
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @param toggle The toggle bit of the first key press as element of {0; 1}.
+	#  @return A dictionary of the frames {"first", "next", "repetition_first", "repetition_next"} (None, if unused).
+	#  @exception ValueError The protocol type is not supported by this protocol.
+	def getFrames(self, key_type, address, command, toggle):
+		cache_key = (key_type, address, command, toggle)
+		frames = self.frames.get(cache_key)
+		if frames == None:
+			frames = dict.fromkeys(('first', 'next', 'repetition_first', 'repetition_next'))
+			frames['first'] = self.getFrame(address, command, toggle)
+			if key_type == 0:
+				# Single shot protocol: The sender uses the first frame only
+				frames['repetition_first'] = frames['first']
+			elif key_type == 1:
+				frames['repetition_first'] = self.getRepetitionFrame(address, command, toggle)
+			elif key_type == 2 and self.has_toggle:
+				frames['next'] = self.getFrame(address, command, 1 - toggle)
+				frames['repetition_first'] = self.getRepetitionFrame(address, command, toggle)
+				frames['repetition_next'] = self.getRepetitionFrame(address, command, 1 - toggle)
+			else:
+				raise ValueError(f'The protocol "{self.name}" does not support the protocol type {key_type}.')
+			self.frames[cache_key] = frames
+		return frames
+	
+	## Compose a frame from symbols. The final space is removed, because frames end with a mark.
+	#
+	#  @param symbols The list of symbols.
+	#  @return The Frame object.
+	@staticmethod
+	def makeFrame(symbols):
+		if symbols[-1][-1] < 0:
+			symbols[-1] = symbols[-1][:-1]
+		return Frame(symbol for symbol in symbols if symbol)
+	
+	## Compose the bits of a value.
+	#
+	#  @param value The value.
+	#  @param count The count of bits.
+	#  @param lsb_first True, if the least significant bit is sent first.
+	#  @return The list of the bits as element of {0; 1}.
+	@staticmethod
+	def getBits(value, count, lsb_first):
+		bits = [(value >> i) & 1 for i in range(count)]
+		return bits if lsb_first else bits[::-1]
+	
+	## Compose a value of bits.
+	#
+	#  @param bits The list of the bits as element of {0; 1}.
+	#  @param lsb_first True, if the least significant bit has been sent first.
+	#  @return The value.
+	@staticmethod
+	def getValue(bits, lsb_first):
+		value = 0
+		for bit in (bits[::-1] if lsb_first else bits):
+			value = (value << 1) | bit
+		return value
+	
+	## Check roughly if a duration is near its nominal value (the exact check is done by "ProtocolDecoder").
+	#
+	#  @param duration The duration in microseconds.
+	#  @param nominal The nominal duration in microseconds.
+	#  @return True, if the duration deviates less than 25% from its nominal value.
+	@staticmethod
+	def isNear(duration, nominal):
+		return abs(duration - nominal) < 0.25*nominal
+
+
+## A pulse distance protocol, where a bit is a mark followed by a short (0) or long (1) space.
+#
+class PulseDistanceProtocol(Protocol):
+	
+	## Header mark and space in microseconds.
+	header = (0, 0)
+	
+	## Mark of a bit and of the trailer in microseconds.
+	bit_mark = 0
+	
+	## Space of a 0 bit in microseconds.
+	zero_space = 0
+	
+	## Space of a 1 bit in microseconds.
+	one_space = 0
+	
+	## Count of the bits of a frame.
+	bit_count = 0
+	
+	## Compose the bits of the frame as integer.
+	#
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @return The bits as integer, the first bit sent as least significant bit.
+	def encodeValue(self, address, command):
+		raise NotImplementedError()
+	
+	## Decompose the bits of the frame.
+	#
+	#  @param value The bits as integer, the first bit sent as least significant bit.
+	#  @return A tuple of the address and the command or None, if the bits are invalid.
+	def decodeValue(self, value):
+		raise NotImplementedError()
+	
+	## Compose the frame of a key press.
+	#
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @param toggle Unused.
+	#  @return The Frame object.
+	def getFrame(self, address, command, toggle): #@UnusedVariable
+		symbols = [(self.header[0], -self.header[1])]
+		for bit in self.getBits(self.encodeValue(address, command), self.bit_count, True):
+			symbols.append((self.bit_mark, -(self.one_space if bit else self.zero_space)))
+		symbols.append((self.bit_mark,))
+		return self.makeFrame(symbols)
+	
+	## Decode the address and the command of an IR signal sequence.
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @return A tuple of the address, the command and the toggle bit 0 or None.
+	def decode(self, sequence):
+		if len(sequence) != 2*self.bit_count + 3:
+			return None
+		if not (self.isNear(sequence[0], self.header[0]) and self.isNear(sequence[1], self.header[1])):
+			return None
+		threshold = (self.zero_space + self.one_space) / 2
+		bits = [int(space > threshold) for space in sequence[3:-1:2]]
+		decoded = self.decodeValue(self.getValue(bits, True))
+		if decoded == None:
+			return None
+		return decoded + (0,)
+
+
+## The NEC protocol with 8 bit or 16 bit (extended NEC) address and 8 bit command.
+#  The repetition frame is the short NEC repeat code.
+#
+class NecProtocol(PulseDistanceProtocol):
+	
+	name = 'nec'
+	
+	header = (9000, 4500)
+	
+	bit_mark = 562
+	
+	zero_space = 562
+	
+	one_space = 1687
+	
+	bit_count = 32
+	
+	## Header mark and space of the repeat code in microseconds.
+	repeat_header = (9000, 2250)
+	
+	## Compose the bits of the frame: address, inverted address (or the high address byte), command, inverted command.
+	#
+	#  @param address The address of the device (8 or 16 bit).
+	#  @param command The command of the key (8 bit).
+	#  @return The bits as integer.
+	def encodeValue(self, address, command):
+		if address > 0xFF:
+			value = address & 0xFFFF
+		else:
+			value = address | ((address ^ 0xFF) << 8)
+		return value | (command << 16) | ((command ^ 0xFF) << 24)
+	
+	## Decompose the bits of the frame.
+	#
+	#  @param value The bits as integer.
+	#  @return A tuple of the address and the command or None, if the command is not followed by its inverted bits.
+	def decodeValue(self, value):
+		command = (value >> 16) & 0xFF
+		if (value >> 24) != command ^ 0xFF:
+			return None
+		address = value & 0xFF
+		if (value >> 8) & 0xFF != address ^ 0xFF:
+			# Extended NEC
+			address = value & 0xFFFF
+		return address, command
+	
+	## Compose the repeat code.
+	#
+	#  @param address Unused.
+	#  @param command Unused.
+	#  @param toggle Unused.
+	#  @return The Frame object.
+	def getRepetitionFrame(self, address, command, toggle): #@UnusedVariable
+		return self.makeFrame([(self.repeat_header[0], -self.repeat_header[1]), (self.bit_mark,)])
+
+
+## The Kaseikyo protocol (e.g. Panasonic) with 16 bit vendor code, 12 bit address and 8 bit command.
+#  The address of this protocol is composed as (vendor << 12) | address.
+#
+class KaseikyoProtocol(PulseDistanceProtocol):
+	
+	name = 'kaseikyo'
+	
+	header = (3456, 1728)
+	
+	bit_mark = 432
+	
+	zero_space = 432
+	
+	one_space = 1296
+	
+	bit_count = 48
+	
+	## Compose the 6 bytes of the frame: vendor, vendor parity and address, address, command, parity.
+	#
+	#  @param address The vendor code and address as (vendor << 12) | address.
+	#  @param command The command of the key (8 bit).
+	#  @return The bits as integer.
+	def encodeValue(self, address, command):
+		vendor = (address >> 12) & 0xFFFF
+		vendor_parity = vendor ^ (vendor >> 8)
+		vendor_parity = (vendor_parity ^ (vendor_parity >> 4)) & 0xF
+		byte2 = vendor_parity | ((address & 0xF) << 4)
+		byte3 = (address >> 4) & 0xFF
+		byte4 = command & 0xFF
+		return vendor | (byte2 << 16) | (byte3 << 24) | (byte4 << 32) | ((byte2 ^ byte3 ^ byte4) << 40)
+	
+	## Decompose the bits of the frame.
+	#
+	#  @param value The bits as integer.
+	#  @return A tuple of the address and the command or None, if a parity is wrong.
+	def decodeValue(self, value):
+		vendor = value & 0xFFFF
+		address = ((value >> 16) & 0xF0) >> 4 | ((value >> 24) & 0xFF) << 4
+		command = (value >> 32) & 0xFF
+		if self.encodeValue((vendor << 12) | address, command) != value:
+			return None
+		return (vendor << 12) | address, command
+
+
+## The Sony SIRC protocol with 7 bit command and 5 bit (12 bits), 8 bit (15 bits) or 13 bit (20 bits) address.
+#  A bit is a space followed by a short (0) or long (1) mark.
+#
+class SonyProtocol(Protocol):
+	
+	## Header mark in microseconds.
+	header_mark = 2400
+	
+	## Space of a bit in microseconds.
+	bit_space = 600
+	
+	## Mark of a 0 bit in microseconds.
+	zero_mark = 600
+	
+	## Mark of a 1 bit in microseconds.
+	one_mark = 1200
+	
+	## Count of the command bits.
+	command_bits = 7
+	
+	## Count of the address bits.
+	address_bits = 5
+	
+	## CONSTRUCTOR.
+	#
+	#  @param address_bits The count of the address bits as element of {5; 8; 13}.
+	def __init__(self, address_bits):
+		Protocol.__init__(self)
+		self.address_bits = address_bits
+		self.name = f'sony{self.command_bits + address_bits}'
+	
+	## Compose the frame of a key press.
+	#
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @param toggle Unused.
+	#  @return The Frame object.
+	def getFrame(self, address, command, toggle): #@UnusedVariable
+		bits = self.getBits(command, self.command_bits, True) + self.getBits(address, self.address_bits, True)
+		return self.makeFrame([(self.header_mark,)] + [(-self.bit_space, self.one_mark if bit else self.zero_mark) for bit in bits])
+	
+	## Decode the address and the command of an IR signal sequence.
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @return A tuple of the address, the command and the toggle bit 0 or None.
+	def decode(self, sequence):
+		if len(sequence) != 2*(self.command_bits + self.address_bits) + 1 or not self.isNear(sequence[0], self.header_mark):
+			return None
+		threshold = (self.zero_mark + self.one_mark) / 2
+		bits = [int(mark > threshold) for mark in sequence[2::2]]
+		return self.getValue(bits[self.command_bits:], True), self.getValue(bits[:self.command_bits], True), 0
+
+
+## A bi-phase (Manchester) protocol, where each bit consists of two half bits of opposite levels.
+#
+class BiphaseProtocol(Protocol):
+	
+	## Duration of a half bit in microseconds.
+	unit = 0
+	
+	## Maximum count of half bits of a mark or space.
+	max_units = 2
+	
+	## Convert an IR signal sequence to the levels of its half bits.
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @param leading_space True, if the frame starts with a half bit space, which is not recorded.
+	#  @param length The count of the half bits of the frame.
+	#  @return The list of the levels as element of {0; 1} or None, if the durations are no multiples of the half bit.
+	def getLevels(self, sequence, leading_space, length):
+		levels = [0] if leading_space else []
+		for i, duration in enumerate(sequence):
+			units = int(round(duration / self.unit))
+			if units < 1 or units > self.max_units:
+				return None
+			levels += [1 - (i & 1)]*units
+		# The final half bit space is not recorded
+		if len(levels) == length - 1:
+			levels.append(0)
+		return levels if len(levels) == length else None
+	
+	## Decode the bits of half bit pairs.
+	#
+	#  @param levels The list of the levels.
+	#  @param one The pair of levels of a 1 bit.
+	#  @return The list of the bits or None, if a pair has equal levels.
+	@staticmethod
+	def getPairBits(levels, one):
+		bits = []
+		for i in range(0, len(levels), 2):
+			pair = (levels[i], levels[i + 1])
+			if pair[0] == pair[1]:
+				return None
+			bits.append(int(pair == one))
+		return bits
+
+
+## The Philips RC5 protocol with 5 bit address, 7 bit command and toggle bit.
+#  The second start bit is the inverted 7th command bit (extended RC5).
+#  A 1 bit is a space followed by a mark.
+#
+class Rc5Protocol(BiphaseProtocol):
+	
+	name = 'rc5'
+	
+	has_toggle = True
+	
+	unit = 889
+	
+	## Count of the half bits of a frame.
+	length = 28
+	
+	## Compose the bits of a frame.
+	#
+	#  @param address The address of the device (5 bit).
+	#  @param command The command of the key (7 bit).
+	#  @param toggle The toggle bit.
+	#  @return The list of the bits.
+	def encodeBits(self, address, command, toggle):
+		return [1, 1 - ((command >> 6) & 1), toggle] + self.getBits(address, 5, False) + self.getBits(command & 0x3F, 6, False)
+	
+	## Decompose the bits of a frame.
+	#
+	#  @param bits The list of the bits.
+	#  @return A tuple of the address, the command and the toggle bit.
+	def decodeBits(self, bits):
+		return self.getValue(bits[3:8], False), ((1 - bits[1]) << 6) | self.getValue(bits[8:14], False), bits[2]
+	
+	## Compose the symbols of the bits.
+	#
+	#  @param bits The list of the bits.
+	#  @return The list of the symbols.
+	def getBitSymbols(self, bits):
+		return [(-self.unit, self.unit) if bit else (self.unit, -self.unit) for bit in bits]
+	
+	## Compose the frame of a key press. The leading space of the first start bit is not sent.
+	#
+	#  @param address The address of the device.
+	#  @param command The command of the key.
+	#  @param toggle The toggle bit.
+	#  @return The Frame object.
+	def getFrame(self, address, command, toggle):
+		symbols = self.getBitSymbols(self.encodeBits(address, command, toggle))
+		symbols[0] = (self.unit,)
+		return self.makeFrame(symbols)
+	
+	## Decode the address, the command and the toggle bit of an IR signal sequence.
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @return A tuple of the address, the command and the toggle bit or None.
+	def decode(self, sequence):
+		levels = self.getLevels(sequence, True, self.length)
+		if levels == None:
+			return None
+		bits = self.getPairBits(levels, (0, 1))
+		if bits == None or bits[0] != 1:
+			return None
+		return self.decodeBits(bits)
+
+
+## The extended RC5 protocol of Marantz with 5 bit address, 7 bit command, 6 bit extension and toggle bit.
+#  A pause of 4 half bits follows the address. The command of this protocol is composed as (command << 6) | extension.
+#
+class Rc5xProtocol(Rc5Protocol):
+	
+	name = 'rc5x'
+	
+	## Count of the half bits of a frame.
+	length = 44
+	
+	## Count of the half bits of the pause after the address.
+	pause = 4
+	
+	## Maximum count of half bits of a mark or space, where the pause joins the spaces of its neighbor half bits.
+	max_units = 2 + 4
+	
+	## Compose the bits of a frame.
+	#
+	#  @param address The address of the device (5 bit).
+	#  @param command The command and extension of the key as (command << 6) | extension.
+	#  @param toggle The toggle bit.
+	#  @return The list of the bits.
+	def encodeBits(self, address, command, toggle):
+		return Rc5Protocol.encodeBits(self, address, command >> 6, toggle) + self.getBits(command & 0x3F, 6, False)
+	
+	## Decompose the bits of a frame.
+	#
+	#  @param bits The list of the bits.
+	#  @return A tuple of the address, the command and the toggle bit.
+	def decodeBits(self, bits):
+		address, command, toggle = Rc5Protocol.decodeBits(self, bits)
+		return address, (command << 6) | self.getValue(bits[14:20], False), toggle
+	
+	## Compose the symbols of the bits with the pause after the address.
+	#
+	#  @param bits The list of the bits.
+	#  @return The list of the symbols.
+	def getBitSymbols(self, bits):
+		symbols = Rc5Protocol.getBitSymbols(self, bits)
+		return symbols[0:8] + [(-self.pause*self.unit,)] + symbols[8:]
+	
+	## Decode the address, the command and the toggle bit of an IR signal sequence.
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @return A tuple of the address, the command and the toggle bit or None.
+	def decode(self, sequence):
+		levels = self.getLevels(sequence, True, self.length)
+		if levels == None or levels[16:16 + self.pause] != [0]*self.pause:
+			return None
+		bits = self.getPairBits(levels[0:16] + levels[16 + self.pause:], (0, 1))
+		if bits == None or bits[0] != 1:
+			return None
+		return self.decodeBits(bits)
+
+
+## The Philips RC6 protocol (mode 0) with 8 bit address, 8 bit command and toggle bit.
+#  A 1 bit is a mark followed by a space. The toggle bit lasts twice as long.
+#
+class Rc6Protocol(BiphaseProtocol):
+	
+	name = 'rc6'
+	
+	has_toggle = True
+	
+	unit = 444
+	
+	max_units = 6
+	
+	## Leader mark and space in half bits.
+	leader = (6, 2)
+	
+	## Count of the half bits of a frame: leader, start bit, 3 mode bits, toggle bit, 16 data bits.
+	length = 8 + 2 + 6 + 4 + 32
+	
+	## Compose the frame of a key press.
+	#
+	#  @param address The address of the device (8 bit).
+	#  @param command The command of the key (8 bit).
+	#  @param toggle The toggle bit.
+	#  @return The Frame object.
+	def getFrame(self, address, command, toggle):
+		unit = self.unit
+		symbols = [(self.leader[0]*unit, -self.leader[1]*unit), (unit, -unit)]
+		symbols += [(-unit, unit)]*3
+		symbols.append((2*unit, -2*unit) if toggle else (-2*unit, 2*unit))
+		for bit in self.getBits(address, 8, False) + self.getBits(command, 8, False):
+			symbols.append((unit, -unit) if bit else (-unit, unit))
+		return self.makeFrame(symbols)
+	
+	## Decode the address, the command and the toggle bit of an IR signal sequence.
+	#
+	#  @param sequence The IR signal sequence [H-signal, L-signal, ..., H-signal] in microseconds.
+	#  @return A tuple of the address, the command and the toggle bit or None.
+	def decode(self, sequence):
+		levels = self.getLevels(sequence, False, self.length)
+		if levels == None or levels[0:10] != [1]*6 + [0]*2 + [1, 0] or levels[10:16] != [0, 1]*3:
+			return None
+		toggle = levels[16:20]
+		if toggle not in ([1, 1, 0, 0], [0, 0, 1, 1]):
+			return None
+		bits = self.getPairBits(levels[20:], (1, 0))
+		if bits == None:
+			return None
+		return self.getValue(bits[0:8], False), self.getValue(bits[8:16], False), toggle[0]
+
+
+## The supported protocols by name.
+PROTOCOLS = {protocol.name: protocol for protocol in (
+	NecProtocol(),
+	KaseikyoProtocol(),
+	SonyProtocol(5),
+	SonyProtocol(8),
+	SonyProtocol(13),
+	Rc5Protocol(),
+	Rc5xProtocol(),
+	Rc6Protocol()
+)}
+
+
+## A decoder, which recognizes the protocol of the recorded IR signal sequences of a key.
+#  <br>
+#  A protocol is only accepted, if the sequences synthesized from the decoded
+#  address, command and toggle bit are similar to all recorded sequences, which the
+#  sender uses. Otherwise the key is kept as raw IR signal sequences.
+#
+class ProtocolDecoder:
+	
+	## The matcher of the IR signal sequences. Default: None.
+	matcher = None
+	
+	## CONSTRUCTOR.
+	#
+	#  @param max_deviation The maximum item value difference deviation. Default: 0.15.
+	def __init__(self, max_deviation=0.15):
+		self.matcher = SequenceMatcher(max_deviation)
+	
+	## Recognize the protocol of a key.
+	#
+	#  @param data The dictionary of the key data with the sequences (see "irc_model.Key.fromDict").
+	#  @return The dictionary of the key data with protocol, address, command and toggle instead
+	#  of the sequences or None, if no protocol has been recognized.
+	def decodeKey(self, data):
+		first = data.get('first')
+		if not first or data.get('protocol') != None:
+			return None
+		for protocol in PROTOCOLS.values():
+			decoded = protocol.decode(first)
+			if decoded == None:
+				continue
+			address, command, toggle = decoded
+			try:
+				frames = protocol.getFrames(data['type'], address, command, toggle)
+			except ValueError:
+				continue
+			if self.isSimilarKey(data, frames):
+				compact = {name: value for name, value in data.items() if name not in frames}
+				compact.update({'protocol': protocol.name, 'address': address, 'command': command, 'toggle': toggle})
+				return compact
+		return None
+	
+	## Check if the recorded sequences of a key are similar to the synthesized frames.
+	#
+	#  @param data The dictionary of the key data with the sequences.
+	#  @param frames The dictionary of the frames (see "Protocol.getFrames").
+	#  @return True, if all sequences, which the sender uses, are similar.
+	def isSimilarKey(self, data, frames):
+		names = ['first']
+		if data['type'] >= 1 and data.get('repeat_count', 0) > 0:
+			names.append('repetition_first')
+		if data['type'] == 2:
+			names.append('next')
+			if data.get('repeat_count', 0) > 0:
+				names.append('repetition_next')
+		for name in names:
+			sequence = data.get(name)
+			if not sequence or not self.matcher.isSimilarPair(sequence, frames[name].toSequence()):
+				return False
+		return True
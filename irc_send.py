@@ -30,8 +30,6 @@
 # Import Python language packages
 
 import argparse
-import datetime
-import json
 import os
 import platform
 import sys
@@ -42,73 +40,12 @@ import time
 # ENABLE REMOTE DEBUGGING IN ECLIPSE DEVELOPING ENVIRONMENT:
 # Remote debug service is available on the development workstation at port 5678".
 # Start this program on the remote system with parameter "--db" or "--debug" as last parameter.
-# 
-# SOURCE SYNCHRONISATION:
-# While developing, use WinSCP on development workstation to permanently keep 
-# the development folder on the target Linux test machine up-to-date.
-#
-#
-# IN CASE OF FAILURE:
-#    * Close Eclipse.
-#    * Delete the folder "<workspace>/.metadata/.plugins/org.eclipse.e4.workbench",
-#      where "<workspace>" is the folder of your Eclipse workspace.
-#        * This will reinitialize your Eclipse workbench settings.
-#		 * WARNING: Do this only, if you have you have eliminated all other problems.
-#    * Open Eclipse.
-#    * Ensure that the "PyDev plug-in" for Eclipse is installed and up-to-date
-#      on the development workstation and the "PyDev" menu item is visible
-#      in the "Debug" perspective.
-#        * See [Menu] -> Help -> Eclipse Marketplace -> Installed.
-#    * Ensure the the "pydevd" is installed on the test machine:
-#        * # pip show pydevd
-#        * # pip install pydevd==
-#        * It is recommended to update it, if a newer version is available.
-#            * # pip install pydevd --upgrade
-#    * Set the perspective in the upper right corner in Eclipse:
-#        * Select the "PyDev" perspective (blue snake icon).
-#        * Open the Python file, which will be debugged.
-#        * Select the "Debug" perspective (green bug icon).
-#    * Start the remote debugging server via [Menu] -> PyDev -> Start Debug Server
-#    * Ensure that all the remote debugging data are up to date and valid:
-#        * The source folders (local and remote)
-#            * See below: "MY_PATHS_FROM_ECLIPSE_TO_PYTHON". ESSENTIAL!!!
-#        * The port forwarding rules on the network components between
-#          the test machine and the development workstation, if any.
-#        * The environment variable "DEBUG_HOSTNAME" in the 
-#          login shell of the test user and root user on the test machine. ESSENTIAL!!!        
-#    * Start the script which will be debugged on the remote test machine.
-#    * Wait ~15 seconds until the script execution will stop at the 
-#      first code line after the "pydevd.settrace( ... )" command (see below).
-#      SUCCESS!!!
-#    * Finally debug the script. 
+# See "irc_debug.py" how to set up the remote debugging.
 # 
 if len(sys.argv) >= 2 and sys.argv[-1] in ['-db', '--debug']:
-	# Append PydDev remote debugger
-	# Import the PyDev remote debugger
-	import pydevd 
-	from pydevd_file_utils import setup_client_server_paths
-	import socket 
-	# Configure the Eclipse project path 
-	# on the Windows Development Workstation within the "eclipse-workspace" folder
-	# and on the remote test machine 
-	# exactly in this order and all paths must be absolute:
-	hostname = socket.gethostname()
-	MY_PATHS_FROM_ECLIPSE_TO_PYTHON = [
-		(
-			f'C:\\Users\\Paul\\eclipse-workspace\\{hostname}-irrcd', # local (development workstation)
-			f'/home/pi/eclipse-workspace/{hostname}-irrcd'  # remote (test machine)
-		)
-	]
-	debug_hostname = os.environ['DEBUG_HOSTNAME'] # The localhost IP address on which the debug server is listening 
-	if debug_hostname == None: debug_hostname = 'unknown_host'
-	debug_port = 5678 # The TCP/IP port on which the debug server is listening
-	# Enable remote debugging 
-	setup_client_server_paths(MY_PATHS_FROM_ECLIPSE_TO_PYTHON)	
-	try: 
-		pydevd.settrace(debug_hostname, port=debug_port, stdoutToServer=True, stderrToServer=True)
-	except:
-		print(f'ERROR: Cannot connect to debugger at "tcp://{debug_hostname}:{debug_port}".')
-		sys.exit(1)
+	# Import the PyDev remote debugger bootstrap only in "debug" mode
+	from irc_debug import enableRemoteDebugging
+	enableRemoteDebugging()
 
 #*****************************************************************************************************
 
@@ -120,12 +57,12 @@ try:
 except:
 	sys.stdout.write('ERROR: The PyPi package "pigpio" is missing. Execute "pip install pigpio" to install it.\n\n')
 	sys.exit(65)
-	
-try:
-	import subprocess 
-except:
-	print('ERROR: Cannot find library "subprocess".\nExecute "pip install subprocess" to setup it.')
-	sys.exit(65)
+
+# Import project modules
+
+from irc_api import CarrierEngine, ChainCompiler, RemoteControlClient, ToggleStateStore, WaveCache, WaveTransmitter
+from irc_env import EnvironmentProbe
+from irc_model import Device
 
 
 ## A class to send IR remote control codes from Raspberry Pi.
@@ -138,6 +75,18 @@ class IRCSenderProgram:
 	## The Raspberry Pi GPIO control object. Default: None.
 	pi = None
 	
+	## The engine to compose the carrier square wave data. Default: None.
+	carrier_engine = None
+	
+	## The cache of the waves in "pigpiod". Default: None.
+	wave_cache = None
+	
+	## The compiler of the wave chains. Default: None.
+	chain_compiler = None
+	
+	## The transmitter of the wave chains. Default: None.
+	transmitter = None
+	
 	## CONSTRUCTOR.
 	#
 	def __init__(self):
@@ -194,6 +143,8 @@ EXAMPLE:
 --------
 1) Send on GPIO port 17 and go to the menu of the iiyama monitor prolite tf3238msc and increase the volume by 3 levels. This device requires the double layer protocol.
 $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --key_names "menu down ok down down down ok right right right menu"
+2) Send on GPIO port 17 and increase the volume of the Marantz AV receiver by 10 levels at once.
+$ ./irc_send.py --gpio 17 --input data/marantz_av_receiver_nr1711.json --key_names "volume_up*10"
 			"""
 		)
 		# Define the arguments
@@ -239,7 +190,7 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 		parser.add_argument(
 			'-kn', 
 			'--key_names', 
-			help='Define the infrared remote control key names to send. I case of an empty string, the list of key names will be displayed. Nithing will be sent.',
+			help='Define the infrared remote control key names to send. A key name with the suffix "*N" (e.g. "volume_up*10") is pressed N times in a single wave chain. I case of an empty string, the list of key names will be displayed. Nithing will be sent.',
 			required=True, 
 			type=str
 		)
@@ -277,6 +228,19 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 			type=int, 
 			default=32000
 		)
+		parser.add_argument(
+			'-sa', 
+			'--standalone', 
+			help='Send the keys by this program, even if a daemon is running.', 
+			action='store_true'
+		)
+		parser.add_argument(
+			'-sp', 
+			'--socket_path', 
+			help=f'Define the path of the Unix domain socket of the "irc_daemon.py". If the daemon is running and serves the input file, the keys are forwarded to it. Default: "{RemoteControlClient.SOCKET_PATH}".', 
+			type=str, 
+			default=RemoteControlClient.SOCKET_PATH
+		)
 		parser.add_argument(
 			'-ts', 
 			'--timeout_space', 
@@ -296,6 +260,8 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 		except argparse.ArgumentError:
 			sys.stdout.write(f'ERROR: Wrong or missing command line arguments.\nCall "./{os.path.basename(sys.argv[0])} -h | --help" to see how to handle the syntax.\n')
 			sys.exit(22) # 22 = Invalid argument
+		# Compose the carrier pulse trains from templates
+		self.carrier_engine = CarrierEngine()
 		# Technical checks
 		os_name = os.name
 		pf_name = platform.system()
@@ -303,45 +269,25 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 			sys.stdout.write(f'ERROR: This program does not run on "{os_name}/{pf_name}". Run it on "posix\Linux" only.')
 			sys.exit(1) # 1 = Operation not permitted
 		if not self.args.bypass_checks: 
+			# Probe the system only, if it has been changed since the last launch
+			environment = EnvironmentProbe().probe()
 			# RELEASE: Get the Linux version code name
-			command = 'cat /etc/*-release 2>/dev/null';
-			p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, universal_newlines=True)
-			std_out = p.communicate()[0].strip()
-			rc = p.returncode
-			id_like = 'unknown'
-			distribution_id = "unknown"
-			version_id = 'unknown'
-			version_codename = 'unknown'
-			if rc != 0:
-				sys.stdout.write(f'WARNING: Cannot determine the system OS release information (return code {rc}).\n')
-			else:
-				items = std_out.replace('"','').split('\n')
-				find0 = 'ID_LIKE='
-				find1 = 'ID='
-				find2 = 'VERSION_ID='
-				find3 = 'VERSION_CODENAME='
-				for item in items:
-					if item.startswith(find0): 
-						id_like = item.replace(find0, '').strip().lower()
-					elif item.startswith(find1): 
-						distribution_id = item.replace(find1, '').strip().lower()
-					elif item.startswith(find2):
-						version_id = item.replace(find2, '').strip().lower()
-					elif item.startswith(find3):
-						version_codename = item.replace(find3, '').strip().lower()
+			id_like = environment['id_like']
+			distribution_id = environment['distribution_id']
+			version_id = environment['version_id']
+			version_codename = environment['version_codename']
+			if not environment['release_found']:
+				sys.stdout.write(f'WARNING: Cannot determine the system OS release information.\n')
 			if self.args.verbose: sys.stdout.write(f'Linux distribution is: {id_like}/{distribution_id} {version_id} ({version_codename})\n')
 			if id_like != 'debian' or distribution_id != 'raspbian':
 				sys.stdout.write(f'ERROR: This program is not running on Linux distributions like "{id_like}/{distribution_id}".\nIt is designed for "debian/raspbian" distribution on Raspberry Pi hardware only.\n')
 				sys.exit(1) # 1 = Operation not permitted
-			# DEPENDENCY: Check if LIRC is installed (this will take a while)
-			command = 'apt -qq list lirc 2>/dev/null'
-			p = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, universal_newlines=True)
-			std_out = p.communicate()[0].strip()
-			rc = p.returncode
+			# DEPENDENCY: Check if LIRC is installed
+			rc = environment['lirc_rc']
 			if rc != 0:
 				sys.stdout.write(f'ERROR: Cannot determine that LIRC is installed on this system (return code {rc}).\n')
 				sys.exit(1) # 1 = Operation not permitted
-			if not std_out.endswith('[installed]'):
+			if not environment['lirc_installed']:
 				sys.stdout.write(f'ERROR: LIRC is not installed on this system.\nExecute "sudo apt install lirc" to install it.\nYou must follow to the system-specific LIRC setup instructions\nfor "{distribution_id} {version_codename}".\n\n')
 				sys.exit(65) # 65 = package not installed
 			if self.args.verbose: sys.stdout.write('LIRC is installed on this system.\n\n')
@@ -350,6 +296,11 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 	#
 	#  @return The exit code as integer, which is 0 in case of success. 
 	def run(self):
+		# Delegate to a running daemon, which has everything prepared
+		if not self.args.standalone and not self.args.dry_run:
+			rc = self.forward()
+			if rc != None:
+				return rc
 		# INITIALZATION
 		# Connect to Raspberry Pi GPIO
 		self.pi = pigpio.pi()
@@ -363,16 +314,99 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 			sys.stdout.write(f'ERROR: Cannot set output mode for GPIO pin {self.args.gpio} (BCM).\n')
 			self.pi.stop()
 			return 1
+		# Compile each key press to a single wave chain
+		self.wave_cache = WaveCache(self.pi, self.carrier)
+		self.chain_compiler = ChainCompiler(self.wave_cache)
+		self.transmitter = WaveTransmitter(self.pi, self.wave_cache)
 		# Send the IR signal sequences depending on the program arguments
 		rc = self.send()
 		# Disconnect from Raspberry Pi GPIO
 		try:
+			self.wave_cache.clear()
 			self.pi.set_mode(self.args.gpio, pigpio.INPUT)
 			self.pi.stop()
 		except: 
 			pass
 		return rc
 	
+	## Forward the keys to a running "irc_daemon.py" via its Unix domain socket.
+	#  All keys are submitted at once and the daemon sends them one after the other.
+	#
+	#  @return The exit code as integer, which is 0 in case of success, or None, 
+	#  if no daemon is running or the daemon does not serve the input file.
+	def forward(self):
+		client = RemoteControlClient(self.args.socket_path)
+		if not client.connect():
+			return None
+		try:
+			irc_name = os.path.splitext(os.path.basename(self.args.input))[0]
+			device = client.request({'command': 'device', 'device_name': irc_name})
+			if device['result'] != 0 or os.path.realpath(device['filepath']) != os.path.realpath(self.args.input):
+				if self.args.verbose:
+					sys.stdout.write(f'The daemon does not serve the file "{self.args.input}".\n')
+				return None
+			if self.args.verbose:
+				sys.stdout.write(f'Forwarding the keys to the daemon at "{self.args.socket_path}".\n')
+			if len(self.args.key_names) == 0: 
+				# Display the list
+				sys.stdout.write(f'List of keys:\n{" ".join(device["key_names"])}\n\n')
+				return 0
+			# Submit the keys up to the first unknown key
+			key_names = self.args.key_names.split(' ')
+			submitted = []
+			rc = 0
+			error = ''
+			for n in range(0, len(key_names)):
+				key_name, count = self.parseKeyName(key_names[n])
+				if count < 1:
+					error = f'ERROR: Invalid count of key presses in "{key_names[n]}".\n'
+					rc = 22 # 22 = Invalid argument
+					break
+				if key_name not in device['key_names']:
+					error = f'ERROR: Id "{key_name}" not found.\n'
+					rc = 1
+					break
+				request_id = client.submit({
+					'command': 'send', 
+					'device_name': irc_name, 
+					'key_name': key_name, 
+					'carrier_frequency': self.args.carrier_frequency, 
+					'key_space': self.args.key_space if n < len(key_names) - 1 else None, 
+					'no_repeat': self.args.no_repeat, 
+					'count': count
+				})
+				submitted.append((key_name, request_id))
+			# Wait until the IR signals have left the LED
+			for key_name, request_id in submitted:
+				response = client.receive(request_id)
+				if response['result'] != 0:
+					sys.stdout.write(f'ERROR: The daemon cannot send the IR signal for key "{key_name}".\n')
+					return 1
+				sys.stdout.write(f'The IR signal for key "{key_name}" has been successfully sent.\n')
+			if rc != 0:
+				sys.stdout.write(error)
+				return rc
+		except (OSError, ValueError) as e:
+			sys.stdout.write(f'ERROR: Cannot forward the keys to the daemon: {e}\n')
+			return 1
+		finally:
+			client.close()
+		sys.stdout.write(f'The program has been successfully completed.\n')
+		return 0
+	
+	## Split the suffix "*N" from a key name, which defines how often the key is pressed.
+	#
+	#  @param token The key name from the command line, e.g. "volume_up*10".
+	#  @return A tuple of the key name and the count of key presses, which is 0, if the suffix is invalid.
+	def parseKeyName(self, token):
+		if '*' not in token:
+			return token, 1
+		key_name, _, factor = token.rpartition('*')
+		try:
+			return key_name, int(factor)
+		except ValueError:
+			return key_name, 0
+	
 	## Send IR signal sequences depending on the program arguments.
 	#
 	#  @return The exit code as integer, which is 0 in case of success. 
@@ -385,43 +419,23 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 		# Load the IR remote control data from file
 		sys.stdout.write(f'Loading file "{self.args.input}".\n')
 		try:
-			f = open(self.args.input, "r")
-			try:
-				keys = json.load(f)
-			except:
-				sys.stdout.write(f'ERROR: Cannot load or JSON decode file "{self.args.input}".\n')
-				f.close()
-				return 1
-			f.close()
-		except:
+			# Former "irrp.py" recordings are migrated to the actual data model 
+			device = Device.load(self.args.input)
+		except OSError:
 			sys.stdout.write(f'ERROR: Cannot open file "{self.args.input}" to read.\n')
 			return 2
+		except ValueError:
+			sys.stdout.write(f'ERROR: Cannot load or JSON decode file "{self.args.input}".\n')
+			return 1
 		if self.args.verbose:
 			sys.stdout.write(f'The data file "{self.args.input}" has been successfully loaded.\n')
-		irc_name = os.path.basename(self.args.input)[0:(len(self.args.input.split('.')[-1]) + 1)*(-1)]
+		irc_name = device.name
 		irc_data_dir = os.path.dirname(self.args.input)
-		# Ensure downwards compatibility to former "irrp.py" recordings
-		keys_stringlist = ' '.join(list(keys.keys()))
-		key_names = keys_stringlist.split(' ')
-		first_item = keys[key_names[0]]
-		# In the simple program the first item is a list, not a dict
-		if type(first_item) is list:
-			# Automatically migrate to the new data model
-			new_keys = {}
-			for key_name in key_names:
-				new_key = {
-					'type': 0,
-					'first': keys[key_name],
-					'next': None,
-					'repetition_first': None,
-					'repetition_next': None,
-					'repeat_count': 0,
-					'repeat_space': 0,
-					'timeout_space': None
-				}
-				new_keys[key_name] = new_key
-			keys = new_keys
+		keys = device.keys
+		keys_stringlist = ' '.join(keys)
 		sys.stdout.write('Done.\n')
+		# Restore the key states of the double layer protocol
+		toggle_states = ToggleStateStore(irc_data_dir)
 		# Prepare to send the IR signal
 		self.pi.wave_add_new()
 		# Start to send the keys
@@ -434,135 +448,43 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 			# Send keys
 			key_names = self.args.key_names.split(' ')
 			for n in range(0, len(key_names)):
-				key_name = key_names[n]
+				key_name, count = self.parseKeyName(key_names[n])
+				if count < 1:
+					sys.stdout.write(f'ERROR: Invalid count of key presses in "{key_names[n]}".\n')
+					return 22 # 22 = Invalid argument
 				if key_name in keys:
 					if self.args.verbose:
-						sys.stdout.write(f'Sending key "{key_name}" ...\n')
+						sys.stdout.write(f'Sending key "{key_name}" {count} time(s) ...\n')
 					key = keys[key_name]
-					# Compose the IR signal
-					sequences = [] 
-					key_type = key['type']
-					if key_type == 0:
-						# Single shot protocol 
-						sequences.append(key['first'])
-					elif key_type == 1:
-						# Single layer protocol
-						sequences.append(key['first'])
-						if not self.args.no_repeat:
-							for i in range(key['repeat_count']):
-								sequences.append(key['repetition_first'])
-					elif key_type == 2:
-						# Double layer protocol
-						status_file_path = os.path.join(irc_data_dir, f'.status_{irc_name}_{key_name}.json') 
-						# Load the key status from file
-						key_status = None
-						try:
-							f = open(status_file_path, "r")
-							try:
-								key_status = json.load(f)
-							except:
-								pass
-							f.close()
-						except:
-							pass
-						# Depending on the content of the status file 
-						# and the current date and time
-						# select the correct IR signal sequences. 
-						now = datetime.datetime.now()
-						if (
-							key_status == None 
-							or 
-							(not ('timeout' in key_status)) 
-							or 
-							now > datetime.datetime.strptime(key_status['timeout'], '%Y-%m-%d %H:%M:%S')
-						):
-							sequences.append(key['first'])
-							if not self.args.no_repeat:
-								for i in range(key['repeat_count']):
-									sequences.append(key['repetition_first'])
-							timeout = now + datetime.timedelta(seconds=key['timeout_space'])
-							timeout_str = timeout.strftime('%Y-%m-%d %H:%M:%S')
-							key_status = {'timeout': timeout_str}
-						else:
-							sequences.append(key['next'])
-							if not self.args.no_repeat:
-								for i in range(key['repeat_count']):
-									sequences.append(key['repetition_next'])
-							key_status = None
-					else:
-						sys.stdout.write(f'ERROR: Unknown protocol type "{key_type}".\n')
+					# Compose the IR signal of each key press. 
+					# Depending on the key state select the correct IR signal sequences of the double layer protocol.
+					try:
+						presses = key.selectPresses(
+							count, 
+							self.args.no_repeat, 
+							lambda: toggle_states.toggle(irc_name, key_name, key.timeout_space)
+						)
+					except ValueError as e:
+						sys.stdout.write(f'ERROR: {e}\n')
 						return 1
 					# Bypass the sending if the "--dry_run" argument is set
 					if not self.args.dry_run:
 						if self.args.verbose: sys.stdout.write('Sending ...\n')
-						# Send the IR signal sequences
-						for m in range(0, len(sequences)):
-							sequence = sequences[m]					
-							# Create IR signal
-							marks_wid = {}
-							spaces_wid = {}
-							wave = [0]*len(sequence)
-							for i in range(0, len(sequence)):
-								ci = sequence[i]
-								# Check if index is an odd number
-								if i & 1: 
-									# Space
-									if ci not in spaces_wid:
-										self.pi.wave_add_generic([pigpio.pulse(0, 0, ci)])
-										spaces_wid[ci] = self.pi.wave_create()
-									wave[i] = spaces_wid[ci]
-								else: 
-									# Mark
-									if ci not in marks_wid:
-										wf = self.carrier(self.args.gpio, self.args.carrier_frequency, ci)
-										self.pi.wave_add_generic(wf)
-										marks_wid[ci] = self.pi.wave_create()
-									wave[i] = marks_wid[ci]
-							# Send the signal
-							self.pi.wave_chain(wave)
-							while self.pi.wave_tx_busy():
-								time.sleep(0.002)
-							for i in marks_wid:
-								self.pi.wave_delete(marks_wid[i])
-							marks_wid = {}
-							for i in spaces_wid:
-								self.pi.wave_delete(spaces_wid[i])
-							spaces_wid = {}
-							marks_wid = {}
-							# Send space between IR signal repetitions
-							if m < len(sequences) - 1:
-								self.pi.wave_add_generic([pigpio.pulse(0, 0, key['repeat_space'])])
-								po = self.pi.wave_create()
-								self.pi.wave_chain([po])
-								while self.pi.wave_tx_busy():
-									time.sleep(0.002)
-								self.pi.wave_delete(po)
+						# Send all presses including the repetitions as a single wave chain
+						chain = self.chain_compiler.compileRepeated(
+							self.args.gpio, 
+							self.args.carrier_frequency, 
+							[(sequences[0], sequences[1] if len(sequences) > 1 else None, len(sequences) - 1, key.repeat_space) for sequences in presses], 
+							count, 
+							key.getPressSpace()
+						)
+						self.transmitter.transmit(chain)
 						if self.args.verbose: sys.stdout.write('... sent.\n')
 					# After the IR signal has been sent 
-					if key_type == 2:
-						# Double layer protocol
-						if key_status == None:
-							# Delete the status file
-							if os.path.isfile(status_file_path):
-								try:
-									os.remove(status_file_path)
-								except:
-									sys.stdout.write(f'ERROR: Cannot remove the status file "{status_file_path}".\n')
-									return 13
-						else:
-							# Save the status file
-							try:
-								f = open(status_file_path, "w")
-								try:
-									json.dump(key_status, f, indent='\t')
-								except:
-									sys.stdout.write(f'ERROR: Cannot JSON encode and save the status to file "{status_file_path}".\n')
-									f.close()
-									return 1
-								f.close()
-							except:
-								sys.stdout.write(f'ERROR: Cannot open file "{status_file_path}" to write.\n')
-								return 13
+					if key.type == key.TYPE_DOUBLE_LAYER:
+						# Double layer protocol: Save the key states
+						if not toggle_states.flush():
+							return 13
 					# Done
 					sys.stdout.write(f'The IR signal for key "{key_name}" has been successfully sent.\n')
 					# Space between two IR signals
@@ -581,24 +503,7 @@ $ ./irc_send.py --gpio 17 --input data/iiyama_monitor_prolite_tf3238msc.json --k
 	#  @param micros The duration of the IR signal modulation pulse in microseconds.
 	#  @return The "pigpio"-compatible data array to define the IR carrier wave for the modulated pulse.  
 	def carrier(self, gpio, frequency, micros):
-		# Forked from souri-t on GitHub by michaelpaulkorthals. 
-		# Original source: https://github.com/souri-t/RemoteControl-RPI/blob/master/remote/bin/irrp
-		#
-		# by michaelpaulkorthals: Code review and adoption to my quality level. 
-		#
-		wf = []
-		cycle = 1000.0 / frequency
-		cycles = int(round(micros / cycle))
-		on = int(round(cycle / 2.0))
-		sofar = 0
-		for c in range(cycles):
-			target = int(round((c + 1) * cycle))
-			sofar += on
-			off = target - sofar
-			sofar += off
-			wf.append(pigpio.pulse(1 << gpio, 0, on))
-			wf.append(pigpio.pulse(0, 1 << gpio, off))
-		return wf
+		return self.carrier_engine.pulses(gpio, frequency, micros)
 	
 
 # MAIN PROGRAM
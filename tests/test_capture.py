@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+## Tests of the module "irc_capture".
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from irc_capture import LircCapture
+
+
+## Tests of the capture of a recorded file.
+#
+class LircCaptureFileTest(unittest.TestCase):
+	
+	## A recording of three key presses with repetitions in the format of the LIRC device.
+	#  Each key press begins after a gap of 3 seconds, each repetition after a gap of 40 ms.
+	PRESSES = [
+		[('space', 3000000), ('pulse', 889), ('space', 889), ('pulse', 1778), ('timeout', 20000), ('space', 40000), ('pulse', 889), ('space', 889), ('pulse', 1778), ('timeout', 20000)],
+		[('space', 3000000), ('pulse', 1778), ('space', 889), ('pulse', 889), ('timeout', 20000), ('space', 40000), ('pulse', 1778), ('space', 889), ('pulse', 889), ('timeout', 20000)],
+		[('space', 3000000), ('pulse', 889), ('space', 1778), ('pulse', 889), ('timeout', 20000)]
+	]
+	
+	## Sample types by event name.
+	SAMPLE_TYPES = {
+		'pulse': LircCapture.MODE2_PULSE,
+		'space': LircCapture.MODE2_SPACE,
+		'timeout': LircCapture.MODE2_TIMEOUT
+	}
+	
+	## Write the recording to a temporary file.
+	#
+	def setUp(self):
+		handle, self.path = tempfile.mkstemp(suffix = '.bin')
+		with os.fdopen(handle, 'wb') as f:
+			for press in self.PRESSES:
+				for name, duration in press:
+					f.write(struct.pack('I', self.SAMPLE_TYPES[name] | duration))
+	
+	## Remove the temporary file.
+	#
+	def tearDown(self):
+		os.remove(self.path)
+	
+	## Each call of "receive" returns the next key press and an EOFError follows the last one.
+	#
+	def testReceivePresses(self):
+		capture = LircCapture(self.path)
+		try:
+			for press in self.PRESSES:
+				self.assertEqual(list(capture.receive(1)), press)
+			with self.assertRaises(EOFError):
+				list(capture.receive(1))
+		finally:
+			capture.close()
+	
+	## A key press, which is directly followed by the pulse of the next one, ends at its timeout sample.
+	#
+	def testReceivePressesWithoutGap(self):
+		with open(self.path, 'wb') as f:
+			for press in self.PRESSES:
+				for name, duration in press[1:]:
+					f.write(struct.pack('I', self.SAMPLE_TYPES[name] | duration))
+		capture = LircCapture(self.path)
+		try:
+			for press in self.PRESSES:
+				self.assertEqual(list(capture.receive(1)), press[1:])
+			with self.assertRaises(EOFError):
+				list(capture.receive(1))
+		finally:
+			capture.close()
+
+
+if __name__ == '__main__':
+	unittest.main()
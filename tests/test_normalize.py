@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+## Tests of the module "irc_normalize".
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from irc_model import Device
+import irc_normalize
+from irc_normalize import SequenceNormalizer
+
+## Path to the data file of the tests.
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'marantz_av_receiver_nr1711.json')
+
+
+## Normalize an IR signal sequence as the quadratic method "normalize" of the former class "IRC_Learner".
+#  This is the reference of the results.
+#
+#  @param sequence The IR signal sequence as list of pulse and space widths in microseconds.
+#  @param max_deviation The maximum item value difference deviation.
+#  @return The normalized copy of the sequence.
+def normalizeReference(sequence, max_deviation):
+	sequence = list(sequence)
+	toler_min = float(1.0) - max_deviation
+	toler_max = float(1.0) + max_deviation
+	entries = len(sequence)
+	p = [0] * entries # Set all entries not processed
+	for i in range(entries):
+		if not p[i]: # Not processed?
+			v = sequence[i]
+			tot = v
+			similar = 1.0
+			# Find all pulses with similar lengths to the start pulse
+			for j in range(i + 2, entries, 2):
+				if not p[j]: # Unprocessed
+					if (sequence[j] * toler_min) < v < (sequence[j] * toler_max): # Similar
+						tot = tot + sequence[j]
+						similar += 1.0
+			# Calculate the average pulse length
+			newv = round(tot / similar, 2)
+			sequence[i] = int(round(newv))
+			# Set all similar pulses to the average value
+			for j in range(i + 2, entries, 2):
+				if not p[j]: # Unprocessed.
+					if (sequence[j] * toler_min) < v < (sequence[j] * toler_max): # Similar
+						sequence[j] = int(round(newv))
+						p[j] = 1
+	return sequence
+
+
+## Tests of the normalizer against the reference.
+#
+class SequenceNormalizerTest(unittest.TestCase):
+	
+	## Maximum deviations to test.
+	DEVIATIONS = (0.05, 0.15, 0.3, 0.6)
+	
+	## Load the data file and seed the random generator.
+	#
+	def setUp(self):
+		self.device = Device.load(DATA_PATH)
+		self.random = random.Random(1711)
+	
+	## Get the normalizers to test, with NumPy if it is installed, and without.
+	#
+	#  @param max_deviation The maximum item value difference deviation.
+	#  @return The list of normalizers.
+	def getNormalizers(self, max_deviation):
+		normalizers = [SequenceNormalizer(max_deviation, use_numpy=False)]
+		if irc_normalize.numpy != None:
+			normalizers.append(SequenceNormalizer(max_deviation))
+		return normalizers
+	
+	## Assert, that all normalizers return the result of the reference.
+	#
+	#  @param sequence The IR signal sequence.
+	#  @param max_deviation The maximum item value difference deviation.
+	def assertReference(self, sequence, max_deviation):
+		expected = normalizeReference(sequence, max_deviation)
+		for normalizer in self.getNormalizers(max_deviation):
+			self.assertEqual(normalizer.normalize(list(sequence)), expected, f'use_numpy={normalizer.use_numpy}, max_deviation={max_deviation}, sequence={sequence}')
+	
+	## The sequences of the data file with IR noise are normalized as by the reference.
+	#
+	def testDataFile(self):
+		self.assertEqual(len(self.device.keys), 43)
+		for key in self.device.keys.values():
+			sequences = [list(sequence) for sequence in (key.first, key.next, key.repetition_first, key.repetition_next) if sequence]
+			self.assertReference(sum(sequences, []), 0.15)
+			for _ in range(5):
+				noisy = [int(width * self.random.uniform(0.9, 1.1)) for sequence in sequences for width in sequence]
+				self.assertReference(noisy, 0.15)
+	
+	## Random sequences are normalized as by the reference with several deviations.
+	#
+	def testRandomSequences(self):
+		for _ in range(300):
+			widths = [0, 1, 5, 100, 300, 560, 600, 1690, 9000, self.random.randint(0, 20000)]
+			sequence = [max(0, self.random.choice(widths) + self.random.randint(-80, 80)) for _ in range(self.random.randint(0, 60))]
+			for max_deviation in self.DEVIATIONS:
+				self.assertReference(sequence, max_deviation)
+
+
+if __name__ == '__main__':
+	unittest.main()
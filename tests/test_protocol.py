@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+## Tests of the module "irc_protocol".
+#  Created on 2026-10-16.
+#
+#  @author Michael Paul Korthals
+
+# Import Python language packages
+import json
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from irc_model import Key
+from irc_protocol import PROTOCOLS, ProtocolDecoder
+
+## Path to the data file of the tests.
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'marantz_av_receiver_nr1711.json')
+
+
+## Tests of the recognition and synthesis of the IR protocols.
+#
+class ProtocolTest(unittest.TestCase):
+	
+	## Maximum addresses and commands of the protocols.
+	LIMITS = {
+		'nec': (0xFFFF, 0xFF),
+		'kaseikyo': (0xFFFFFFF, 0xFF),
+		'sony12': (0x1F, 0x7F),
+		'sony15': (0xFF, 0x7F),
+		'sony20': (0x1FFF, 0x7F),
+		'rc5': (0x1F, 0x7F),
+		'rc5x': (0x1F, 0x1FFF),
+		'rc6': (0xFF, 0xFF)
+	}
+	
+	## Load the data file and create the decoder.
+	#
+	def setUp(self):
+		with open(DATA_PATH, 'r') as f:
+			self.data = json.load(f)
+		self.decoder = ProtocolDecoder(0.15)
+		self.random = random.Random(1711)
+	
+	## All keys of the data file are recognized as RC5 or RC5X.
+	#
+	def testDecodeDataFile(self):
+		self.assertEqual(len(self.data), 43)
+		for key_name, key_data in self.data.items():
+			compact = self.decoder.decodeKey(key_data)
+			self.assertIsNotNone(compact, key_name)
+			self.assertIn(compact['protocol'], ('rc5', 'rc5x'), key_name)
+	
+	## The synthesized sequences of the recognized keys are similar to the recorded ones
+	#  and the compact form of a key survives a round trip.
+	#
+	def testSynthesizeDataFile(self):
+		for key_name, key_data in self.data.items():
+			compact = self.decoder.decodeKey(key_data)
+			key = Key.fromDict(key_name, compact)
+			self.assertTrue(self.decoder.isSimilarKey(key_data, key.getFrames()), key_name)
+			for sequence_name in Key.SEQUENCES:
+				sequence = key.getFrames()[sequence_name]
+				self.assertEqual(getattr(key, sequence_name) == None, sequence == None, key_name)
+				if sequence != None:
+					self.assertEqual(list(getattr(key, sequence_name)), sequence.toSequence(), key_name)
+			self.assertEqual(key.toDict(), compact, key_name)
+	
+	## Synthesized frames with IR noise are decoded to their address, command and toggle bit.
+	#
+	def testRoundTrip(self):
+		for name, protocol in PROTOCOLS.items():
+			max_address, max_command = self.LIMITS[name]
+			for _ in range(100):
+				address = self.random.randint(0, max_address)
+				command = self.random.randint(0, max_command)
+				toggle = self.random.randint(0, 1) if protocol.has_toggle else 0
+				expected = (address, command, toggle)
+				if name == 'nec' and (address >> 8) == (address & 0xFF) ^ 0xFF:
+					# An address with its inverted byte is the standard NEC address of 8 bits
+					expected = (address & 0xFF, command, toggle)
+				noisy = [int(width * self.random.uniform(0.93, 1.07)) for width in protocol.getFrame(address, command, toggle).toSequence()]
+				self.assertEqual(protocol.decode(noisy), expected, name)
+
+
+if __name__ == '__main__':
+	unittest.main()